@@ -1,14 +1,24 @@
 """Firebase authentication module for Carolina's Diary application."""
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
-from typing import Any, Dict, Optional
+import re
+import time
+import urllib.request
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import firebase_admin
+import jwt
+from cryptography import x509
 from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from firebase_admin import auth, credentials, initialize_app
 
+from cache import TTLCache
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -43,14 +53,150 @@ if not firebase_admin._apps:  # pylint: disable=[W0212:protected-access]
 
 security = HTTPBearer()
 
+FIREBASE_PROJECT_ID = os.environ.get("FIREBASE_PROJECT_ID", "carolina-s-journal")
+# Verify ID tokens against locally cached Google signing keys instead of
+# calling into the Admin SDK for every request
+FIREBASE_LOCAL_VERIFY = os.environ.get("FIREBASE_LOCAL_VERIFY", "").lower() == "true"
+GOOGLE_SIGNING_CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+
+# Verified tokens by SHA-256 of the raw token, each expiring at its exp claim
+token_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    "verified_tokens",
+    maxsize=int(os.environ.get("TOKEN_CACHE_SIZE", "10000")),
+    ttl=3600,
+)
+
+SigningKeys = Dict[str, Any]
+
+
+def fetch_google_signing_keys() -> Tuple[SigningKeys, float]:
+    """Download Firebase token signing certificates.
+
+    Returns the public keys by key id and how long Google says they may be
+    cached (Cache-Control max-age).
+    """
+    with urllib.request.urlopen(
+        GOOGLE_SIGNING_CERTS_URL, timeout=10
+    ) as response:  # nosec B310
+        certificates = json.loads(response.read())
+        match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+    keys = {
+        kid: x509.load_pem_x509_certificate(pem.encode()).public_key()
+        for kid, pem in certificates.items()
+    }
+    return keys, float(match.group(1)) if match else 3600.0
+
+
+class FirebaseKeyStore:
+    """Locally cached token signing keys with background refresh.
+
+    ``fetch`` returns (keys by kid, max age in seconds); tests pass one that
+    serves locally generated keys so verification runs offline.
+    """
+
+    # Refresh this long before the keys expire, and retry this often on errors
+    REFRESH_MARGIN = 300.0
+    RETRY_INTERVAL = 60.0
+
+    def __init__(
+        self, fetch: Callable[[], Tuple[SigningKeys, float]] = fetch_google_signing_keys
+    ) -> None:
+        self._fetch = fetch
+        self._keys: SigningKeys = {}
+        self._expires_at = 0.0
+        self._last_refresh = float("-inf")
+        # The fetch in flight, shared by every caller that wants a refresh
+        self._refreshing: Optional[asyncio.Task[None]] = None
+
+    async def refresh(self) -> None:
+        """Fetch the current key set in a worker thread.
+
+        Callers arriving while a fetch is in flight wait for that fetch,
+        and see its result or error, instead of starting their own.
+        """
+        if self._refreshing is None:
+            self._refreshing = asyncio.create_task(self._refresh())
+            self._refreshing.add_done_callback(self._refresh_done)
+        # Shielded so one cancelled request does not abort everyone's fetch
+        await asyncio.shield(self._refreshing)
+
+    async def _refresh(self) -> None:
+        keys, max_age = await asyncio.to_thread(self._fetch)
+        self._keys = keys
+        self._last_refresh = time.monotonic()
+        self._expires_at = self._last_refresh + max_age
+
+    def _refresh_done(self, task: "asyncio.Task[None]") -> None:
+        if self._refreshing is task:
+            self._refreshing = None
+        if not task.cancelled():
+            # Callers saw the error already; mark it retrieved
+            task.exception()
+
+    async def get_key(self, kid: Optional[str]) -> Any:
+        """Return the public key for ``kid``, refreshing when stale or unknown.
+
+        An unknown kid triggers at most one refresh per RETRY_INTERVAL so
+        forged headers cannot make us hammer the certificate endpoint; the
+        requests that find the keys stale or the kid unknown at the same
+        time share that one refresh (see refresh).
+        """
+        now = time.monotonic()
+        stale = now >= self._expires_at
+        unknown = (
+            kid not in self._keys and now - self._last_refresh > self.RETRY_INTERVAL
+        )
+        if stale or unknown:
+            await self.refresh()
+        return self._keys.get(kid) if kid else None
+
+    async def run_refresh_loop(self) -> None:
+        """Keep the keys fresh so requests never wait on a certificate fetch."""
+        while True:
+            delay = self._expires_at - self.REFRESH_MARGIN - time.monotonic()
+            await asyncio.sleep(max(delay, 0.0))
+            try:
+                await self.refresh()
+            except (OSError, ValueError) as exc:
+                logger.warning("Signing key refresh failed: %s", exc)
+                await asyncio.sleep(self.RETRY_INTERVAL)
+
+
+def verify_id_token_locally(token: str, key: Any, project_id: str) -> Dict[str, Any]:
+    """Check a Firebase ID token's signature and claims against ``key``.
+
+    Applies the checks Firebase documents for third-party verification:
+    RS256 signature, audience, issuer, exp/iat and a non-empty subject.
+    """
+    if key is None:
+        raise jwt.InvalidTokenError("Unknown signing key")
+    claims: Dict[str, Any] = jwt.decode(
+        token,
+        key=key,
+        algorithms=["RS256"],
+        audience=project_id,
+        issuer=f"https://securetoken.google.com/{project_id}",
+        options={"require": ["exp", "iat", "sub"]},
+    )
+    if not claims["sub"]:
+        raise jwt.InvalidTokenError("Token has an empty subject")
+    claims["uid"] = claims["sub"]
+    return claims
+
 
 class FirebaseAuth:
     """Firebase authentication handler for managing user authentication and authorization."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        key_store: Optional[FirebaseKeyStore] = None,
+        project_id: str = FIREBASE_PROJECT_ID,
+    ) -> None:
         """Initialize the FirebaseAuth instance with security and development mode settings.
         Parameters:
-            None
+            key_store: Signing keys for local token verification. When None,
+                tokens are verified through the Firebase Admin SDK.
+            project_id: Firebase project the tokens must be issued for.
         Returns:
             None
         Example:
@@ -60,6 +206,41 @@ class FirebaseAuth:
         self.development_mode = not bool(
             os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
         )
+        self.key_store = key_store
+        self.project_id = project_id
+
+    async def verify_token(self, token: str) -> Dict[str, Any]:
+        """Verify an ID token and return the user info, using the token cache.
+
+        Successful verifications are cached until the token's exp claim, so
+        autosave bursts pay for signature checking once per token.
+        """
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        cached = token_cache.get(token_hash)
+        if cached is not None:
+            return cached
+
+        if self.key_store is not None:
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = await self.key_store.get_key(kid)
+            decoded_token = verify_id_token_locally(token, key, self.project_id)
+        else:
+            decoded_token = auth.verify_id_token(token)
+
+        # Extract user information
+        user_info = {
+            "uid": decoded_token["uid"],
+            "email": decoded_token.get("email"),
+            "email_verified": decoded_token.get("email_verified", False),
+            "name": decoded_token.get("name"),
+            "picture": decoded_token.get("picture"),
+            "firebase_claims": decoded_token,
+        }
+
+        expires_in = decoded_token.get("exp", 0) - time.time()
+        if expires_in > 0:
+            token_cache.set(token_hash, user_info, ttl=expires_in)
+        return user_info
 
     async def get_current_user(
         self, auth_credentials: HTTPAuthorizationCredentials = Depends(security)
@@ -81,28 +262,21 @@ class FirebaseAuth:
 
         try:
             # Verify the ID token
-            decoded_token = auth.verify_id_token(auth_credentials.credentials)
-
-            # Extract user information
-            user_info = {
-                "uid": decoded_token["uid"],
-                "email": decoded_token.get("email"),
-                "email_verified": decoded_token.get("email_verified", False),
-                "name": decoded_token.get("name"),
-                "picture": decoded_token.get("picture"),
-                "firebase_claims": decoded_token,
-            }
+            return await self.verify_token(auth_credentials.credentials)
 
-            return user_info
-
-        except auth.ExpiredIdTokenError as exc:
+        except (auth.ExpiredIdTokenError, jwt.ExpiredSignatureError) as exc:
             raise HTTPException(status_code=401, detail="Token has expired") from exc
         except auth.RevokedIdTokenError as exc:
             raise HTTPException(
                 status_code=401, detail="Token has been revoked"
             ) from exc
-        except auth.InvalidIdTokenError as exc:
+        except (auth.InvalidIdTokenError, jwt.InvalidTokenError) as exc:
             raise HTTPException(status_code=401, detail="Invalid token") from exc
+        except OSError as exc:
+            logger.error("Could not fetch token signing keys: %s", str(exc))
+            raise HTTPException(
+                status_code=503, detail="Authentication temporarily unavailable"
+            ) from exc
         except ValueError as exc:
             # Log the original exception for debugging purposes
             logger.error("Authentication failed with ValueError: %s", str(exc))
@@ -135,7 +309,9 @@ class FirebaseAuth:
 
 
 # Global instance
-firebase_auth = FirebaseAuth()
+firebase_auth = FirebaseAuth(
+    key_store=FirebaseKeyStore() if FIREBASE_LOCAL_VERIFY else None
+)
 
 
 # Dependency for protected routes
@@ -197,19 +373,13 @@ async def get_current_user_optional(request: Request) -> Optional[Dict[str, Any]
 
     try:
         token = auth_header.split(" ")[1]
-        decoded_token = auth.verify_id_token(token)
-        return {
-            "uid": decoded_token["uid"],
-            "email": decoded_token.get("email"),
-            "email_verified": decoded_token.get("email_verified", False),
-            "name": decoded_token.get("name"),
-            "picture": decoded_token.get("picture"),
-            "firebase_claims": decoded_token,
-        }
+        return await firebase_auth.verify_token(token)
     except (
         auth.ExpiredIdTokenError,
         auth.RevokedIdTokenError,
         auth.InvalidIdTokenError,
+        jwt.InvalidTokenError,
+        OSError,
         ValueError,
     ):
         return None
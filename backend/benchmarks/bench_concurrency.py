@@ -0,0 +1,213 @@
+"""
+Concurrent-request latency benchmark for the journal list endpoint.
+
+Compares the old pattern (sync Session queries inside ``async def`` handlers)
+with the AsyncSession path used by main.py. A batch of deep-page
+``/journal-entries`` requests runs while cheap ``/`` probes are issued; when
+the handlers block the event loop the probes queue behind the queries.
+
+Run from the backend directory:
+    python -m benchmarks.bench_concurrency --entries 20000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Any, AsyncGenerator, Dict, List, Tuple
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from auth import get_current_user
+from database import Base, create_async_engines
+from main import app, get_db, get_read_db, get_read_session_factory
+from maintenance import recompute_entry_stats
+from models import JournalEntry, User
+
+# flake8: noqa: E501
+
+DEV_USER = {"uid": "bench-user", "email": "bench@example.com"}
+PROBE_INTERVAL = 0.005
+
+
+def seed_database(db_path: str, entries: int) -> None:
+    """Create the schema and one user with ``entries`` daily entries.
+
+    The user's stored statistics are recomputed afterwards, as the list
+    endpoint reads its total from them.
+    """
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            insert(User).values(firebase_uid=DEV_USER["uid"], email=DEV_USER["email"])
+        ).inserted_primary_key[0]
+        today = date.today()
+        conn.execute(
+            insert(JournalEntry),
+            [
+                {
+                    "user_id": user_id,
+                    "date": today - timedelta(days=i),
+                    "gratitude_answers": ["benchmark"] * 3,
+                    "emotion": "joy",
+                    "emotion_answers": [],
+                    "custom_text": "x" * 500,
+                    "visual_settings": {},
+                }
+                for i in range(entries)
+            ],
+        )
+        recompute_entry_stats(conn, user_id)
+    engine.dispose()
+
+
+def build_blocking_app(db_path: str) -> FastAPI:
+    """Replica of the pre-async handler: sync queries inside ``async def``."""
+    legacy = FastAPI()
+    session_factory = sessionmaker(
+        bind=create_engine(
+            f"sqlite:///{db_path}", connect_args={"check_same_thread": False}
+        )
+    )
+
+    @legacy.get("/")
+    async def root() -> Dict[str, str]:
+        return {"message": "ok"}
+
+    @legacy.get("/journal-entries")
+    async def list_entries(page: int = 1, page_size: int = 10) -> Dict[str, Any]:
+        db: Session = session_factory()
+        try:
+            user = db.query(User).filter(User.firebase_uid == DEV_USER["uid"]).one()
+            total = (
+                db.query(JournalEntry).filter(JournalEntry.user_id == user.id).count()
+            )
+            rows = (
+                db.query(JournalEntry)
+                .filter(JournalEntry.user_id == user.id)
+                .order_by(JournalEntry.date.desc())
+                .offset((page - 1) * page_size)
+                .limit(page_size)
+                .all()
+            )
+            return {"total": total, "ids": [row.id for row in rows]}
+        finally:
+            db.close()
+
+    return legacy
+
+
+def configure_async_app(db_path: str) -> FastAPI:
+    """Point the real application at the benchmark database.
+
+    Both the write and the read sessions are overridden; list requests are
+    served from the reader pool.
+    """
+    write_engine, read_engine = create_async_engines(f"sqlite:///{db_path}")
+    write_sessions = async_sessionmaker(
+        bind=write_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    read_sessions = async_sessionmaker(
+        bind=read_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with write_sessions() as session:
+            yield session
+
+    async def override_get_read_db() -> AsyncGenerator[AsyncSession, None]:
+        async with read_sessions() as session:
+            yield session
+
+    async def override_user() -> Dict[str, Any]:
+        return DEV_USER
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_read_session_factory] = lambda: read_sessions
+    app.dependency_overrides[get_current_user] = override_user
+    return app
+
+
+async def timed_get(client: httpx.AsyncClient, url: str, submitted: float) -> float:
+    """Issue one GET and return milliseconds from submission to completion.
+
+    Timing from submission rather than from when the task first runs makes
+    time spent queued behind a blocked event loop part of the latency.
+    """
+    response = await client.get(url)
+    response.raise_for_status()
+    return (time.perf_counter() - submitted) * 1000
+
+
+async def run_load(
+    target: FastAPI, concurrency: int, deep_page: int, probes: int
+) -> Tuple[List[float], List[float]]:
+    """Run concurrent list requests alongside root probes."""
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        list_url = f"/journal-entries?page={deep_page}&page_size=100"
+        submitted = time.perf_counter()
+        list_tasks = [
+            asyncio.create_task(timed_get(client, list_url, submitted))
+            for _ in range(concurrency)
+        ]
+        # Probes follow a fixed schedule so a stalled loop cannot postpone them
+        probe_latencies = []
+        for i in range(probes):
+            scheduled = submitted + (i + 1) * PROBE_INTERVAL
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            probe_latencies.append(await timed_get(client, "/", scheduled))
+        list_latencies = await asyncio.gather(*list_tasks)
+    return list(list_latencies), probe_latencies
+
+
+def summarize(label: str, samples: List[float]) -> str:
+    """Format p50/p95/max for a latency sample."""
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return (
+        f"{label:<22} p50={statistics.median(ordered):8.2f}ms "
+        f"p95={p95:8.2f}ms max={ordered[-1]:8.2f}ms"
+    )
+
+
+def main() -> None:
+    """Seed a temporary database and print before/after latency figures."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--probes", type=int, default=20)
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    try:
+        seed_database(db_path, args.entries)
+        deep_page = max(1, args.entries // 100 - 1)
+        for label, target in (
+            ("blocking (before)", build_blocking_app(db_path)),
+            ("async (after)", configure_async_app(db_path)),
+        ):
+            list_ms, probe_ms = asyncio.run(
+                run_load(target, args.concurrency, deep_page, args.probes)
+            )
+            print(summarize(f"{label} list", list_ms))
+            print(summarize(f"{label} probe", probe_ms))
+    finally:
+        app.dependency_overrides.clear()
+        os.unlink(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Serialization micro-benchmark for journal entry list pages.
+
+Compares the Pydantic path (``JournalEntryResponse.model_validate`` per ORM
+row, then FastAPI validating and encoding the whole response model) with the
+row-tuple + orjson path used by ``/journal-entries``. No database or HTTP is
+involved; only the work done after the rows are fetched is timed.
+
+Run from the backend directory:
+    python -m benchmarks.bench_serialization --entries 100 --text-size 4000
+"""
+
+import argparse
+import json
+import statistics
+import timeit
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, List, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from models import JournalEntry
+from schemas import (
+    JournalEntryResponse,
+    PaginatedJournalEntriesResponse,
+    PaginationMetadata,
+)
+from serializers import JOURNAL_ENTRY_FIELDS, render_journal_entries_page
+
+# flake8: noqa: E501
+
+
+def build_rows(entries: int, text_size: int) -> List[Tuple[Any, ...]]:
+    """Rows shaped like a ``select(*JOURNAL_ENTRY_COLUMNS)`` result."""
+    now = datetime(2024, 1, 1, 12, 30, 15, 123456)
+    rows = []
+    for i in range(entries):
+        values = {
+            "id": i + 1,
+            "user_id": 1,
+            "date": date(2024, 1, 1) - timedelta(days=i),
+            "gratitude_answers": ["family", "health", "coffee"],
+            "emotion": "joy",
+            "emotion_answers": ["a sunny walk", "a call with a friend"],
+            "custom_text": "x" * text_size,
+            "visual_settings": {"theme": "sunny", "color": "#FFD700"},
+            "created_at": now,
+            "updated_at": now,
+        }
+        rows.append(tuple(values[field] for field in JOURNAL_ENTRY_FIELDS))
+    return rows
+
+
+def pydantic_path(entries: List[JournalEntry], pagination: PaginationMetadata) -> bytes:
+    """What the handler and FastAPI did before: validate, revalidate, encode."""
+    response = PaginatedJournalEntriesResponse(
+        entries=[JournalEntryResponse.model_validate(entry) for entry in entries],
+        pagination=pagination,
+    )
+    # FastAPI validates the returned object against response_model, then
+    # runs jsonable_encoder and JSONResponse.render on the result
+    validated = PaginatedJournalEntriesResponse.model_validate(
+        response, from_attributes=True
+    )
+    return json.dumps(
+        jsonable_encoder(validated),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def fast_path(rows: List[Tuple[Any, ...]], pagination: PaginationMetadata) -> bytes:
+    """Row tuples straight into orjson."""
+    return bytes(render_journal_entries_page(rows, pagination).body)
+
+
+def time_per_call(func: Callable[[], bytes], repeat: int, number: int) -> float:
+    """Median microseconds per call over ``repeat`` rounds."""
+    rounds = timeit.repeat(func, repeat=repeat, number=number)
+    return statistics.median(rounds) / number * 1_000_000
+
+
+def main() -> None:
+    """Check both paths agree, then print their per-page cost."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100)
+    parser.add_argument("--text-size", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = build_rows(args.entries, args.text_size)
+    orm_entries = [JournalEntry(**dict(zip(JOURNAL_ENTRY_FIELDS, row))) for row in rows]
+    pagination = PaginationMetadata(
+        current_page=1,
+        page_size=args.entries,
+        total_pages=1,
+        total_items=args.entries,
+        has_next=False,
+        has_previous=False,
+    )
+
+    before = pydantic_path(orm_entries, pagination)
+    after = fast_path(rows, pagination)
+    assert json.loads(before) == json.loads(after), "paths disagree"
+
+    slow = time_per_call(
+        lambda: pydantic_path(orm_entries, pagination), args.repeat, args.number
+    )
+    fast = time_per_call(lambda: fast_path(rows, pagination), args.repeat, args.number)
+    print(f"{args.entries} entries, {len(after)} bytes per page")
+    print(f"pydantic (before)   {slow:10.1f}us per page")
+    print(f"orjson rows (after) {fast:10.1f}us per page  ({slow / fast:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
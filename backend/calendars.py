@@ -0,0 +1,108 @@
+"""Compact per-day summaries of a user's journal for calendar views."""
+
+import calendar
+import os
+from base64 import b64encode
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from cache import TTLCache
+from schemas import Emotion
+
+# flake8: noqa: E501
+
+# Emotion -> small integer code, in Emotion declaration order; 0 means none
+EMOTION_CODES: Dict[str, int] = {
+    emotion.value: code for code, emotion in enumerate(Emotion, start=1)
+}
+
+# Heatmaps pack one code per day into 4 bits
+assert len(EMOTION_CODES) < 16, "emotion codes no longer fit a heatmap nibble"
+
+# Listed in code order, so clients can decode with EMOTION_NAMES[code - 1]
+EMOTION_NAMES = tuple(emotion.value for emotion in Emotion)
+
+# (user_id, "YYYY-MM", change_seq) -> encoded days; every save bumps the
+# user's change_seq, so entries for older values are never read again and
+# age out
+month_cache: TTLCache[Tuple[int, ...]] = TTLCache(
+    "months",
+    maxsize=int(os.getenv("MONTH_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("MONTH_CACHE_TTL_SECONDS", "3600")),
+)
+
+
+# (user_id, year, change_seq) -> encoded heatmap; keyed like months
+heatmap_cache: TTLCache[Tuple[str, str]] = TTLCache(
+    "heatmaps",
+    maxsize=int(os.getenv("HEATMAP_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("HEATMAP_CACHE_TTL_SECONDS", "3600")),
+)
+
+
+def parse_month(value: str) -> date:
+    """First day of a ``YYYY-MM`` month; raises ValueError on other input.
+
+    Years past 9998 are rejected as for heatmaps: the month after 9999-12
+    cannot be represented, so its range would have no end.
+    """
+    first = datetime.strptime(value, "%Y-%m").date()
+    if first.year > 9998:
+        raise ValueError(f"month out of range: {value}")
+    return first
+
+
+def format_month(day: date) -> str:
+    """``YYYY-MM`` for the month of ``day``, with the year zero-padded.
+
+    ``strftime("%Y")`` does not pad years below 1000, while SQLite's does;
+    month keys written from Python and from SQL must compare equal.
+    """
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def month_bounds(first: date) -> Tuple[date, date]:
+    """``first`` and the first day of the following month."""
+    if first.month == 12:
+        return first, date(first.year + 1, 1, 1)
+    return first, date(first.year, first.month + 1, 1)
+
+
+def day_code(emotion: Optional[str]) -> int:
+    """Code for a day with an entry: bit 0 is presence, the rest the emotion."""
+    return 1 | (EMOTION_CODES.get(emotion or "", 0) << 1)
+
+
+def encode_month(
+    first: date, rows: Iterable[Tuple[date, Optional[str]]]
+) -> Tuple[int, ...]:
+    """One code per day of the month from (date, emotion) rows; 0 is no entry."""
+    days = [0] * calendar.monthrange(first.year, first.month)[1]
+    for entry_date, emotion in rows:
+        days[entry_date.day - 1] = day_code(emotion)
+    return tuple(days)
+
+
+def year_bounds(year: int) -> Tuple[date, date]:
+    """First day of ``year`` and of the year after."""
+    return date(year, 1, 1), date(year + 1, 1, 1)
+
+
+def encode_year(
+    year: int, rows: Iterable[Tuple[date, Optional[str]]]
+) -> Tuple[str, str]:
+    """Base64 (days, codes) for a year from (date, emotion) rows.
+
+    Day ``i`` counts from 0 on January 1st. ``days`` is a bitset with bit
+    ``i % 8`` of byte ``i // 8`` set when the day has an entry. ``codes``
+    holds each day's emotion code in 4 bits: the low half of byte ``i // 2``
+    for even ``i``, the high half for odd ``i``.
+    """
+    length = 366 if calendar.isleap(year) else 365
+    days = bytearray((length + 7) // 8)
+    codes = bytearray((length + 1) // 2)
+    for entry_date, emotion in rows:
+        day = entry_date.timetuple().tm_yday - 1
+        days[day // 8] |= 1 << (day % 8)
+        codes[day // 2] |= EMOTION_CODES.get(emotion or "", 0) << (4 * (day % 2))
+    return b64encode(days).decode("ascii"), b64encode(codes).decode("ascii")
@@ -0,0 +1,111 @@
+"""Immutable in-memory catalog of gratitude questions, emotion questions and quotes."""
+
+import hashlib
+import os
+import random
+from datetime import date
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from cache import TTLCache
+from models import EmotionQuestion, GratitudeQuestion, Quote
+
+# flake8: noqa: E501
+
+
+class PromptCatalog(NamedTuple):
+    """Snapshot of the prompt tables, grouped by emotion.
+
+    Tuples and read-only mappings make the snapshot safe to share between
+    concurrent requests; a reload builds a new one and swaps it in whole.
+    """
+
+    gratitude_questions: Tuple[str, ...]
+    # emotion -> ((id, question), ...)
+    emotion_questions: Mapping[str, Tuple[Tuple[int, str], ...]]
+    # emotion -> ((quote, author), ...)
+    quotes: Mapping[str, Tuple[Tuple[str, str], ...]]
+
+
+_catalog = PromptCatalog((), MappingProxyType({}), MappingProxyType({}))
+
+# Number of gratitude questions offered per day
+DAILY_GRATITUDE_QUESTIONS = 5
+
+# (seed key, local date) -> that day's gratitude questions. Keys carry the
+# date, so the day-long TTL only bounds how long yesterday's picks linger.
+daily_prompt_cache: TTLCache[Tuple[str, ...]] = TTLCache(
+    "daily_prompts",
+    maxsize=int(os.getenv("DAILY_PROMPT_CACHE_SIZE", "10000")),
+    ttl=24 * 60 * 60,
+)
+
+
+def get_catalog() -> PromptCatalog:
+    """Return the current catalog snapshot."""
+    return _catalog
+
+
+def daily_gratitude_questions(seed_key: str, day: date) -> Tuple[str, ...]:
+    """Return the gratitude questions for ``seed_key`` (usually a user) on ``day``.
+
+    The pick is seeded from a hash of both, so it stays the same all day and
+    across processes and restarts, and differs between users.
+    """
+    cached = daily_prompt_cache.get((seed_key, day))
+    if cached is not None:
+        return cached
+
+    questions = _catalog.gratitude_questions
+    digest = hashlib.sha256(f"{seed_key}:{day.isoformat()}".encode()).digest()
+    rng = random.Random(int.from_bytes(digest[:8], "big"))
+    picked = tuple(
+        rng.sample(questions, min(DAILY_GRATITUDE_QUESTIONS, len(questions)))
+    )
+    daily_prompt_cache.set((seed_key, day), picked)
+    return picked
+
+
+def load_catalog(db: Session) -> PromptCatalog:
+    """Reload the catalog from the database and make it current.
+
+    Called at startup after seeding; call again after changing the prompt
+    tables to pick up the new rows without a restart.
+    """
+    global _catalog  # pylint: disable=global-statement
+
+    emotion_questions: dict[str, list[Tuple[int, str]]] = {}
+    for row in db.execute(
+        select(
+            EmotionQuestion.emotion, EmotionQuestion.id, EmotionQuestion.question
+        ).order_by(EmotionQuestion.id)
+    ):
+        emotion_questions.setdefault(row.emotion, []).append((row.id, row.question))
+
+    quotes: dict[str, list[Tuple[str, str]]] = {}
+    for quote_row in db.execute(
+        select(Quote.emotion, Quote.quote, Quote.author).order_by(Quote.id)
+    ):
+        quotes.setdefault(quote_row.emotion, []).append(
+            (quote_row.quote, quote_row.author)
+        )
+
+    _catalog = PromptCatalog(
+        gratitude_questions=tuple(
+            db.scalars(
+                select(GratitudeQuestion.question).order_by(GratitudeQuestion.id)
+            )
+        ),
+        emotion_questions=MappingProxyType(
+            {emotion: tuple(rows) for emotion, rows in emotion_questions.items()}
+        ),
+        quotes=MappingProxyType(
+            {emotion: tuple(rows) for emotion, rows in quotes.items()}
+        ),
+    )
+    # Picks from the previous snapshot may name questions that are gone
+    daily_prompt_cache.clear()
+    return _catalog
@@ -0,0 +1,267 @@
+"""Response compression middleware: gzip always, brotli and zstd when installed."""
+
+import os
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+# flake8: noqa: E501
+
+# Bodies below this many bytes are sent as-is; compressing them costs more
+# CPU than the bytes it saves
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# Catalog responses are a few hundred bytes and change once a day at most
+CATALOG_PATHS = ("/gratitude-questions", "/emotion-questions", "/quote", "/emotions")
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class _BrotliCompressor:
+    """Give brotli's streaming compressor the zlib compress/flush interface."""
+
+    def __init__(self) -> None:
+        # Quality 4 is close to gzip's speed with a noticeably better ratio
+        self._compressor = brotli.Compressor(quality=4)
+
+    def compress(self, data: bytes) -> bytes:
+        return bytes(self._compressor.process(data))
+
+    def flush(self) -> bytes:
+        return bytes(self._compressor.finish())
+
+
+# Content-coding -> factory for a streaming compressor, in server preference
+# order. Only codings whose library is importable are offered.
+ENCODERS: Dict[str, Callable[[], Any]] = {}
+if zstandard is not None:
+    ENCODERS["zstd"] = lambda: zstandard.ZstdCompressor(level=3).compressobj()
+if brotli is not None:
+    ENCODERS["br"] = _BrotliCompressor
+ENCODERS["gzip"] = lambda: zlib.compressobj(6, zlib.DEFLATED, 31)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the content-coding to use for an ``Accept-Encoding`` header.
+
+    The client's q-values decide; ties go to the first entry in ENCODERS.
+    Returns None when the client accepts none of the available codings.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best: Optional[str] = None
+    best_weight = 0.0
+    for encoding in ENCODERS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressionStats:
+    """Per-coding counters for bytes in and out and CPU time spent compressing."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._encodings: Dict[str, Dict[str, float]] = {}
+        self.skipped = 0
+
+    def record(
+        self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float
+    ) -> None:
+        """Add one compressed response."""
+        with self._lock:
+            counters = self._encodings.setdefault(
+                encoding,
+                {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0},
+            )
+            counters["responses"] += 1
+            counters["bytes_in"] += bytes_in
+            counters["bytes_out"] += bytes_out
+            counters["cpu_seconds"] += cpu_seconds
+
+    def record_skipped(self) -> None:
+        """Count a response that was eligible but sent uncompressed."""
+        with self._lock:
+            self.skipped += 1
+
+    def clear(self) -> None:
+        """Reset every counter."""
+        with self._lock:
+            self._encodings.clear()
+            self.skipped = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        with self._lock:
+            encodings = {
+                name: {
+                    **counters,
+                    "bytes_saved": counters["bytes_in"] - counters["bytes_out"],
+                    "ratio": (
+                        round(counters["bytes_out"] / counters["bytes_in"], 4)
+                        if counters["bytes_in"]
+                        else None
+                    ),
+                    "cpu_seconds": round(counters["cpu_seconds"], 6),
+                }
+                for name, counters in self._encodings.items()
+            }
+            return {
+                "available": list(ENCODERS),
+                "skipped_below_min_size": self.skipped,
+                "encodings": encodings,
+            }
+
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """Compress response bodies with the best coding the client accepts.
+
+    Responses that are not of a compressible type, already carry a
+    Content-Encoding, come from an excluded path or are shorter than
+    ``minimum_size`` pass through untouched. Streaming responses are
+    compressed chunk by chunk. Strong ETags are weakened on compressed
+    responses, since the bytes differ from the identity representation.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        exclude_paths: Sequence[str] = CATALOG_PATHS,
+        stats: CompressionStats = compression_stats,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.exclude_paths = tuple(exclude_paths)
+        self.stats = stats
+
+    def _excluded(self, path: str) -> bool:
+        return any(
+            path == prefix or path.startswith(prefix + "/")
+            for prefix in self.exclude_paths
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._excluded(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    """Wraps ``send`` for one response, deciding on the first body chunk."""
+
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: str, send: Send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._compressor: Any = None
+        self._passthrough = False
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._cpu_seconds = 0.0
+
+    def _compress(self, body: bytes, finish: bool) -> bytes:
+        started = time.thread_time()
+        data = bytes(self._compressor.compress(body))
+        if finish:
+            data += self._compressor.flush()
+        self._cpu_seconds += time.thread_time() - started
+        self._bytes_in += len(body)
+        self._bytes_out += len(data)
+        return data
+
+    def _should_compress(self, headers: MutableHeaders) -> bool:
+        content_type = headers.get("content-type", "")
+        return "content-encoding" not in headers and content_type.startswith(
+            COMPRESSIBLE_TYPES
+        )
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self._start is not None:
+            start, self._start = self._start, None
+            headers = MutableHeaders(raw=start["headers"])
+            if not self._should_compress(headers) or (
+                not more_body and len(body) < self.middleware.minimum_size
+            ):
+                if not more_body and self._should_compress(headers):
+                    self.middleware.stats.record_skipped()
+                self._passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self._compressor = ENCODERS[self.encoding]()
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            data = self._compress(body, finish=not more_body)
+            if more_body:
+                del headers["content-length"]
+            else:
+                headers["Content-Length"] = str(len(data))
+            await self._send(start)
+        else:
+            data = self._compress(body, finish=not more_body)
+
+        await self._send(
+            {"type": "http.response.body", "body": data, "more_body": more_body}
+        )
+        if not more_body:
+            self.middleware.stats.record(
+                self.encoding, self._bytes_in, self._bytes_out, self._cpu_seconds
+            )
@@ -1,17 +1,224 @@
 """Database configuration and setup for Carolina's Diary application."""
 
-from sqlalchemy import create_engine
+import os
+import re
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import Engine, create_engine, event, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 
 # flake8: noqa: E501
 
-# SQLite database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./carolinas_diary.db"
+# SQLite database by default; any SQLAlchemy URL can be supplied instead
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./carolinas_diary.db")
+
+# Connection pool sizing. SQLite writes always use a single connection;
+# DB_POOL_SIZE applies to the sync engine and to non-SQLite writers.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", str(os.cpu_count() or 4)))
+
+# Pragmas applied to every new SQLite connection. WAL lets readers proceed
+# while the writer commits; NORMAL sync is durable across app crashes in WAL
+# mode; a negative cache_size is in KiB.
+SQLITE_PRAGMAS: Dict[str, str] = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-20000"),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+_PRAGMA_VALUE = re.compile(r"^-?\w+$")
+
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL onto the matching asyncio driver.
+
+    SQLite URLs use aiosqlite and PostgreSQL URLs use asyncpg. URLs that
+    already name a driver are returned unchanged.
+    """
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://") :]
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://") :]
+    if url.startswith("postgres://"):
+        return "postgresql+asyncpg://" + url[len("postgres://") :]
+    return url
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return _is_sqlite(url) and make_url(url).database in (None, "", ":memory:")
+
+
+def install_sqlite_pragmas(target: Engine, pragmas: Dict[str, str]) -> None:
+    """Run ``PRAGMA name=value`` for each pragma on every new connection."""
+    for name, value in pragmas.items():
+        if not _PRAGMA_VALUE.match(str(value)):
+            raise ValueError(f"Invalid value for SQLite pragma {name}: {value!r}")
+
+    @event.listens_for(target, "connect")
+    def _apply_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def install_sqlite_immediate_transactions(target: Engine) -> None:
+    """Start every transaction on ``target`` with ``BEGIN IMMEDIATE``.
+
+    pysqlite defers BEGIN until the first write, so rows read to decide a
+    write (an entry's previous emotion, the stored streaks) were read outside
+    the transaction, and another worker or process could change them first.
+    Taking SQLite's write lock when the transaction starts makes those
+    read-then-write sequences atomic across processes. This follows
+    SQLAlchemy's pysqlite recipe: turn off the driver's own BEGIN and issue
+    one from the ``begin`` event.
+    """
 
+    @event.listens_for(target, "connect")
+    def _disable_driver_begin(dbapi_connection: Any, _connection_record: Any) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(target, "begin")
+    def _begin_immediate(connection: Any) -> None:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _engine_options(
+    url: str, poolclass: Any, pool_size: int, max_overflow: int
+) -> Dict[str, Any]:
+    """Build create_engine keyword arguments for ``url``."""
+    options: Dict[str, Any] = {}
+    if _is_sqlite(url):
+        options["connect_args"] = {"check_same_thread": False}
+    if not _is_memory_sqlite(url):
+        options["poolclass"] = poolclass
+        if poolclass is not NullPool:
+            options["pool_size"] = pool_size
+            options["max_overflow"] = max_overflow
+    return options
+
+
+def create_async_engines(
+    url: str, pooled: bool = True
+) -> Tuple[AsyncEngine, AsyncEngine]:
+    """Create the (writer, reader) async engine pair for ``url``.
+
+    SQLite allows a single writer at a time, so its writer pool holds one
+    connection and write sessions queue on checkout instead of contending
+    for the database lock, and each write transaction takes the lock
+    up front (see install_sqlite_immediate_transactions) so other processes
+    queue too. Readers get their own pool sized to the CPU count with
+    ``query_only`` set, so they never wait behind that queue.
+    Pass ``pooled=False`` to open a fresh connection per session (tests).
+    """
+    async_url = to_async_url(url)
+    if _is_memory_sqlite(url):
+        # Each :memory: connection is its own database; share one engine
+        shared = create_async_engine(
+            async_url, **_engine_options(url, AsyncAdaptedQueuePool, 0, 0)
+        )
+        install_sqlite_pragmas(shared.sync_engine, SQLITE_PRAGMAS)
+        install_sqlite_immediate_transactions(shared.sync_engine)
+        return shared, shared
+
+    poolclass = AsyncAdaptedQueuePool if pooled else NullPool
+    if _is_sqlite(url):
+        writer_size, writer_overflow = 1, 0
+    else:
+        writer_size, writer_overflow = DB_POOL_SIZE, DB_MAX_OVERFLOW
+    writer = create_async_engine(
+        async_url, **_engine_options(url, poolclass, writer_size, writer_overflow)
+    )
+    reader = create_async_engine(
+        async_url,
+        **_engine_options(url, poolclass, DB_READ_POOL_SIZE, DB_MAX_OVERFLOW),
+    )
+    if _is_sqlite(url):
+        install_sqlite_pragmas(writer.sync_engine, SQLITE_PRAGMAS)
+        install_sqlite_immediate_transactions(writer.sync_engine)
+        install_sqlite_pragmas(
+            reader.sync_engine, {**SQLITE_PRAGMAS, "query_only": "ON"}
+        )
+    return writer, reader
+
+
+def describe_database(target: Engine) -> Dict[str, Any]:
+    """Report the URL, pool and the pragmas actually active on a connection.
+
+    Values are read back from SQLite rather than echoed from configuration,
+    so a journal mode the filesystem refused (e.g. WAL on a network share)
+    shows up here.
+    """
+    report: Dict[str, Any] = {
+        "url": target.url.render_as_string(hide_password=True),
+        "pool": type(target.pool).__name__,
+        "pool_size": getattr(target.pool, "size", lambda: None)(),
+    }
+    if target.dialect.name == "sqlite":
+        with target.connect() as conn:
+            report["pragmas"] = {
+                name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+                for name in SQLITE_PRAGMAS
+            }
+    return report
+
+
+def describe_session_pools() -> Dict[str, Any]:
+    """Report the pool class and size behind the write and read sessions."""
+    return {
+        role: {
+            "pool": type(target.pool).__name__,
+            "pool_size": getattr(target.pool, "size", lambda: None)(),
+        }
+        for role, target in (("write", async_engine), ("read", async_read_engine))
+    }
+
+
+# Sync engine for scripts (init_database, migrations) and startup seeding
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    **_engine_options(
+        SQLALCHEMY_DATABASE_URL, QueuePool, DB_POOL_SIZE, DB_MAX_OVERFLOW
+    ),
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+if _is_sqlite(SQLALCHEMY_DATABASE_URL):
+    install_sqlite_pragmas(engine, SQLITE_PRAGMAS)
+    # The CLI importer and maintenance commands write through this engine
+    install_sqlite_immediate_transactions(engine)
+
+# Async engines used by the request handlers so queries never block the
+# event loop: a serialized writer and a read-only pool for GET routes
+async_engine, async_read_engine = create_async_engines(SQLALCHEMY_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 
 class Base(DeclarativeBase):
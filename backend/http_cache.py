@@ -0,0 +1,45 @@
+"""Helpers for HTTP caching: ETags, conditional requests and expiry times."""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+# flake8: noqa: E501
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from the values that determine a response body."""
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an ``If-None-Match`` header value matches ``etag``.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    ``W/`` prefix added by a proxy still matches.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def seconds_until_midnight(now: datetime) -> int:
+    """Seconds from ``now`` until the next midnight in ``now``'s time zone.
+
+    ``now`` should be timezone-aware; the result is at least 1 so a response
+    cached at 23:59:59.9 is still cacheable.
+    """
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    if now.tzinfo is not None:
+        # Compare in UTC so a DST change during the night is accounted for
+        midnight = midnight.replace(tzinfo=now.tzinfo)
+        remaining = midnight.timestamp() - now.timestamp()
+    else:
+        remaining = (midnight - now).total_seconds()
+    return max(1, int(remaining))
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Bulk import of journal entries from NDJSON or JSON-array archives
+Used by POST /journal-entries/import and as a command-line tool
+"""
+
+import argparse
+import codecs
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
+
+from database import Base, engine
+from maintenance import (
+    recompute_emotion_counts,
+    recompute_entry_stats,
+    recompute_streaks,
+)
+from models import User
+from schemas import JournalEntryBatchItem
+from upserts import journal_entry_upsert, journal_entry_values, next_change_seq
+
+# flake8: noqa: E501
+
+# Entries written per transaction
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+
+# A single record larger than this is treated as malformed input
+MAX_RECORD_SIZE = 1024 * 1024
+
+# Rejected records listed individually in the report
+MAX_REPORTED_ERRORS = 20
+
+CHUNK_SIZE = 64 * 1024
+
+
+class JSONObjectStream:
+    """Incremental parser for NDJSON or a single JSON array of objects.
+
+    Feed it bytes as they arrive and it returns the records completed so
+    far, holding back only the partial record at the end of the buffer.
+    Input starting with ``[`` is read as one array whose elements are the
+    records; anything else as whitespace-separated records. Commas and
+    brackets are only accepted where that array needs them.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        # start, ndjson, or for an array: open (after "["), record (after
+        # ","), next (after a record) and done (after "]")
+        self._state = "start"
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add ``chunk`` and return the records it completed."""
+        self._buffer += self._utf8.decode(chunk)
+        return self._drain(final=False)
+
+    def close(self) -> List[Any]:
+        """Return the remaining records; raises ValueError on truncated input."""
+        self._buffer += self._utf8.decode(b"", final=True)
+        return self._drain(final=True)
+
+    def _drain(self, final: bool) -> List[Any]:
+        records = []
+        buffer, position = self._buffer, 0
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position == len(buffer):
+                break
+            char = buffer[position]
+            if self._state == "start":
+                if char == "[":
+                    self._state = "open"
+                    position += 1
+                    continue
+                self._state = "ndjson"
+            if self._state == "done":
+                raise ValueError("Unexpected data after the JSON array")
+            if char == "]" and self._state in ("open", "next"):
+                self._state = "done"
+                position += 1
+                continue
+            if self._state == "next":
+                if char != ",":
+                    raise ValueError("Expected ',' or ']' after an array record")
+                self._state = "record"
+                position += 1
+                continue
+            if char in ",]":
+                raise ValueError(f"Unexpected '{char}' where a record should start")
+            try:
+                record, position = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as exc:
+                # Either the record is still arriving or it is broken; only
+                # the end of input or an oversized record settles which
+                if final or len(buffer) - position > MAX_RECORD_SIZE:
+                    raise ValueError(f"Malformed JSON: {exc.msg}") from exc
+                break
+            records.append(record)
+            if self._state != "ndjson":
+                self._state = "next"
+        self._buffer = buffer[position:]
+        if final and self._state in ("open", "record", "next"):
+            raise ValueError("Malformed JSON: the array is not closed")
+        return records
+
+
+class ImportReport:
+    """Running totals for one import."""
+
+    def __init__(self) -> None:
+        self.received = 0
+        self.imported = 0
+        self.rejected = 0
+        # Accepted, then replaced by a later record for the same date in
+        # the same batch
+        self.superseded = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+
+    def reject(self, record_number: int, message: str) -> None:
+        """Count a record that failed validation."""
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"record": record_number, "error": message})
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the import started."""
+        return time.perf_counter() - self._started
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Summary for API responses and the CLI."""
+        elapsed = self.elapsed
+        return {
+            "received": self.received,
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "superseded": self.superseded,
+            "errors": self.errors,
+            "seconds": round(elapsed, 3),
+            "entries_per_second": round(self.imported / elapsed) if elapsed else None,
+        }
+
+
+class ImportBatcher:
+    """Validates parsed records and groups accepted ones into write batches."""
+
+    def __init__(
+        self,
+        user_id: int,
+        report: ImportReport,
+        batch_size: Optional[int] = None,
+    ) -> None:
+        self.user_id = user_id
+        self.report = report
+        self.batch_size = batch_size or IMPORT_BATCH_SIZE
+        # Keyed by date: a later record for a date replaces the earlier one,
+        # as the upsert would, and only rows actually written are counted
+        self._rows: Dict[date, Dict[str, Any]] = {}
+        # Placeholder; write_batch stamps the time and change_seq of the write
+        self._now = datetime.utcnow()
+        # Same slack as the batch save endpoint
+        self._latest_date = date.today() + timedelta(days=1)
+
+    def add(self, record: Any) -> Optional[List[Dict[str, Any]]]:
+        """Validate one record; returns a full batch once one is ready."""
+        self.report.received += 1
+        try:
+            item = JournalEntryBatchItem.model_validate(record)
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            location = ".".join(str(part) for part in error["loc"]) or "record"
+            self.report.reject(self.report.received, f"{location}: {error['msg']}")
+            return None
+        if item.date > self._latest_date:
+            self.report.reject(self.report.received, "Date is in the future")
+            return None
+        if item.date in self._rows:
+            self.report.superseded += 1
+        self._rows[item.date] = journal_entry_values(
+            self.user_id, item.date, item, self._now, 0
+        )
+        if len(self._rows) >= self.batch_size:
+            return self.flush()
+        return None
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Return and clear the rows accepted since the last batch."""
+        rows, self._rows = list(self._rows.values()), {}
+        return rows
+
+
+def write_batch(conn: Connection, user_id: int, rows: List[Dict[str, Any]]) -> None:
+    """Upsert ``rows`` with one executemany and refresh the user's statistics.
+
+    Rows for a date that already has an entry overwrite it, so entry
+    statistics, emotion counts and streaks are recomputed for the user
+    rather than adjusted. The rows are stamped with the user's next
+    change_seq, taken in this transaction, for the changes feed. The caller
+    commits, so each batch lands in one transaction.
+    """
+    change_seq = conn.execute(next_change_seq(user_id)).scalar_one()
+    now = datetime.utcnow()
+    conn.execute(
+        journal_entry_upsert(conn.dialect.name),
+        [
+            {**row, "created_at": now, "updated_at": now, "change_seq": change_seq}
+            for row in rows
+        ],
+    )
+    recompute_entry_stats(conn, user_id)
+    recompute_emotion_counts(conn, user_id)
+    recompute_streaks(conn, user_id)
+
+
+def read_chunks(stream: BinaryIO) -> Iterator[bytes]:
+    """Yield ``stream`` in CHUNK_SIZE pieces."""
+    while chunk := stream.read(CHUNK_SIZE):
+        yield chunk
+
+
+def import_file(conn: Connection, user_id: int, stream: BinaryIO) -> ImportReport:
+    """Import every record in ``stream``, committing after each batch."""
+    report = ImportReport()
+    batcher = ImportBatcher(user_id, report)
+    parser = JSONObjectStream()
+
+    def write(rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        with conn.begin():
+            write_batch(conn, user_id, rows)
+        report.imported += len(rows)
+        print(
+            f"  {report.imported} imported, {report.rejected} rejected "
+            f"({report.imported / report.elapsed:.0f} entries/s)"
+        )
+
+    for chunk in read_chunks(stream):
+        for record in parser.feed(chunk):
+            write(batcher.add(record) or [])
+    for record in parser.close():
+        write(batcher.add(record) or [])
+    write(batcher.flush())
+    return report
+
+
+def main() -> None:
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Import journal entries")
+    parser.add_argument("firebase_uid", help="Owner of the imported entries")
+    parser.add_argument(
+        "path", help="NDJSON or JSON array file, optionally .gz; - for stdin"
+    )
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        user_id = conn.execute(
+            select(User.id).where(User.firebase_uid == args.firebase_uid)
+        ).scalar_one_or_none()
+        conn.rollback()
+        if user_id is None:
+            sys.exit(f"❌ No user with firebase_uid {args.firebase_uid}")
+
+        try:
+            if args.path == "-":
+                report = import_file(conn, user_id, sys.stdin.buffer)
+            else:
+                opener: Any = gzip.open if args.path.endswith(".gz") else open
+                with opener(args.path, "rb") as stream:
+                    report = import_file(conn, user_id, stream)
+        except ValueError as exc:
+            sys.exit(f"❌ {exc}; batches written before the error were kept")
+
+    summary = report.as_dict()
+    print(
+        f"✅ Imported {summary['imported']} entries in {summary['seconds']}s "
+        f"({summary['entries_per_second']} entries/s), {summary['rejected']} rejected"
+    )
+    for error in summary["errors"]:
+        print(f"   record {error['record']}: {error['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,121 @@
 """FastAPI backend application for Carolina's Diary journaling app."""
 
+import asyncio
 import os
 import random
-from datetime import date, datetime
-from typing import Any, Generator
+import zlib
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncGenerator, Iterable, Optional, Sequence
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import uvicorn
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import (
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+)
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import Select, and_, case, delete, func, or_, select, update
 from sqlalchemy.exc import DatabaseError, SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from auth import get_current_user, get_current_user_dev
-from database import Base, SessionLocal, engine
+from auth import (
+    firebase_auth,
+    get_current_user,
+    get_current_user_dev,
+    get_current_user_optional,
+)
+from cache import CACHES, user_cache
+from calendars import (
+    EMOTION_NAMES,
+    encode_month,
+    encode_year,
+    format_month,
+    heatmap_cache,
+    month_bounds,
+    month_cache,
+    parse_month,
+    year_bounds,
+)
+from catalog import daily_gratitude_questions, get_catalog, load_catalog
+from compression import CompressionMiddleware, compression_stats
+from database import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    Base,
+    SessionLocal,
+    describe_database,
+    describe_session_pools,
+    engine,
+)
 from emotion_data import EMOTION_QUESTIONS, GRATITUDE_QUESTIONS, QUOTES_DATA
-from models import EmotionQuestion, GratitudeQuestion, JournalEntry, Quote, User
+from http_cache import etag_matches, make_etag, seconds_until_midnight
+from importer import ImportBatcher, ImportReport, JSONObjectStream, write_batch
+from models import (
+    EmotionMonthCount,
+    EmotionQuestion,
+    GratitudeQuestion,
+    JournalEntry,
+    Quote,
+    User,
+)
+from pagination import (
+    decode_change_token,
+    decode_cursor,
+    encode_change_token,
+    encode_cursor,
+)
 from schemas import (
     Emotion,
     EmotionQuestionResponse,
+    EmotionStatsResponse,
+    HeatmapResponse,
+    JournalEntryBatchRequest,
+    JournalEntryBatchResponse,
+    JournalEntryBatchResult,
+    JournalEntryChangesResponse,
     JournalEntryCreate,
     JournalEntryResponse,
+    JournalEntrySearchResponse,
+    MonthCalendarResponse,
     PaginatedJournalEntriesResponse,
     PaginationMetadata,
+    StreakResponse,
+    UserEntryStats,
+    UserProfile,
     UserResponse,
     UserUpdate,
 )
+from search import (
+    SEARCH_MAX_QUERY_LENGTH,
+    SEARCH_QUERY,
+    best_snippet,
+    search_parameters,
+)
+from serializers import (
+    JOURNAL_ENTRY_COLUMNS,
+    JOURNAL_ENTRY_FIELDS,
+    SUMMARY_FIELDS,
+    journal_entries_ndjson,
+    journal_entry_rows_to_dicts,
+    parse_fields,
+    projection_columns,
+    render_journal_entries_page,
+)
+from streaks import current_streak_on, extend_streaks, rescan_streaks
+from upserts import (
+    emotion_count_upsert,
+    journal_entry_upsert,
+    journal_entry_values,
+    next_change_seq,
+)
 
 # flake8: noqa: E501
 
@@ -34,6 +125,7 @@ Base.metadata.create_all(bind=engine)
 app = FastAPI(
     title="Carolina's Diary",
     description="A personalized journaling app",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -45,34 +137,253 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip (brotli/zstd when installed) for responses above COMPRESSION_MIN_SIZE
+app.add_middleware(CompressionMiddleware)
+
 
 # Dependency to get database session
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Database session dependency that handles session lifecycle.
+    Sessions come from the serialized writer pool; use for routes that write.
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only session dependency backed by the query_only reader pool.
+    """
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+def get_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Reader session factory, for streaming responses that outlive the request
+    handler and so open their own session.
+    """
+    return AsyncReadSessionLocal
 
 
 # Helper function to get user from database
-def get_user_by_firebase_uid(db: Session, firebase_uid: str) -> User:
-    """Get user by Firebase UID, create if doesn't exist"""
-    user = db.query(User).filter(User.firebase_uid == firebase_uid).first()
+async def get_user_by_firebase_uid(db: AsyncSession, firebase_uid: str) -> UserProfile:
+    """Get a user's profile by Firebase UID, from the user cache when possible"""
+    cached = user_cache.get(firebase_uid)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(select(User).where(User.firebase_uid == firebase_uid))
+    user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(
             status_code=404, detail="User not found. Please register first."
         )
-    return user
+    snapshot = UserProfile.model_validate(user)
+    user_cache.set(firebase_uid, snapshot)
+    return snapshot
+
+
+# Columns behind UserEntryStats, in field order
+USER_ENTRY_STATS_COLUMNS = tuple(
+    getattr(User, field) for field in UserEntryStats.model_fields
+)
+
+
+async def get_entry_stats(db: AsyncSession, user_id: int) -> UserEntryStats:
+    """Read the user's entry statistics with one primary-key lookup
+
+    Never cached, so a save committed by any worker is seen straight away.
+    """
+    result = await db.execute(
+        select(*USER_ENTRY_STATS_COLUMNS).where(User.id == user_id)
+    )
+    return UserEntryStats.model_validate(result.one()._asdict())
+
+
+async def upsert_journal_entries(
+    db: AsyncSession,
+    user_id: int,
+    entries: Sequence[tuple[date, JournalEntryCreate]],
+) -> dict[date, tuple[JournalEntry, bool]]:
+    """Insert or overwrite the user's entries for several dates in one statement.
+
+    Backed by the (user_id, date) unique index, so two concurrent saves for
+    the same day resolve to one row instead of racing a SELECT-then-INSERT.
+    Returns each date's entry and whether it was newly inserted; an update
+    leaves created_at untouched, so a returned created_at equal to the one we
+    sent means the INSERT branch ran. Dates must be distinct, as PostgreSQL
+    will not update one row twice in a statement. The caller owns the
+    transaction.
+
+    Entries are stamped with the user's next change_seq, taken in the same
+    transaction, so change_seq increases in commit order across workers and
+    processes; the /journal-entries/changes feed relies on that, not on
+    updated_at.
+    """
+    if not entries:
+        return {}
+    change_seq = (await db.execute(next_change_seq(user_id))).scalar_one()
+    now = datetime.utcnow()
+    upsert = (
+        journal_entry_upsert(db.get_bind().dialect.name)
+        .values(
+            [
+                journal_entry_values(user_id, entry_date, entry, now, change_seq)
+                for entry_date, entry in entries
+            ]
+        )
+        .returning(JournalEntry)
+    )
+    result = await db.execute(upsert, execution_options={"populate_existing": True})
+    return {
+        db_entry.date: (db_entry, db_entry.created_at == now)
+        for db_entry in result.scalars()
+    }
+
+
+async def upsert_journal_entry(
+    db: AsyncSession, user_id: int, entry_date: date, entry: JournalEntryCreate
+) -> tuple[JournalEntry, bool]:
+    """Insert or overwrite the user's entry for one date; see upsert_journal_entries."""
+    saved = await upsert_journal_entries(db, user_id, [(entry_date, entry)])
+    return saved[entry_date]
+
+
+async def record_entry_writes(
+    db: AsyncSession, user_id: int, saved: Iterable[tuple[JournalEntry, bool]]
+) -> None:
+    """Update the user's denormalized entry statistics after saving entries.
+
+    ``saved`` holds (entry, created) pairs as returned by the upsert. Every
+    save moves entries_updated_at; newly inserted entries also bump the
+    count, widen the date range and update the streaks. One UPDATE covers
+    the whole batch and runs in the caller's transaction, so the statistics
+    commit with the entries. updated_at is pinned so bookkeeping does not
+    look like a profile edit.
+    """
+    saved = list(saved)
+    if not saved:
+        return
+    values: dict[str, Any] = {
+        "entries_updated_at": max(db_entry.updated_at for db_entry, _ in saved),
+        "updated_at": User.updated_at,
+    }
+    new_dates = [db_entry.date for db_entry, created in saved if created]
+    if new_dates:
+        first_date, last_date = min(new_dates), max(new_dates)
+        stored = (
+            await db.execute(
+                select(
+                    User.last_entry_date, User.current_streak, User.longest_streak
+                ).where(User.id == user_id)
+            )
+        ).one()
+        streak = extend_streaks(
+            stored.last_entry_date,
+            stored.current_streak,
+            stored.longest_streak,
+            new_dates,
+        )
+        if streak is None:
+            # A backfill can join runs; re-read the ones it touched
+            streak = await rescan_streaks(
+                db, user_id, stored.last_entry_date, stored.longest_streak, new_dates
+            )
+        values.update(
+            current_streak=streak[0],
+            longest_streak=streak[1],
+            entry_count=User.entry_count + len(new_dates),
+            first_entry_date=case(
+                (
+                    or_(
+                        User.first_entry_date.is_(None),
+                        User.first_entry_date > first_date,
+                    ),
+                    first_date,
+                ),
+                else_=User.first_entry_date,
+            ),
+            last_entry_date=case(
+                (
+                    or_(
+                        User.last_entry_date.is_(None),
+                        User.last_entry_date < last_date,
+                    ),
+                    last_date,
+                ),
+                else_=User.last_entry_date,
+            ),
+        )
+    await db.execute(update(User).where(User.id == user_id).values(**values))
+
+
+async def entry_emotions(
+    db: AsyncSession, user_id: int, dates: Sequence[date]
+) -> dict[date, Optional[str]]:
+    """Emotion of the user's entries on ``dates``; dates without an entry are absent.
+
+    Read in the write transaction before an upsert, so record_emotion_counts
+    knows what each save replaced. On SQLite the writer's BEGIN IMMEDIATE
+    already holds the database lock here, so no other process can change
+    these rows before the upsert.
+    """
+    if not dates:
+        return {}
+    result = await db.execute(
+        select(JournalEntry.date, JournalEntry.emotion).where(
+            JournalEntry.user_id == user_id, JournalEntry.date.in_(dates)
+        )
+    )
+    return dict(result.tuples().all())
+
+
+async def record_emotion_counts(
+    db: AsyncSession,
+    user_id: int,
+    previous: dict[date, Optional[str]],
+    saved: Iterable[tuple[JournalEntry, bool]],
+) -> None:
+    """Adjust the user's per-month emotion counts after saving entries.
+
+    ``previous`` comes from entry_emotions before the save. Each entry whose
+    emotion changed moves one count from the old emotion to the new one, with
+    one upsert for the whole batch in the caller's transaction; counts that
+    drop to zero are removed.
+    """
+    deltas: Counter[tuple[str, str]] = Counter()
+    for db_entry, _ in saved:
+        old_emotion = previous.get(db_entry.date)
+        if old_emotion == db_entry.emotion:
+            continue
+        month = format_month(db_entry.date)
+        if old_emotion is not None:
+            deltas[(month, old_emotion)] -= 1
+        if db_entry.emotion is not None:
+            deltas[(month, db_entry.emotion)] += 1
+    changes = [
+        {"user_id": user_id, "year_month": month, "emotion": emotion, "count": delta}
+        for (month, emotion), delta in deltas.items()
+        if delta
+    ]
+    if not changes:
+        return
+    await db.execute(emotion_count_upsert(db.get_bind().dialect.name).values(changes))
+    if any(delta < 0 for delta in deltas.values()):
+        await db.execute(
+            delete(EmotionMonthCount).where(
+                EmotionMonthCount.user_id == user_id, EmotionMonthCount.count <= 0
+            )
+        )
 
 
 # Initialize database with questions and quotes
 @app.on_event("startup")
 async def startup_event() -> None:
     """Initialize database with questions and quotes on startup."""
+    print(f"Database configuration: {describe_database(engine)}")
+    print(f"Session pools: {describe_session_pools()}")
     db = SessionLocal()
     try:
         # Check if data already exists
@@ -104,6 +415,8 @@ async def startup_event() -> None:
                     db.add(db_quote)
 
         db.commit()
+        # Serve prompts from memory from here on
+        load_catalog(db)
     except (SQLAlchemyError, DatabaseError) as e:
         db.rollback()
         print(f"Error initializing database: {e}")
@@ -111,6 +424,27 @@ async def startup_event() -> None:
         db.close()
 
 
+# Long-running tasks started at startup; referenced here so they are not
+# garbage collected, and cancelled on shutdown
+background_tasks: set[asyncio.Task[None]] = set()
+
+
+@app.on_event("startup")
+async def start_signing_key_refresh() -> None:
+    """Keep Firebase signing keys warm when tokens are verified locally."""
+    if firebase_auth.key_store is not None:
+        task = asyncio.create_task(firebase_auth.key_store.run_refresh_loop())
+        background_tasks.add(task)
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks() -> None:
+    """Cancel tasks started at startup."""
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
+
+
 @app.get("/")
 async def root() -> dict[str, str]:
     """
@@ -123,15 +457,19 @@ async def root() -> dict[str, str]:
 @app.post("/users/register", response_model=UserResponse)
 async def register_user(
     user_data: dict[str, Any] = Depends(get_current_user_dev),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Any:
     """
     Register a new user or return existing user
     """
-    existing_user = db.query(User).filter(User.firebase_uid == user_data["uid"]).first()
+    result = await db.execute(select(User).where(User.firebase_uid == user_data["uid"]))
+    existing_user = result.scalar_one_or_none()
 
     if existing_user:
-        return existing_user
+        user_cache.set(
+            existing_user.firebase_uid, UserProfile.model_validate(existing_user)
+        )
+        return UserResponse.model_validate(existing_user)
 
     new_user = User(
         firebase_uid=user_data["uid"],
@@ -142,37 +480,65 @@ async def register_user(
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
-    return new_user
+    user_cache.set(new_user.firebase_uid, UserProfile.model_validate(new_user))
+    return UserResponse.model_validate(new_user)
 
 
 @app.get("/users/me", response_model=UserResponse)
 async def get_current_user_info(
     user_data: dict[str, Any] = Depends(get_current_user_dev),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Any:
     """
     Get current user information
     """
-    user = db.query(User).filter(User.firebase_uid == user_data["uid"]).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = await get_user_by_firebase_uid(db, user_data["uid"])
+    stats = await get_entry_stats(db, user.id)
+    return UserResponse(**user.model_dump(), **stats.model_dump())
 
-    return user
+
+@app.get("/users/me/streak", response_model=StreakResponse)
+async def get_current_user_streak(
+    tz: str = "UTC",
+    user_data: dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> StreakResponse:
+    """Get the current and longest journaling streak
+
+    Read from the user row, which saves keep current, so no entries are
+    read. The current streak counts as unbroken until a whole day in
+    ``tz`` passes without an entry.
+    """
+    try:
+        today = datetime.now(ZoneInfo(tz)).date()
+    except (ZoneInfoNotFoundError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Unknown time zone") from exc
+
+    user = await get_user_by_firebase_uid(db, user_data["uid"])
+    stats = await get_entry_stats(db, user.id)
+    return StreakResponse(
+        current_streak=current_streak_on(
+            today, stats.last_entry_date, stats.current_streak
+        ),
+        longest_streak=stats.longest_streak,
+        last_entry_date=stats.last_entry_date,
+    )
 
 
 @app.put("/users/me", response_model=UserResponse)
 async def update_current_user(
     user_update: UserUpdate,
     user_data: dict[str, Any] = Depends(get_current_user_dev),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Any:
     """
     Update current user information
     """
-    user = db.query(User).filter(User.firebase_uid == user_data["uid"]).first()
+    result = await db.execute(select(User).where(User.firebase_uid == user_data["uid"]))
+    user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -186,42 +552,64 @@ async def update_current_user(
         user.preferences = user_update.preferences
 
     user.updated_at = datetime.now()
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+
+    user_cache.set(user.firebase_uid, UserProfile.model_validate(user))
+    return UserResponse.model_validate(user)
+
+
+@app.get("/gratitude-questions", response_model=list[str])
+async def get_gratitude_questions(
+    tz: str = "UTC",
+    if_none_match: Optional[str] = Header(default=None),
+    user_data: Optional[dict[str, Any]] = Depends(get_current_user_optional),
+) -> Response:
+    """Get 5 gratitude questions for today
 
-    return user
+    The pick is seeded by (user, local date in ``tz``), so it is the same all
+    day and the response may be cached until the user's midnight.
+    """
+    try:
+        now = datetime.now(ZoneInfo(tz))
+    except (ZoneInfoNotFoundError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Unknown time zone") from exc
 
+    seed_key = user_data["uid"] if user_data else "anonymous"
+    questions = daily_gratitude_questions(seed_key, now.date())
 
-@app.get("/gratitude-questions")
-async def get_gratitude_questions(db: Session = Depends(get_db)) -> list[str]:
-    """Get 5 random gratitude questions for today"""
-    questions = db.query(GratitudeQuestion).all()
-    if len(questions) < 5:
-        return [q.question for q in questions]
-    return [q.question for q in random.sample(questions, 5)]
+    headers = {
+        "ETag": make_etag(seed_key, now.date(), *questions),
+        "Cache-Control": f"private, max-age={seconds_until_midnight(now)}",
+        "Vary": "Authorization",
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(content=list(questions), headers=headers)
 
 
 @app.get("/emotion-questions/{emotion}")
-async def get_emotion_questions(
-    emotion: Emotion, db: Session = Depends(get_db)
-) -> list[EmotionQuestionResponse]:
+async def get_emotion_questions(emotion: Emotion) -> list[EmotionQuestionResponse]:
     """Get questions for a specific emotion"""
-    questions = (
-        db.query(EmotionQuestion).filter(EmotionQuestion.emotion == emotion.value).all()
-    )
-    return [EmotionQuestionResponse(id=q.id, question=q.question) for q in questions]
+    questions = get_catalog().emotion_questions.get(emotion.value, ())
+    return [
+        EmotionQuestionResponse(id=question_id, question=question)
+        for question_id, question in questions
+    ]
 
 
 @app.get("/quote/{emotion}")
-async def get_quote_for_emotion(
-    emotion: Emotion, db: Session = Depends(get_db)
-) -> dict[str, str]:
+async def get_quote_for_emotion(emotion: Emotion) -> dict[str, str]:
     """Get a random quote for a specific emotion"""
-    quotes = db.query(Quote).filter(Quote.emotion == emotion.value).all()
+    quotes = get_catalog().quotes.get(emotion.value)
     if not quotes:
         return {"quote": "Every day is a new beginning.", "author": "Unknown"}
-    selected_quote = random.choice(quotes)
-    return {"quote": selected_quote.quote, "author": selected_quote.author}
+    quote, author = random.choice(quotes)
+    return {"quote": quote, "author": author}
+
+
+# Journal reads may be stored by the browser but must be revalidated
+ENTRY_CACHE_CONTROL = "private, no-cache"
 
 
 #  Move business logic to service layer for better architecture. Create a JournalEntryService class, then use it in the route handler.
@@ -231,92 +619,245 @@ async def get_quote_for_emotion(
 async def create_journal_entry(
     entry: JournalEntryCreate,
     user_data: dict[str, Any] = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Create or update a journal entry for today"""
     today = date.today()
 
     # Get current user
-    user = get_user_by_firebase_uid(db, user_data["uid"])
+    user = await get_user_by_firebase_uid(db, user_data["uid"])
 
-    # Check if entry exists for today for this user
-    existing_entry = (
-        db.query(JournalEntry)
-        .filter(JournalEntry.date == today, JournalEntry.user_id == user.id)
-        .first()
-    )
+    previous = await entry_emotions(db, user.id, [today])
+    db_entry, created = await upsert_journal_entry(db, user.id, today, entry)
+    await record_entry_writes(db, user.id, [(db_entry, created)])
+    await record_emotion_counts(db, user.id, previous, [(db_entry, created)])
+    await db.commit()
+    return db_entry
 
-    if existing_entry:
-        # Update existing entry
-        existing_entry.gratitude_answers = entry.gratitude_answers
-        existing_entry.emotion = entry.emotion.value if entry.emotion else None
-        existing_entry.emotion_answers = entry.emotion_answers
-        existing_entry.custom_text = entry.custom_text
-        existing_entry.visual_settings = entry.visual_settings
-        existing_entry.updated_at = datetime.now()
-        db.commit()
-        db.refresh(existing_entry)
-        return existing_entry
-    else:
-        # Create new entry
-        db_entry = JournalEntry(
-            user_id=user.id,
-            date=today,
-            gratitude_answers=entry.gratitude_answers,
-            emotion=entry.emotion.value if entry.emotion else None,
-            emotion_answers=entry.emotion_answers,
-            custom_text=entry.custom_text,
-            visual_settings=entry.visual_settings,
+
+# Upper bound on items per batch save; clients send larger backlogs in chunks
+JOURNAL_BATCH_MAX_ITEMS = 100
+
+
+@app.post("/journal-entries/batch", response_model=JournalEntryBatchResponse)
+async def save_journal_entries_batch(
+    batch: JournalEntryBatchRequest,
+    user_data: dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> JournalEntryBatchResponse:
+    """Create or update many dated entries in one transaction
+
+    For replaying saves made while offline: one token check, one user lookup
+    and one upsert statement instead of a request per entry. Results follow
+    request order; when a date appears more than once the last item wins.
+    """
+    if len(batch.entries) > JOURNAL_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch holds at most {JOURNAL_BATCH_MAX_ITEMS} entries",
         )
-        db.add(db_entry)
-        db.commit()
-        db.refresh(db_entry)
-        return db_entry
+
+    # Allow a day of slack for clients ahead of the server's time zone
+    latest_date = date.today() + timedelta(days=1)
+    last_index = {item.date: index for index, item in enumerate(batch.entries)}
+    to_save = [
+        (item.date, item)
+        for index, item in enumerate(batch.entries)
+        if last_index[item.date] == index and item.date <= latest_date
+    ]
+
+    user = await get_user_by_firebase_uid(db, user_data["uid"])
+    previous = await entry_emotions(
+        db, user.id, [entry_date for entry_date, _ in to_save]
+    )
+    saved = await upsert_journal_entries(db, user.id, to_save)
+    await record_entry_writes(db, user.id, saved.values())
+    await record_emotion_counts(db, user.id, previous, saved.values())
+    await db.commit()
+
+    results = []
+    for index, item in enumerate(batch.entries):
+        if item.date > latest_date:
+            results.append(
+                JournalEntryBatchResult(
+                    date=item.date, status="rejected", error="Date is in the future"
+                )
+            )
+        elif last_index[item.date] != index:
+            results.append(
+                JournalEntryBatchResult(
+                    date=item.date,
+                    status="skipped",
+                    error="Superseded by a later item for the same date",
+                )
+            )
+        else:
+            db_entry, created = saved[item.date]
+            results.append(
+                JournalEntryBatchResult(
+                    date=item.date,
+                    status="created" if created else "updated",
+                    entry=JournalEntryResponse.model_validate(db_entry),
+                )
+            )
+    return JournalEntryBatchResponse(results=results)
+
+
+def journal_entry_etag(entry_id: int, updated_at: datetime) -> str:
+    """ETag for a single entry; changes whenever the entry is saved."""
+    return make_etag(entry_id, updated_at.isoformat())
 
 
 @app.get("/journal-entry/{entry_date}", response_model=JournalEntryResponse)
 async def get_journal_entry(
     entry_date: str,
+    if_none_match: Optional[str] = Header(default=None),
     user_data: dict[str, Any] = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> Any:
-    """Get journal entry for a specific date"""
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Get journal entry for a specific date
+
+    Answers a matching ``If-None-Match`` with 304 after reading only the
+    entry's id and updated_at.
+    """
     try:
         entry_date_obj = datetime.strptime(entry_date, "%Y-%m-%d").date()
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400, detail="Invalid date format. Use YYYY-MM-DD"
+        ) from exc
 
-        # Get current user
-        user = get_user_by_firebase_uid(db, user_data["uid"])
+    # Get current user
+    user = await get_user_by_firebase_uid(db, user_data["uid"])
+    owned_entry = and_(
+        JournalEntry.date == entry_date_obj, JournalEntry.user_id == user.id
+    )
 
-        entry = (
-            db.query(JournalEntry)
-            .filter(
-                JournalEntry.date == entry_date_obj,
-                JournalEntry.user_id == user.id,
+    if if_none_match:
+        version = (
+            await db.execute(
+                select(JournalEntry.id, JournalEntry.updated_at).where(owned_entry)
             )
-            .first()
-        )
+        ).one_or_none()
+        if version is not None:
+            etag = journal_entry_etag(version.id, version.updated_at)
+            if etag_matches(if_none_match, etag):
+                return Response(
+                    status_code=304,
+                    headers={"ETag": etag, "Cache-Control": ENTRY_CACHE_CONTROL},
+                )
 
-        if not entry:
-            raise HTTPException(
-                status_code=404,
-                detail="Journal entry not found",
-            )
-        return entry
-    except ValueError as exc:
+    row = (
+        await db.execute(select(*JOURNAL_ENTRY_COLUMNS).where(owned_entry))
+    ).one_or_none()
+    if row is None:
         raise HTTPException(
-            status_code=400, detail="Invalid date format. Use YYYY-MM-DD"
-        ) from exc
+            status_code=404,
+            detail="Journal entry not found",
+        )
+    return ORJSONResponse(
+        journal_entry_rows_to_dicts([row])[0],
+        headers={
+            "ETag": journal_entry_etag(row.id, row.updated_at),
+            "Cache-Control": ENTRY_CACHE_CONTROL,
+        },
+    )
 
 
 # consider extracting the pagination logic to a service layer for reusability (a reusable pagination service)
+def journal_entry_filters(
+    user_id: int,
+    first: Optional[date],
+    last: Optional[date],
+    emotion: Optional[str],
+) -> list[Any]:
+    """WHERE clauses for the user's entries from ``first`` to ``last`` (inclusive)."""
+    clauses: list[Any] = [JournalEntry.user_id == user_id]
+    if first is not None:
+        clauses.append(JournalEntry.date >= first)
+    if last is not None:
+        clauses.append(JournalEntry.date <= last)
+    if emotion is not None:
+        clauses.append(JournalEntry.emotion == emotion)
+    return clauses
+
+
+def journal_entries_list_query(
+    user_id: int,
+    columns: Sequence[Any],
+    first: Optional[date] = None,
+    last: Optional[date] = None,
+    emotion: Optional[str] = None,
+    after: Optional[tuple[date, int]] = None,
+) -> Select[Any]:
+    """The user's entries newest first, optionally after the (date, id) ``after``.
+
+    Date bounds are a range seek on (user_id, date); the rows come back in
+    index order, so no sort is needed. An emotion filter is checked per row
+    in that range.
+    """
+    # Newest first; id breaks ties so the (date, id) cursor is a total order
+    # Plain columns rather than ORM entities: rows are serialized as-is
+    query = (
+        select(*columns)
+        .where(*journal_entry_filters(user_id, first, last, emotion))
+        .order_by(JournalEntry.date.desc(), JournalEntry.id.desc())
+    )
+    if after is not None:
+        after_date, after_id = after
+        query = query.where(
+            or_(
+                JournalEntry.date < after_date,
+                and_(JournalEntry.date == after_date, JournalEntry.id < after_id),
+            )
+        )
+    return query
+
+
+def journal_entries_count_query(
+    user_id: int,
+    first: Optional[date] = None,
+    last: Optional[date] = None,
+    emotion: Optional[str] = None,
+) -> Select[Any]:
+    """How many of the user's entries match the list filters."""
+    return select(func.count()).where(
+        *journal_entry_filters(user_id, first, last, emotion)
+    )
+
+
 @app.get("/journal-entries", response_model=PaginatedJournalEntriesResponse)
 async def get_all_journal_entries(
     page: int = 1,
     page_size: int = 10,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    summary: bool = False,
+    from_date: Optional[str] = Query(default=None, alias="from"),
+    to_date: Optional[str] = Query(default=None, alias="to"),
+    emotion: Optional[Emotion] = None,
+    if_none_match: Optional[str] = Header(default=None),
     user_data: dict[str, Any] = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> PaginatedJournalEntriesResponse:
-    """Get paginated journal entries for the current user"""
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Get paginated journal entries for the current user
+
+    Page-number mode uses ``page``. Passing the ``next_cursor`` from a previous
+    response switches to keyset mode, which seeks straight to the next
+    (date, id) instead of skipping rows with OFFSET; ``page`` is then ignored.
+
+    ``fields`` (comma-separated) limits each entry to those fields, plus id
+    and date; ``summary`` returns id, date, emotion and a ``preview`` of the
+    first PREVIEW_LENGTH characters of custom_text. Only the requested
+    columns are selected, so list views skip the full text and JSON blobs.
+
+    ``from`` and ``to`` (YYYY-MM-DD, inclusive) and ``emotion`` narrow the
+    list; see journal_entries_list_query for how they are read.
+
+    The ETag comes from the user's change_seq, read from the users row on
+    every request, so a matching ``If-None-Match`` gets a 304 after
+    one primary-key lookup and no entry reads.
+    """
     # Validate pagination parameters
     if page < 1:
         raise HTTPException(status_code=400, detail="Page number must be >= 1")
@@ -324,46 +865,569 @@ async def get_all_journal_entries(
         raise HTTPException(
             status_code=400, detail="Page size must be between 1 and 100"
         )
+    after: Optional[tuple[date, int]] = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    if summary and fields is not None:
+        raise HTTPException(
+            status_code=400, detail="Use either fields or summary, not both"
+        )
+    selected = JOURNAL_ENTRY_FIELDS
+    if summary:
+        selected = SUMMARY_FIELDS
+    elif fields is not None:
+        try:
+            selected = parse_fields(fields)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    bounds: list[Optional[date]] = []
+    for value in (from_date, to_date):
+        try:
+            bounds.append(
+                datetime.strptime(value, "%Y-%m-%d").date()
+                if value is not None
+                else None
+            )
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=400, detail="Invalid date format. Use YYYY-MM-DD"
+            ) from exc
+    first, last = bounds
+    if first and last and first > last:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+    filtered = first is not None or last is not None or emotion is not None
 
     # Get current user
-    user = get_user_by_firebase_uid(db, user_data["uid"])
-
-    # Calculate offset
-    offset = (page - 1) * page_size
-
-    # Get total count for pagination metadata
-    total_items = db.query(JournalEntry).filter(JournalEntry.user_id == user.id).count()
-
-    # Get paginated entries
-    entries = (
-        db.query(JournalEntry)
-        .filter(JournalEntry.user_id == user.id)
-        .order_by(JournalEntry.date.desc())
-        .offset(offset)
-        .limit(page_size)
-        .all()
+    user = await get_user_by_firebase_uid(db, user_data["uid"])
+    stats = await get_entry_stats(db, user.id)
+
+    etag = make_etag(
+        user.id,
+        stats.change_seq,
+        stats.entry_count,
+        page,
+        page_size,
+        cursor,
+        ",".join(selected),
+        first,
+        last,
+        emotion.value if emotion else None,
     )
+    headers = {"ETag": etag, "Cache-Control": ENTRY_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    # Maintained on write, so no COUNT(*) per unfiltered page request;
+    # filtered counts are one range scan of the covering calendar index
+    total_items = stats.entry_count
+    if filtered:
+        total_items = (
+            await db.execute(
+                journal_entries_count_query(
+                    user.id, first, last, emotion.value if emotion else None
+                )
+            )
+        ).scalar_one()
+
+    query = journal_entries_list_query(
+        user.id,
+        projection_columns(selected),
+        first,
+        last,
+        emotion.value if emotion else None,
+        after,
+    )
+    if after is None:
+        query = query.offset((page - 1) * page_size)
+
+    # Fetch one extra row to learn whether another page follows
+    result = await db.execute(query.limit(page_size + 1))
+    entries = result.all()
+    has_next = len(entries) > page_size
+    entries = entries[:page_size]
 
     # Calculate pagination metadata
     total_pages = (total_items + page_size - 1) // page_size  # Ceiling division
-    has_next = page < total_pages
-    has_previous = page > 1
+    next_cursor = encode_cursor(entries[-1].date, entries[-1].id) if has_next else None
 
     pagination_metadata = PaginationMetadata(
-        current_page=page,
+        current_page=page if after is None else None,
         page_size=page_size,
         total_pages=total_pages,
         total_items=total_items,
         has_next=has_next,
-        has_previous=has_previous,
+        has_previous=after is not None or page > 1,
+        next_cursor=next_cursor,
+    )
+
+    response = render_journal_entries_page(entries, pagination_metadata, selected)
+    response.headers.update(headers)
+    return response
+
+
+def journal_entry_changes_query(
+    user_id: int, after: Optional[tuple[int, int]], limit: int
+) -> Select[Any]:
+    """Entries saved after the (change_seq, id) position ``after``, oldest first.
+
+    change_seq follows the response columns; rendering drops it.
+    """
+    # id breaks ties between entries saved in the same batch
+    query = (
+        select(*JOURNAL_ENTRY_COLUMNS, JournalEntry.change_seq)
+        .where(JournalEntry.user_id == user_id)
+        .order_by(JournalEntry.change_seq, JournalEntry.id)
+        .limit(limit)
+    )
+    if after is not None:
+        after_seq, after_id = after
+        query = query.where(
+            or_(
+                JournalEntry.change_seq > after_seq,
+                and_(
+                    JournalEntry.change_seq == after_seq,
+                    JournalEntry.id > after_id,
+                ),
+            )
+        )
+    return query
+
+
+@app.get("/journal-entries/changes", response_model=JournalEntryChangesResponse)
+async def get_journal_entry_changes(
+    since: Optional[str] = None,
+    limit: int = 100,
+    user_data: dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Get entries saved after ``since``, oldest change first
+
+    Omit ``since`` for a full sync, then keep passing back ``next_since``.
+    Reads walk the (user_id, change_seq) index from the token onwards, so a
+    sync costs as much as the edits made since the last one, not the size
+    of the journal.
+    """
+    if limit < 1 or limit > 500:
+        raise HTTPException(status_code=400, detail="Limit must be between 1 and 500")
+    after: Optional[tuple[int, int]] = None
+    if since is not None:
+        try:
+            after = decode_change_token(since)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid since token") from exc
+
+    user = await get_user_by_firebase_uid(db, user_data["uid"])
+
+    result = await db.execute(journal_entry_changes_query(user.id, after, limit + 1))
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_since = (
+        encode_change_token(rows[-1].change_seq, rows[-1].id) if rows else since
+    )
+
+    return ORJSONResponse(
+        {
+            "entries": journal_entry_rows_to_dicts(rows),
+            "next_since": next_since,
+            "has_more": has_more,
+        }
+    )
+
+
+def month_calendar_query(user_id: int, first: date) -> Select:
+    """(date, emotion) of the user's entries in the month starting at ``first``."""
+    start, end = month_bounds(first)
+    return select(JournalEntry.date, JournalEntry.emotion).where(
+        JournalEntry.user_id == user_id,
+        JournalEntry.date >= start,
+        JournalEntry.date < end,
+    )
+
+
+@app.get("/journal-entries/month/{month}", response_model=MonthCalendarResponse)
+async def get_month_calendar(
+    month: str,
+    if_none_match: Optional[str] = Header(default=None),
+    user_data: dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Which days of a ``YYYY-MM`` month have entries, and their emotions
+
+    One range scan of the (user_id, date) index per month, cached under the
+    user's change_seq: any save, from any worker or the CLI importer, bumps
+    it, so later requests miss and re-read. See MonthCalendarResponse for the
+    encoding.
+    """
+    try:
+        first = parse_month(month)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400, detail="Invalid month format. Use YYYY-MM"
+        ) from exc
+    month = format_month(first)
+
+    user = await get_user_by_firebase_uid(db, user_data["uid"])
+    # Read before the rows, so days cached under this change_seq are never
+    # older than it, even when a save commits while the query is running
+    stats = await get_entry_stats(db, user.id)
+
+    key = (user.id, month, stats.change_seq)
+    days = month_cache.get(key)
+    if days is None:
+        result = await db.execute(month_calendar_query(user.id, first))
+        days = encode_month(first, result.tuples())
+        month_cache.set(key, days)
+
+    etag = make_etag(user.id, month, stats.change_seq, *days)
+    headers = {"ETag": etag, "Cache-Control": ENTRY_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(
+        {"month": month, "days": days, "emotions": EMOTION_NAMES}, headers=headers
+    )
+
+
+def heatmap_query(user_id: int, year: int) -> Select:
+    """(date, emotion) of the user's entries in ``year``."""
+    start, end = year_bounds(year)
+    return select(JournalEntry.date, JournalEntry.emotion).where(
+        JournalEntry.user_id == user_id,
+        JournalEntry.date >= start,
+        JournalEntry.date < end,
     )
 
-    return PaginatedJournalEntriesResponse(
-        entries=[JournalEntryResponse.model_validate(entry) for entry in entries],
-        pagination=pagination_metadata,
+
+@app.get("/journal-entries/heatmap/{year}", response_model=HeatmapResponse)
+async def get_heatmap(
+    year: int = Path(ge=1, le=9998),
+    if_none_match: Optional[str] = Header(default=None),
+    user_data: dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Which days of ``year`` have entries, and their emotions, as packed bits
+
+    One scan of the covering (user_id, date, emotion) index, cached under the
+    user's change_seq like months (see get_month_calendar). See
+    HeatmapResponse for the encoding.
+    """
+    user = await get_user_by_firebase_uid(db, user_data["uid"])
+    stats = await get_entry_stats(db, user.id)
+
+    key = (user.id, year, stats.change_seq)
+    encoded = heatmap_cache.get(key)
+    if encoded is None:
+        result = await db.execute(heatmap_query(user.id, year))
+        encoded = encode_year(year, result.tuples())
+        heatmap_cache.set(key, encoded)
+    days, codes = encoded
+
+    etag = make_etag(user.id, year, stats.change_seq, days, codes)
+    headers = {"ETag": etag, "Cache-Control": ENTRY_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(
+        {"year": year, "days": days, "codes": codes, "emotions": EMOTION_NAMES},
+        headers=headers,
     )
 
 
+# Upper bound on dates per /journal-entries/by-dates request; a month view
+BY_DATES_MAX = 31
+
+
+def journal_entries_by_dates_query(user_id: int, dates: Iterable[date]) -> Select:
+    """The user's entries on any of ``dates``, oldest first."""
+    return (
+        select(*JOURNAL_ENTRY_COLUMNS)
+        .where(JournalEntry.user_id == user_id, JournalEntry.date.in_(list(dates)))
+        .order_by(JournalEntry.date)
+    )
+
+
+@app.get("/journal-entries/by-dates", response_model=list[JournalEntryResponse])
+async def get_journal_entries_by_dates(
+    dates: str,
+    user_data: dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Get the entries for several specific dates in one query
+
+    ``dates`` is a comma-separated list of up to BY_DATES_MAX YYYY-MM-DD
+    dates. Dates without an entry are left out of the result.
+    """
+    try:
+        requested = {
+            datetime.strptime(value.strip(), "%Y-%m-%d").date()
+            for value in dates.split(",")
+            if value.strip()
+        }
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400, detail="Invalid date format. Use YYYY-MM-DD"
+        ) from exc
+    if not requested:
+        raise HTTPException(status_code=400, detail="No dates given")
+    if len(requested) > BY_DATES_MAX:
+        raise HTTPException(
+            status_code=400, detail=f"At most {BY_DATES_MAX} dates per request"
+        )
+
+    user = await get_user_by_firebase_uid(db, user_data["uid"])
+
+    result = await db.execute(
+        journal_entries_by_dates_query(user.id, sorted(requested))
+    )
+    return ORJSONResponse(journal_entry_rows_to_dicts(result.all()))
+
+
+@app.get("/journal-entries/search", response_model=JournalEntrySearchResponse)
+async def search_journal_entries(
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    user_data: dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Search the user's entries, newest match first
+
+    Matches entries containing every word of ``q`` in the custom text or
+    the gratitude and emotion answers; the last word also matches as a
+    prefix. Pass back ``next_cursor``, the (date, id) of the last result,
+    for the next page. The search runs on the FTS5 index that triggers keep
+    current, never on a table scan. Nothing depends on other users' entries,
+    so there is no relevance score: FTS5's bm25() is computed across all of
+    them.
+    """
+    if limit < 1 or limit > 50:
+        raise HTTPException(status_code=400, detail="Limit must be between 1 and 50")
+    if len(q) > SEARCH_MAX_QUERY_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Search query is longer than {SEARCH_MAX_QUERY_LENGTH} characters",
+        )
+    after: Optional[tuple[date, int]] = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+    user = await get_user_by_firebase_uid(db, user_data["uid"])
+    try:
+        params = search_parameters(user.id, q, after, limit + 1)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if (await db.connection()).dialect.name != "sqlite":
+        raise HTTPException(
+            status_code=501, detail="Search needs the SQLite FTS5 index"
+        )
+
+    rows = (await db.execute(SEARCH_QUERY, params)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1].date, rows[-1].id) if has_more else None
+
+    return ORJSONResponse(
+        {
+            "results": [
+                {
+                    "id": row.id,
+                    "date": row.date,
+                    "emotion": row.emotion,
+                    "snippet": best_snippet(row),
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
+    )
+
+
+@app.post("/journal-entries/import")
+async def import_journal_entries(
+    request: Request,
+    user_data: dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_read_session_factory
+    ),
+) -> dict[str, Any]:
+    """Import entries from an NDJSON body or a JSON array of entries
+
+    The body is parsed as it arrives and written IMPORT_BATCH_SIZE entries
+    per transaction with one executemany each, so the writer is released
+    between batches. Entries for dates that already exist are overwritten.
+    Returns counts, the first rejected records and throughput.
+    """
+    # Not on the write session: a lookup there would begin a transaction and
+    # hold the only SQLite writer while a slow upload trickles in
+    async with session_factory() as read_db:
+        user = await get_user_by_firebase_uid(read_db, user_data["uid"])
+    report = ImportReport()
+    batcher = ImportBatcher(user.id, report)
+    parser = JSONObjectStream()
+
+    async def write(rows: Optional[list[dict[str, Any]]]) -> None:
+        if not rows:
+            return
+        await db.run_sync(
+            lambda session: write_batch(session.connection(), user.id, rows)
+        )
+        await db.commit()
+        report.imported += len(rows)
+
+    try:
+        async for chunk in request.stream():
+            for record in parser.feed(chunk):
+                await write(batcher.add(record))
+        for record in parser.close():
+            await write(batcher.add(record))
+        await write(batcher.flush())
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{exc} after {report.received} records; {report.imported} entries were imported",
+        ) from exc
+    return report.as_dict()
+
+
+# Rows fetched per round trip while exporting
+EXPORT_BATCH_SIZE = 500
+
+
+@app.get("/journal-entries/export")
+async def export_journal_entries(
+    gzip: bool = False,
+    user_data: dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_read_session_factory
+    ),
+) -> StreamingResponse:
+    """Export every journal entry as newline-delimited JSON, oldest first
+
+    Rows are streamed from the database EXPORT_BATCH_SIZE at a time and
+    encoded as they arrive, so memory use does not grow with the journal.
+    With ``gzip=true`` the body is a .ndjson.gz file compressed on the fly.
+    """
+    user = await get_user_by_firebase_uid(db, user_data["uid"])
+    query = (
+        select(*JOURNAL_ENTRY_COLUMNS)
+        .where(JournalEntry.user_id == user.id)
+        .order_by(JournalEntry.date, JournalEntry.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    async def ndjson_chunks() -> AsyncGenerator[bytes, None]:
+        async with session_factory() as session:
+            result = await session.stream(query)
+            async for rows in result.partitions():
+                yield journal_entries_ndjson(rows)
+
+    async def gzip_chunks() -> AsyncGenerator[bytes, None]:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        async for chunk in ndjson_chunks():
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    filename = f"carolinas-diary-{date.today().isoformat()}.ndjson"
+    if gzip:
+        return StreamingResponse(
+            gzip_chunks(),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.gz"'},
+        )
+    return StreamingResponse(
+        ndjson_chunks(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def emotion_stats_query(
+    user_id: int, first_month: Optional[str], last_month: Optional[str]
+) -> Select:
+    """The user's emotion rollup rows from ``first_month`` to ``last_month``."""
+    query = (
+        select(
+            EmotionMonthCount.year_month,
+            EmotionMonthCount.emotion,
+            EmotionMonthCount.count,
+        )
+        .where(EmotionMonthCount.user_id == user_id)
+        .order_by(EmotionMonthCount.year_month, EmotionMonthCount.emotion)
+    )
+    if first_month is not None:
+        query = query.where(EmotionMonthCount.year_month >= first_month)
+    if last_month is not None:
+        query = query.where(EmotionMonthCount.year_month <= last_month)
+    return query
+
+
+@app.get("/stats/emotions", response_model=EmotionStatsResponse)
+async def get_emotion_stats(
+    from_month: Optional[str] = Query(default=None, alias="from"),
+    to_month: Optional[str] = Query(default=None, alias="to"),
+    user_data: dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Entries per emotion for each month from ``from`` to ``to`` (YYYY-MM)
+
+    Both bounds are inclusive and optional. Reads only the per-month rollup
+    kept up to date on save, never the entries themselves.
+    """
+    months: list[Optional[str]] = []
+    for value in (from_month, to_month):
+        try:
+            months.append(
+                format_month(parse_month(value)) if value is not None else None
+            )
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=400, detail="Invalid month format. Use YYYY-MM"
+            ) from exc
+    first_month, last_month = months
+    if first_month and last_month and first_month > last_month:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+
+    user = await get_user_by_firebase_uid(db, user_data["uid"])
+
+    result = await db.execute(emotion_stats_query(user.id, first_month, last_month))
+    by_month: dict[str, dict[str, int]] = {}
+    totals: Counter[str] = Counter()
+    for year_month, emotion, count in result.tuples():
+        by_month.setdefault(year_month, {})[emotion] = count
+        totals[emotion] += count
+    return ORJSONResponse(
+        {
+            "months": [
+                {"month": month, "counts": counts} for month, counts in by_month.items()
+            ],
+            "totals": dict(totals),
+        }
+    )
+
+
+@app.get("/metrics/caches")
+async def get_cache_metrics() -> dict[str, dict[str, Any]]:
+    """Hit/miss counters for the in-process caches"""
+    return {name: cache.stats() for name, cache in CACHES.items()}
+
+
+@app.get("/metrics/compression")
+async def get_compression_metrics() -> dict[str, Any]:
+    """Bytes saved and CPU time spent by response compression"""
+    return compression_stats.stats()
+
+
 @app.get("/emotions")
 async def get_available_emotions() -> list[str]:
     """Get list of available emotions"""
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Maintenance commands for Carolina's Diary
+Recomputes data that the API maintains incrementally on write
+"""
+
+import argparse
+import sys
+from itertools import groupby
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.engine import Connection
+
+from database import Base, engine
+from models import EmotionMonthCount, JournalEntry, User
+from search import rebuild_search_index
+from streaks import streak_lengths
+
+# flake8: noqa: E501
+
+
+def recompute_entry_stats(conn: Connection, user_id: Optional[int] = None) -> int:
+    """Recompute entry_count, first/last entry dates and the entries watermark.
+
+    Returns the number of users updated.
+    """
+    owned = JournalEntry.user_id == User.id
+    stmt = update(User).values(
+        entry_count=select(func.count(JournalEntry.id)).where(owned).scalar_subquery(),
+        first_entry_date=select(func.min(JournalEntry.date))
+        .where(owned)
+        .scalar_subquery(),
+        last_entry_date=select(func.max(JournalEntry.date))
+        .where(owned)
+        .scalar_subquery(),
+        entries_updated_at=select(func.max(JournalEntry.updated_at))
+        .where(owned)
+        .scalar_subquery(),
+        updated_at=User.updated_at,
+    )
+    if user_id is not None:
+        stmt = stmt.where(User.id == user_id)
+    return conn.execute(stmt).rowcount
+
+
+def recompute_emotion_counts(conn: Connection, user_id: Optional[int] = None) -> int:
+    """Rebuild emotion_month_counts from journal_entries.
+
+    Returns the number of rollup rows written.
+    """
+    if conn.dialect.name == "postgresql":
+        year_month = func.to_char(JournalEntry.date, "YYYY-MM")
+    else:
+        year_month = func.strftime("%Y-%m", JournalEntry.date)
+    counts = (
+        select(JournalEntry.user_id, year_month, JournalEntry.emotion, func.count())
+        .where(JournalEntry.emotion.is_not(None))
+        .group_by(JournalEntry.user_id, year_month, JournalEntry.emotion)
+    )
+    clear = delete(EmotionMonthCount)
+    if user_id is not None:
+        counts = counts.where(JournalEntry.user_id == user_id)
+        clear = clear.where(EmotionMonthCount.user_id == user_id)
+    conn.execute(clear)
+    return conn.execute(
+        insert(EmotionMonthCount).from_select(
+            ["user_id", "year_month", "emotion", "count"], counts
+        )
+    ).rowcount
+
+
+def recompute_streaks(conn: Connection, user_id: Optional[int] = None) -> int:
+    """Recompute current and longest streaks from each user's entry dates.
+
+    Reads the (user_id, date) index once in order. Returns the number of
+    users with entries.
+    """
+    reset = update(User).values(
+        current_streak=0, longest_streak=0, updated_at=User.updated_at
+    )
+    dates = select(JournalEntry.user_id, JournalEntry.date).order_by(
+        JournalEntry.user_id, JournalEntry.date
+    )
+    if user_id is not None:
+        reset = reset.where(User.id == user_id)
+        dates = dates.where(JournalEntry.user_id == user_id)
+    conn.execute(reset)
+
+    updated = 0
+    rows = conn.execution_options(yield_per=10000).execute(dates)
+    for owner_id, owner_rows in groupby(rows, key=lambda row: row.user_id):
+        current, longest = streak_lengths(row.date for row in owner_rows)
+        conn.execute(
+            update(User)
+            .where(User.id == owner_id)
+            .values(
+                current_streak=current,
+                longest_streak=longest,
+                updated_at=User.updated_at,
+            )
+        )
+        updated += 1
+    return updated
+
+
+def main() -> None:
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Carolina's Diary maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    recount = commands.add_parser(
+        "recount-entries",
+        help="Recompute per-user entry counts, date range, emotion counts and streaks",
+    )
+    recount.add_argument("--user-id", type=int, help="Only this user")
+
+    commands.add_parser(
+        "rebuild-search",
+        help="Create the full-text search index and reindex all entries",
+    )
+
+    args = parser.parse_args()
+    Base.metadata.create_all(bind=engine)
+
+    if args.command == "recount-entries":
+        with engine.begin() as conn:
+            updated = recompute_entry_stats(conn, args.user_id)
+            rollups = recompute_emotion_counts(conn, args.user_id)
+            recompute_streaks(conn, args.user_id)
+        print(
+            f"✅ Recomputed entry statistics for {updated} users "
+            f"and {rollups} emotion counts"
+        )
+    elif args.command == "rebuild-search":
+        if engine.dialect.name != "sqlite":
+            sys.exit("❌ Full-text search needs SQLite FTS5")
+        with engine.begin() as conn:
+            indexed = rebuild_search_index(conn)
+        print(f"✅ Rebuilt the search index over {indexed} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ import sqlite3
 from datetime import datetime
 from pathlib import Path
 
+from models import JOURNAL_ENTRY_SEARCH_DDL, JOURNAL_ENTRY_SEARCH_INDEX_ROWS
+
 # flake8: noqa: E501
 
 
@@ -40,6 +42,198 @@ def check_migration_needed(conn: sqlite3.Connection) -> bool:
     return not (users_table_exists and has_user_id)
 
 
+def add_journal_entry_unique_index(conn: sqlite3.Connection) -> None:
+    """Enforce one journal entry per user per day.
+
+    Duplicate (user_id, date) rows left by racing saves are collapsed onto
+    the most recently updated one before the unique index is created.
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        DELETE FROM journal_entries WHERE id NOT IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY user_id, date ORDER BY updated_at DESC, id DESC
+                ) AS position
+                FROM journal_entries
+            ) WHERE position = 1
+        )
+    """
+    )
+    if cursor.rowcount:
+        print(f"Removed {cursor.rowcount} duplicate journal entries")
+    cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_journal_entries_user_id_date ON journal_entries (user_id, date)"
+    )
+
+
+def add_change_seq_columns(conn: sqlite3.Connection) -> None:
+    """Add and backfill the change sequence behind the delta sync feed.
+
+    Existing entries are numbered per user in updated_at order, and each
+    user's change_seq starts after the last of them.
+    """
+    cursor = conn.cursor()
+    cursor.execute("DROP INDEX IF EXISTS ix_journal_entries_user_id_updated_at")
+    cursor.execute("PRAGMA table_info(journal_entries)")
+    columns = [column[1] for column in cursor.fetchall()]
+    if "change_seq" not in columns:
+        print("Adding change sequence to journal entries...")
+        cursor.execute(
+            "ALTER TABLE journal_entries ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0"
+        )
+        cursor.execute(
+            "ALTER TABLE users ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0"
+        )
+        cursor.execute(
+            """
+            UPDATE journal_entries SET change_seq = numbered.seq
+            FROM (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY updated_at, id) AS seq
+                FROM journal_entries
+            ) AS numbered
+            WHERE numbered.id = journal_entries.id
+        """
+        )
+        cursor.execute(
+            """
+            UPDATE users SET
+                change_seq = (SELECT COUNT(*) FROM journal_entries WHERE user_id = users.id)
+        """
+        )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_journal_entries_user_id_change_seq ON journal_entries (user_id, change_seq)"
+    )
+
+
+def add_journal_entry_calendar_index(conn: sqlite3.Connection) -> None:
+    """Cover (date, emotion) reads for calendar views."""
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_journal_entries_user_id_date_emotion ON journal_entries (user_id, date, emotion)"
+    )
+
+
+def add_user_entry_stats_columns(conn: sqlite3.Connection) -> None:
+    """Add and backfill the denormalized entry statistics on users."""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(users)")
+    columns = [column[1] for column in cursor.fetchall()]
+    if "entry_count" in columns:
+        return
+
+    print("Adding entry statistics to users...")
+    cursor.execute(
+        "ALTER TABLE users ADD COLUMN entry_count INTEGER NOT NULL DEFAULT 0"
+    )
+    cursor.execute("ALTER TABLE users ADD COLUMN first_entry_date DATE")
+    cursor.execute("ALTER TABLE users ADD COLUMN last_entry_date DATE")
+    cursor.execute(
+        """
+        UPDATE users SET
+            entry_count = (SELECT COUNT(*) FROM journal_entries WHERE user_id = users.id),
+            first_entry_date = (SELECT MIN(date) FROM journal_entries WHERE user_id = users.id),
+            last_entry_date = (SELECT MAX(date) FROM journal_entries WHERE user_id = users.id)
+    """
+    )
+
+
+def add_user_entries_watermark_column(conn: sqlite3.Connection) -> None:
+    """Add and backfill users.entries_updated_at."""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(users)")
+    columns = [column[1] for column in cursor.fetchall()]
+    if "entries_updated_at" in columns:
+        return
+
+    print("Adding entries watermark to users...")
+    cursor.execute("ALTER TABLE users ADD COLUMN entries_updated_at DATETIME")
+    cursor.execute(
+        """
+        UPDATE users SET
+            entries_updated_at = (SELECT MAX(updated_at) FROM journal_entries WHERE user_id = users.id)
+    """
+    )
+
+
+def add_emotion_month_counts_table(conn: sqlite3.Connection) -> None:
+    """Create emotion_month_counts and rebuild it from journal_entries."""
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS emotion_month_counts (
+            user_id INTEGER NOT NULL,
+            year_month VARCHAR(7) NOT NULL,
+            emotion VARCHAR NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (user_id, year_month, emotion),
+            FOREIGN KEY(user_id) REFERENCES users (id)
+        ) WITHOUT ROWID
+    """
+    )
+    cursor.execute("DELETE FROM emotion_month_counts")
+    cursor.execute(
+        """
+        INSERT INTO emotion_month_counts (user_id, year_month, emotion, count)
+        SELECT user_id, strftime('%Y-%m', date), emotion, COUNT(*)
+        FROM journal_entries
+        WHERE emotion IS NOT NULL
+        GROUP BY user_id, strftime('%Y-%m', date), emotion
+    """
+    )
+
+
+def add_journal_entry_search_index(conn: sqlite3.Connection) -> None:
+    """Create the full-text search index and its triggers, then fill it.
+
+    create_all only adds them alongside a new journal_entries table.
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'journal_entries_fts'"
+    )
+    if cursor.fetchone():
+        return
+
+    print("Building the journal search index...")
+    for statement in JOURNAL_ENTRY_SEARCH_DDL:
+        cursor.execute(statement)
+    cursor.execute(JOURNAL_ENTRY_SEARCH_INDEX_ROWS)
+
+
+def add_user_streak_columns(conn: sqlite3.Connection) -> None:
+    """Add and backfill users.current_streak and users.longest_streak."""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(users)")
+    columns = [column[1] for column in cursor.fetchall()]
+    if "current_streak" in columns:
+        return
+
+    print("Adding journaling streaks to users...")
+    cursor.execute(
+        "ALTER TABLE users ADD COLUMN current_streak INTEGER NOT NULL DEFAULT 0"
+    )
+    cursor.execute(
+        "ALTER TABLE users ADD COLUMN longest_streak INTEGER NOT NULL DEFAULT 0"
+    )
+    # Consecutive dates share julianday(date) - row number, one value per run
+    cursor.execute(
+        """
+        WITH numbered AS (
+            SELECT user_id, date,
+                julianday(date) - ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY date) AS run
+            FROM journal_entries
+        ), runs AS (
+            SELECT user_id, COUNT(*) AS length, MAX(date) AS last_date
+            FROM numbered GROUP BY user_id, run
+        )
+        UPDATE users SET
+            longest_streak = COALESCE((SELECT MAX(length) FROM runs WHERE user_id = users.id), 0),
+            current_streak = COALESCE((SELECT length FROM runs WHERE user_id = users.id ORDER BY last_date DESC LIMIT 1), 0)
+    """
+    )
+
+
 def migrate_database(db_path: Path) -> bool:
     """Main migration function"""
     db_path = Path(db_path)
@@ -57,6 +251,15 @@ def migrate_database(db_path: Path) -> bool:
 
         # Check if migration is needed
         if not check_migration_needed(conn):
+            add_journal_entry_unique_index(conn)
+            add_change_seq_columns(conn)
+            add_journal_entry_calendar_index(conn)
+            add_user_entry_stats_columns(conn)
+            add_user_entries_watermark_column(conn)
+            add_emotion_month_counts_table(conn)
+            add_user_streak_columns(conn)
+            add_journal_entry_search_index(conn)
+            conn.commit()
             print("Database is already migrated!")
             return True
 
@@ -160,6 +363,15 @@ def migrate_database(db_path: Path) -> bool:
 
             print("Journal entries table migrated successfully!")
 
+        add_journal_entry_unique_index(conn)
+        add_change_seq_columns(conn)
+        add_journal_entry_calendar_index(conn)
+        add_user_entry_stats_columns(conn)
+        add_user_entries_watermark_column(conn)
+        add_emotion_month_counts_table(conn)
+        add_user_streak_columns(conn)
+        add_journal_entry_search_index(conn)
+
         # Commit the changes
         conn.commit()
         print("Database migration completed successfully!")
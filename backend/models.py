@@ -1,9 +1,21 @@
 """SQLAlchemy models for the journal application."""
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import JSON, Boolean, Date, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    DDL,
+    JSON,
+    Boolean,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database import Base
@@ -28,6 +40,30 @@ class User(Base):
     # User preferences
     preferences: Mapped[Dict[str, Any]] = mapped_column(JSON, default={})
 
+    # Journal statistics maintained on write (see maintenance.py to recompute)
+    entry_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    first_entry_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    last_entry_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    # Days in the run of consecutive entries ending at last_entry_date, and
+    # the longest such run (see streaks.py)
+    current_streak: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    longest_streak: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # Bumped by every write transaction that saves entries, which stamp the
+    # new value as their change_seq; orders the changes feed and list ETags
+    change_seq: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # Latest updated_at among the user's entries
+    entries_updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True
+    )
+
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
@@ -44,6 +80,15 @@ class JournalEntry(Base):
     """Journal entry model containing gratitude, emotions, and custom text."""
 
     __tablename__ = "journal_entries"
+    __table_args__ = (
+        # One entry per user per day; also the conflict target for upserts
+        Index("ix_journal_entries_user_id_date", "user_id", "date", unique=True),
+        # Calendar views: covers (date, emotion) reads over a date range, so
+        # they never touch the table
+        Index("ix_journal_entries_user_id_date_emotion", "user_id", "date", "emotion"),
+        # Delta sync: a user's entries in the order they were last saved
+        Index("ix_journal_entries_user_id_change_seq", "user_id", "change_seq"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(
@@ -59,11 +104,109 @@ class JournalEntry(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # The user's change_seq when this entry was last saved
+    change_seq: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="journal_entries")
 
 
+class EmotionMonthCount(Base):
+    """Number of a user's entries per month and emotion, maintained on write."""
+
+    __tablename__ = "emotion_month_counts"
+    # Clustered on the key, so a user's range of months is one contiguous read
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), primary_key=True
+    )
+    year_month: Mapped[str] = mapped_column(String(7), primary_key=True)
+    emotion: Mapped[str] = mapped_column(String, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+# Full-text search index over journal text (SQLite FTS5). The FTS table is
+# external-content: it stores only the index and reads text back through
+# journal_entries_search_source, which flattens the JSON answer lists into
+# words. ``owner`` holds one token per user ("u<id>") so a search is scoped
+# to its user inside the index. Triggers read the view before and after
+# each change, so the indexed and the deleted text always agree.
+_SEARCH_COLUMNS = "owner, custom_text, gratitude_answers, emotion_answers"
+JOURNAL_ENTRY_SEARCH_INDEX_ROWS = f"INSERT INTO journal_entries_fts (rowid, {_SEARCH_COLUMNS}) SELECT id, {_SEARCH_COLUMNS} FROM journal_entries_search_source"
+_UNINDEX_ROW = f"INSERT INTO journal_entries_fts (journal_entries_fts, rowid, {_SEARCH_COLUMNS}) SELECT 'delete', id, {_SEARCH_COLUMNS} FROM journal_entries_search_source"
+_INDEXED_COLUMNS = "user_id, custom_text, gratitude_answers, emotion_answers"
+
+JOURNAL_ENTRY_SEARCH_DDL = (
+    """
+    CREATE VIEW IF NOT EXISTS journal_entries_search_source AS
+    SELECT
+        id,
+        'u' || user_id AS owner,
+        custom_text,
+        (SELECT group_concat(value, ' ') FROM json_each(journal_entries.gratitude_answers)) AS gratitude_answers,
+        (SELECT group_concat(value, ' ') FROM json_each(journal_entries.emotion_answers)) AS emotion_answers
+    FROM journal_entries
+    """,
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS journal_entries_fts USING fts5(
+        {_SEARCH_COLUMNS},
+        content='journal_entries_search_source',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS journal_entries_search_insert
+    AFTER INSERT ON journal_entries BEGIN
+        {JOURNAL_ENTRY_SEARCH_INDEX_ROWS} WHERE id = new.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS journal_entries_search_before_update
+    BEFORE UPDATE OF {_INDEXED_COLUMNS} ON journal_entries BEGIN
+        {_UNINDEX_ROW} WHERE id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS journal_entries_search_after_update
+    AFTER UPDATE OF {_INDEXED_COLUMNS} ON journal_entries BEGIN
+        {JOURNAL_ENTRY_SEARCH_INDEX_ROWS} WHERE id = new.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS journal_entries_search_delete
+    BEFORE DELETE ON journal_entries BEGIN
+        {_UNINDEX_ROW} WHERE id = old.id;
+    END
+    """,
+)
+
+JOURNAL_ENTRY_SEARCH_DROP = (
+    "DROP TRIGGER IF EXISTS journal_entries_search_insert",
+    "DROP TRIGGER IF EXISTS journal_entries_search_before_update",
+    "DROP TRIGGER IF EXISTS journal_entries_search_after_update",
+    "DROP TRIGGER IF EXISTS journal_entries_search_delete",
+    "DROP TABLE IF EXISTS journal_entries_fts",
+    "DROP VIEW IF EXISTS journal_entries_search_source",
+)
+
+for _statement in JOURNAL_ENTRY_SEARCH_DDL:
+    event.listen(
+        JournalEntry.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+for _statement in JOURNAL_ENTRY_SEARCH_DROP:
+    event.listen(
+        JournalEntry.__table__,
+        "before_drop",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+
+
 class GratitudeQuestion(Base):
     """Gratitude question model for prompting user responses."""
 
@@ -0,0 +1,48 @@
+"""Cursor helpers for keyset pagination of journal entries."""
+
+import base64
+import binascii
+from datetime import date
+from typing import Tuple
+
+# flake8: noqa: E501
+
+
+def encode_cursor(entry_date: date, entry_id: int) -> str:
+    """Encode the (date, id) of the last row on a page as an opaque token."""
+    raw = f"{entry_date.isoformat()}:{entry_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Decode a token from ``encode_cursor``.
+
+    Raises ValueError for anything that is not a well-formed cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        date_part, id_part = raw.split(":")
+        return date.fromisoformat(date_part), int(id_part)
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+
+
+def encode_change_token(change_seq: int, entry_id: int) -> str:
+    """Encode the (change_seq, id) of the last change a client has seen."""
+    raw = f"{change_seq}|{entry_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_change_token(token: str) -> Tuple[int, int]:
+    """Decode a token from ``encode_change_token``.
+
+    Raises ValueError for anything that is not a well-formed token.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        seq_part, id_part = raw.split("|")
+        return int(seq_part), int(id_part)
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("Malformed change token") from exc
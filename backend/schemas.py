@@ -2,7 +2,7 @@
 
 from datetime import date, datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -36,8 +36,8 @@ class UserCreate(BaseModel):
     preferences: Dict[str, Any] = {}
 
 
-class UserResponse(BaseModel):
-    """Schema for user response data."""
+class UserProfile(BaseModel):
+    """Schema for a user's identity and profile, as cached per firebase_uid."""
 
     id: int
     firebase_uid: str
@@ -55,6 +55,37 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class UserEntryStats(BaseModel):
+    """Schema for the entry statistics that saves keep on the user row.
+
+    Never cached: requests that need them read the row.
+    """
+
+    entry_count: int = 0
+    first_entry_date: Optional[date] = None
+    last_entry_date: Optional[date] = None
+    entries_updated_at: Optional[datetime] = None
+    change_seq: int = 0
+    # Run ending at last_entry_date; /users/me/streak applies today's date
+    current_streak: int = 0
+    longest_streak: int = 0
+
+
+class UserResponse(UserEntryStats, UserProfile):
+    """Schema for user response data."""
+
+
+class StreakResponse(BaseModel):
+    """Schema for the user's journaling streak.
+
+    ``current_streak`` is 0 once a day has been skipped since the last entry.
+    """
+
+    current_streak: int
+    longest_streak: int
+    last_entry_date: Optional[date]
+
+
 class UserUpdate(BaseModel):
     """Schema for updating user data."""
 
@@ -94,6 +125,99 @@ class JournalEntryResponse(BaseModel):
         from_attributes = True
 
 
+class JournalEntryChangesResponse(BaseModel):
+    """Schema for a page of the delta sync feed.
+
+    ``next_since`` is the token to send as ``since`` on the next call; it is
+    returned even when there are no changes. ``has_more`` means another call
+    will return more changes straight away.
+    """
+
+    entries: List[JournalEntryResponse]
+    next_since: Optional[str]
+    has_more: bool
+
+
+class MonthCalendarResponse(BaseModel):
+    """Schema for a month of per-day entry codes.
+
+    ``days[i]`` describes day ``i + 1``: 0 means no entry, otherwise bit 0 is
+    set and ``code >> 1`` is the emotion, an index into ``emotions`` plus
+    one (0 when the entry has no emotion).
+    """
+
+    month: str
+    days: List[int]
+    emotions: List[str]
+
+
+class HeatmapResponse(BaseModel):
+    """Schema for a year of entry days, packed for heatmap views.
+
+    ``days`` is a base64 bitset: bit ``i % 8`` of byte ``i // 8`` is set when
+    day ``i`` (0 is January 1st) has an entry. ``codes`` is base64 with 4 bits
+    per day, the low half of byte ``i // 2`` for even ``i`` and the high half
+    for odd ``i``; a code indexes ``emotions`` plus one, 0 meaning none.
+    """
+
+    year: int
+    days: str
+    codes: str
+    emotions: List[str]
+
+
+class JournalEntrySearchHit(BaseModel):
+    """Schema for one search result.
+
+    ``snippet`` is a short excerpt with matched words wrapped in
+    ``<mark>``/``</mark>``; the rest of it is unescaped journal text.
+    """
+
+    id: int
+    date: date
+    emotion: Optional[str]
+    snippet: Optional[str]
+
+
+class JournalEntrySearchResponse(BaseModel):
+    """Schema for a page of search results, newest first."""
+
+    results: List[JournalEntrySearchHit]
+    next_cursor: Optional[str]
+    has_more: bool
+
+
+class JournalEntryBatchItem(JournalEntryCreate):
+    """Schema for one dated entry in a batch save."""
+
+    date: date
+
+
+class JournalEntryBatchRequest(BaseModel):
+    """Schema for saving several dated entries at once."""
+
+    entries: List[JournalEntryBatchItem]
+
+
+class JournalEntryBatchResult(BaseModel):
+    """Schema for the outcome of one batch item.
+
+    ``skipped`` items were superseded by a later item for the same date;
+    ``rejected`` items failed a check and were not saved.
+    """
+
+    date: date
+    status: Literal["created", "updated", "skipped", "rejected"]
+    entry: Optional[JournalEntryResponse] = None
+    error: Optional[str] = None
+
+
+class JournalEntryBatchResponse(BaseModel):
+    """Schema for a batch save response, one result per item in request order."""
+
+    results: List[JournalEntryBatchResult]
+
+
 class EmotionQuestionResponse(BaseModel):
     """Schema for emotion question response data."""
 
@@ -108,15 +232,37 @@ class QuoteResponse(BaseModel):
     author: str
 
 
+class EmotionMonthStats(BaseModel):
+    """Schema for one month of emotion counts."""
+
+    month: str
+    counts: Dict[str, int]
+
+
+class EmotionStatsResponse(BaseModel):
+    """Schema for emotion counts over a range of months.
+
+    Months without entries that have an emotion are left out.
+    """
+
+    months: List[EmotionMonthStats]
+    totals: Dict[str, int]
+
+
 class PaginationMetadata(BaseModel):
-    """Schema for pagination metadata."""
+    """Schema for pagination metadata.
+
+    ``current_page`` is None for cursor-mode requests. ``next_cursor`` is set
+    whenever another page follows, in either mode.
+    """
 
-    current_page: int
+    current_page: Optional[int]
     page_size: int
     total_pages: int
     total_items: int
     has_next: bool
     has_previous: bool
+    next_cursor: Optional[str] = None
 
 
 class PaginatedJournalEntriesResponse(BaseModel):
@@ -0,0 +1,134 @@
+"""Full-text search over a user's journal entries (SQLite FTS5).
+
+The index itself is declared next to JournalEntry in models.py and kept in
+sync by triggers; this module turns user input into FTS5 queries and reads
+pages of results, newest first.
+"""
+
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, Integer, String, TextualSelect, text
+from sqlalchemy.engine import Connection
+
+from models import JOURNAL_ENTRY_SEARCH_DDL, JOURNAL_ENTRY_SEARCH_INDEX_ROWS
+
+# flake8: noqa: E501
+
+# Longest accepted search string, and the most words taken from it
+SEARCH_MAX_QUERY_LENGTH = 200
+SEARCH_MAX_TERMS = 10
+
+# Markers around matched words in snippets, and words of context per snippet
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+SNIPPET_TOKENS = 16
+
+# Indexed text columns, in FTS column order after ``owner``
+SEARCH_TEXT_COLUMNS = ("custom_text", "gratitude_answers", "emotion_answers")
+
+_WORD = re.compile(r"\w+")
+
+_SNIPPETS = ",\n    ".join(
+    f"snippet(journal_entries_fts, {column}, :open, :close, '…', :tokens) AS {name}"
+    for column, name in enumerate(SEARCH_TEXT_COLUMNS, start=1)
+)
+
+# Finds the user's matches, keeps one page past the (date, id) cursor,
+# newest first, then builds snippets only for that page. Matches are not
+# ranked: FTS5's bm25() draws on every user's entries, so scores would
+# reveal how common a word is in other journals and shift, reordering
+# pages, whenever anyone writes.
+SEARCH_QUERY: TextualSelect = text(
+    f"""
+WITH page AS (
+    SELECT journal_entries.id, journal_entries.date
+    FROM journal_entries_fts
+    JOIN journal_entries ON journal_entries.id = journal_entries_fts.rowid
+    WHERE journal_entries_fts MATCH :match
+      AND journal_entries.user_id = :user_id
+      AND (:after_date IS NULL
+           OR journal_entries.date < :after_date
+           OR (journal_entries.date = :after_date AND journal_entries.id < :after_id))
+    ORDER BY journal_entries.date DESC, journal_entries.id DESC
+    LIMIT :limit
+)
+SELECT
+    journal_entries.id,
+    journal_entries.date,
+    journal_entries.emotion,
+    {_SNIPPETS}
+FROM page
+JOIN journal_entries_fts ON journal_entries_fts.rowid = page.id
+JOIN journal_entries ON journal_entries.id = page.id
+WHERE journal_entries_fts MATCH :match
+ORDER BY page.date DESC, page.id DESC
+"""
+).columns(id=Integer(), date=Date(), emotion=String())
+
+
+def build_match_query(user_id: int, query: str) -> str:
+    """FTS5 MATCH expression for ``query`` within ``user_id``'s entries.
+
+    Words are quoted so FTS5 syntax in user input is taken literally, all
+    words must match, and the last one matches as a prefix so results
+    follow typing. Raises ValueError when ``query`` has no words.
+    """
+    terms = _WORD.findall(query)[:SEARCH_MAX_TERMS]
+    if not terms:
+        raise ValueError("Search query has no words")
+    phrases = [f'"{term}"' for term in terms]
+    phrases[-1] += "*"
+    columns = " ".join(SEARCH_TEXT_COLUMNS)
+    return f'owner:"u{user_id}" AND {{{columns}}}:({" AND ".join(phrases)})'
+
+
+def best_snippet(row: Any) -> Optional[str]:
+    """The first column snippet with a highlighted match."""
+    snippets: List[Optional[str]] = [getattr(row, name) for name in SEARCH_TEXT_COLUMNS]
+    for snippet in snippets:
+        if snippet and SNIPPET_OPEN in snippet:
+            return snippet
+    return next((snippet for snippet in snippets if snippet), None)
+
+
+def search_parameters(
+    user_id: int, query: str, after: Optional[Tuple[date, int]], limit: int
+) -> Dict[str, Any]:
+    """Bind parameters for SEARCH_QUERY: ``limit`` matches after the (date, id) cursor.
+
+    Raises ValueError when ``query`` has no words.
+    """
+    after_date, after_id = after if after is not None else (None, None)
+    return {
+        "match": build_match_query(user_id, query),
+        "user_id": user_id,
+        # Dates are stored as ISO text
+        "after_date": after_date.isoformat() if after_date else None,
+        "after_id": after_id,
+        "limit": limit,
+        "open": SNIPPET_OPEN,
+        "close": SNIPPET_CLOSE,
+        "tokens": SNIPPET_TOKENS,
+    }
+
+
+def rebuild_search_index(conn: Connection) -> int:
+    """Create the search index if missing and rebuild it from journal_entries.
+
+    For databases created before search existed, or after bulk changes made
+    with the triggers dropped. Returns the number of entries indexed.
+    """
+    for statement in JOURNAL_ENTRY_SEARCH_DDL:
+        conn.exec_driver_sql(statement)
+    # FTS5's own 'rebuild' cannot read a content view that calls json_each,
+    # so clear the index and insert every row the way the triggers do
+    conn.exec_driver_sql(
+        "INSERT INTO journal_entries_fts (journal_entries_fts) VALUES ('delete-all')"
+    )
+    conn.exec_driver_sql(JOURNAL_ENTRY_SEARCH_INDEX_ROWS)
+    count: int = conn.exec_driver_sql(
+        "SELECT COUNT(*) FROM journal_entries"
+    ).scalar_one()
+    return count
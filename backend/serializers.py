@@ -0,0 +1,88 @@
+"""Fast JSON rendering for journal entry list responses."""
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func
+
+from models import JournalEntry
+from schemas import JournalEntryResponse, PaginationMetadata
+
+# flake8: noqa: E501
+
+# Response field names, in order, and the columns that produce them. List
+# queries select these columns so each row is already a tuple of the values
+# JournalEntryResponse would hold, with no ORM instance or model in between.
+JOURNAL_ENTRY_FIELDS = tuple(JournalEntryResponse.model_fields)
+JOURNAL_ENTRY_COLUMNS = tuple(
+    getattr(JournalEntry, field) for field in JOURNAL_ENTRY_FIELDS
+)
+
+# Characters of custom_text sent as the list preview
+PREVIEW_LENGTH = 120
+
+# Everything a list request may project: the response fields plus a preview
+# cut from custom_text by the database, so the full text never leaves it
+JOURNAL_ENTRY_PROJECTIONS: Dict[str, Any] = {
+    **dict(zip(JOURNAL_ENTRY_FIELDS, JOURNAL_ENTRY_COLUMNS)),
+    "preview": func.substr(JournalEntry.custom_text, 1, PREVIEW_LENGTH).label(
+        "preview"
+    ),
+}
+
+# What the entry list view shows
+SUMMARY_FIELDS = ("id", "date", "emotion", "preview")
+
+
+def parse_fields(spec: str) -> Tuple[str, ...]:
+    """Parse a comma-separated ``fields=`` value.
+
+    id and date are always included, as list cursors are built from them.
+    Raises ValueError naming any unknown field.
+    """
+    requested = [name.strip() for name in spec.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in JOURNAL_ENTRY_PROJECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(("id", "date", *requested)))
+
+
+def projection_columns(fields: Sequence[str]) -> Tuple[Any, ...]:
+    """Columns to select for ``fields``, in the same order."""
+    return tuple(JOURNAL_ENTRY_PROJECTIONS[name] for name in fields)
+
+
+def journal_entry_rows_to_dicts(
+    rows: Iterable[Sequence[Any]], fields: Sequence[str] = JOURNAL_ENTRY_FIELDS
+) -> List[Dict[str, Any]]:
+    """Turn rows selected with ``projection_columns(fields)`` into response dicts.
+
+    Values come straight from the database, which only ever holds what
+    JournalEntryCreate accepted, so they are not validated again. orjson
+    encodes the date and datetime values the same way Pydantic does.
+    """
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def render_journal_entries_page(
+    rows: Iterable[Sequence[Any]],
+    pagination: PaginationMetadata,
+    fields: Sequence[str] = JOURNAL_ENTRY_FIELDS,
+) -> ORJSONResponse:
+    """Build a PaginatedJournalEntriesResponse body from row tuples."""
+    return ORJSONResponse(
+        {
+            "entries": journal_entry_rows_to_dicts(rows, fields),
+            "pagination": pagination.model_dump(),
+        }
+    )
+
+
+def journal_entries_ndjson(rows: Iterable[Sequence[Any]]) -> bytes:
+    """Encode rows selected with ``JOURNAL_ENTRY_COLUMNS`` as NDJSON lines."""
+    fields = JOURNAL_ENTRY_FIELDS
+    return b"".join(
+        orjson.dumps(dict(zip(fields, row)), option=orjson.OPT_APPEND_NEWLINE)
+        for row in rows
+    )
@@ -0,0 +1,132 @@
+"""Journaling streaks: runs of consecutive days with an entry.
+
+Users keep ``current_streak`` (the run ending at ``last_entry_date``) and
+``longest_streak``. Entries added after the last one only need the stored
+values; a backfill on or before it can join runs, so the runs it touches
+are re-read from the (user_id, date) index.
+"""
+
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import JournalEntry
+
+# flake8: noqa: E501
+
+# Days read per query while walking a run in the index
+STREAK_SCAN_DAYS = 366
+
+ONE_DAY = timedelta(days=1)
+
+
+def runs(dates: Iterable[date]) -> List[Tuple[date, date]]:
+    """(first, last) day of each run in ascending, distinct ``dates``."""
+    found: List[Tuple[date, date]] = []
+    for day in dates:
+        if found and found[-1][1] + ONE_DAY == day:
+            found[-1] = (found[-1][0], day)
+        else:
+            found.append((day, day))
+    return found
+
+
+def run_length(first: date, last: date) -> int:
+    """Days in the run from ``first`` to ``last``."""
+    return (last - first).days + 1
+
+
+def streak_lengths(dates: Iterable[date]) -> Tuple[int, int]:
+    """(current, longest) streak for ascending, distinct ``dates``.
+
+    ``current`` is the run ending at the last date, whatever day it is now.
+    """
+    lengths = [run_length(first, last) for first, last in runs(dates)]
+    if not lengths:
+        return 0, 0
+    return lengths[-1], max(lengths)
+
+
+def extend_streaks(
+    last_entry_date: Optional[date],
+    current_streak: int,
+    longest_streak: int,
+    new_dates: Sequence[date],
+) -> Optional[Tuple[int, int]]:
+    """(current, longest) after adding ``new_dates`` after the last entry.
+
+    Works from the stored values alone. Returns None when a new date is on
+    or before ``last_entry_date``; see rescan_streaks for that case.
+    """
+    new_dates = sorted(new_dates)
+    if last_entry_date is not None and new_dates[0] <= last_entry_date:
+        return None
+    new_runs = runs(new_dates)
+    lengths = [run_length(first, last) for first, last in new_runs]
+    if last_entry_date is not None and new_runs[0][0] == last_entry_date + ONE_DAY:
+        lengths[0] += current_streak
+    return lengths[-1], max(longest_streak, *lengths)
+
+
+def current_streak_on(
+    today: date, last_entry_date: Optional[date], current_streak: int
+) -> int:
+    """The streak as seen on ``today``: it survives until a day is skipped."""
+    if last_entry_date is None or last_entry_date < today - ONE_DAY:
+        return 0
+    return current_streak
+
+
+async def run_edge(db: AsyncSession, user_id: int, day: date, step: int) -> date:
+    """Walk from ``day`` (which has an entry) in ``step`` (-1 or 1) to the run's end.
+
+    Reads STREAK_SCAN_DAYS of the index per query, so the cost follows the
+    length of the run rather than of the journal.
+    """
+    edge = day
+    window = timedelta(days=STREAK_SCAN_DAYS)
+    while True:
+        query = select(JournalEntry.date).where(JournalEntry.user_id == user_id)
+        if step < 0:
+            query = query.where(
+                JournalEntry.date < edge, JournalEntry.date >= edge - window
+            ).order_by(JournalEntry.date.desc())
+        else:
+            query = query.where(
+                JournalEntry.date > edge, JournalEntry.date <= edge + window
+            ).order_by(JournalEntry.date)
+        dates = (await db.execute(query)).scalars().all()
+        for entry_date in dates:
+            if entry_date != edge + step * ONE_DAY:
+                return edge
+            edge = entry_date
+        if len(dates) < STREAK_SCAN_DAYS:
+            return edge
+
+
+async def rescan_streaks(
+    db: AsyncSession,
+    user_id: int,
+    last_entry_date: date,
+    longest_streak: int,
+    new_dates: Sequence[date],
+) -> Tuple[int, int]:
+    """(current, longest) after a backfill, re-reading only the runs it touched.
+
+    Call after the new entries are written, in the same transaction.
+    """
+    latest = max(last_entry_date, *new_dates)
+    current_first = await run_edge(db, user_id, latest, -1)
+    current = run_length(current_first, latest)
+    longest = max(longest_streak, current)
+    covered = [(current_first, latest)]
+    for day in sorted(new_dates):
+        if any(first <= day <= last for first, last in covered):
+            continue
+        first = await run_edge(db, user_id, day, -1)
+        last = await run_edge(db, user_id, day, 1)
+        covered.append((first, last))
+        longest = max(longest, run_length(first, last))
+    return current, longest
@@ -2,16 +2,27 @@
 
 import os
 import tempfile
-from typing import Any, Dict, Generator
+from datetime import date, datetime
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, Mapping
 from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session, sessionmaker
 
-from database import Base
-from main import app, get_db
+from cache import CACHES
+from database import Base, create_async_engines
+from main import app, get_db, get_read_db, get_read_session_factory
+from maintenance import (
+    recompute_emotion_counts,
+    recompute_entry_stats,
+    recompute_streaks,
+)
+from models import User
+from schemas import JournalEntryCreate
+from upserts import journal_entry_upsert, journal_entry_values, next_change_seq
 
 # flake8: noqa: E501
 
@@ -32,7 +43,9 @@ def temp_db() -> Generator[Any, None, None]:
 
     # Cleanup
     engine.dispose()
-    os.unlink(db_path)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.unlink(db_path + suffix)
 
 
 @pytest.fixture
@@ -89,14 +102,33 @@ def client(
     db_session: Session, mock_auth_dev_mode: Any
 ) -> Generator[TestClient, None, None]:
     """Create a test client with database override."""
+    # Handlers use AsyncSession; point the writer/reader pair at the same temp
+    # file so rows committed through db_session are visible to the API.
+    write_engine, read_engine = create_async_engines(
+        f"sqlite:///{db_session.get_bind().url.database}", pooled=False
+    )
+    write_sessions = async_sessionmaker(
+        bind=write_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    read_sessions = async_sessionmaker(
+        bind=read_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with write_sessions() as session:
+            yield session
 
-    def override_get_db() -> Generator[Session, None, None]:
-        try:
-            yield db_session
-        finally:
-            pass
+    async def override_get_read_db() -> AsyncGenerator[AsyncSession, None]:
+        async with read_sessions() as session:
+            yield session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_read_session_factory] = lambda: read_sessions
+
+    # In-process caches outlive a test's temporary database
+    for cache in CACHES.values():
+        cache.clear()
 
     with TestClient(app) as test_client:
         yield test_client
@@ -145,3 +177,60 @@ def sample_journal_entry_data() -> Dict[str, Any]:
         "custom_text": "Today was a wonderful day filled with positive experiences.",
         "visual_settings": {"theme": "sunny", "color": "#FFD700"},
     }
+
+
+@pytest.fixture
+def dev_user(db_session: Session) -> Any:
+    """Create the user that development-mode auth resolves every request to."""
+    user = User(
+        firebase_uid="dev-user-123",
+        email="developer@example.com",
+        name="Developer",
+        email_verified=True,
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def seed_entries(
+    db_session: Session, dev_user: User
+) -> Callable[[Mapping[date, Dict[str, Any]]], None]:
+    """Save entries for ``dev_user``, keyed by date, as one batch.
+
+    Values are JournalEntryCreate fields. Rows go through the shared upsert
+    with the next change_seq, and the user's stored statistics and rollups
+    are recomputed, so they agree with the seeded entries.
+    """
+
+    def seed(entries: Mapping[date, Dict[str, Any]]) -> None:
+        change_seq = db_session.execute(next_change_seq(dev_user.id)).scalar_one()
+        now = datetime.utcnow()
+        db_session.execute(
+            journal_entry_upsert(db_session.get_bind().dialect.name).values(
+                [
+                    journal_entry_values(
+                        dev_user.id,
+                        entry_date,
+                        JournalEntryCreate(**fields),
+                        now,
+                        change_seq,
+                    )
+                    for entry_date, fields in entries.items()
+                ]
+            )
+        )
+        conn = db_session.connection()
+        recompute_entry_stats(conn, dev_user.id)
+        recompute_emotion_counts(conn, dev_user.id)
+        recompute_streaks(conn, dev_user.id)
+        db_session.commit()
+
+    return seed
+
+
+@pytest.fixture
+def auth_headers() -> Dict[str, str]:
+    """Bearer header accepted by the development-mode auth bypass."""
+    return {"Authorization": "Bearer dev-token"}
@@ -2,14 +2,24 @@
 
 import asyncio
 import os
+import time
 from typing import Any, Dict
 from unittest.mock import Mock, patch
 
+import jwt
 import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
 from fastapi import HTTPException
 from fastapi.security import HTTPAuthorizationCredentials
 
-from auth import FirebaseAuth, get_current_user, get_current_user_dev
+from auth import (
+    FirebaseAuth,
+    FirebaseKeyStore,
+    get_current_user,
+    get_current_user_dev,
+    token_cache,
+    verify_id_token_locally,
+)
 
 # flake8: noqa: E501
 
@@ -206,3 +216,152 @@ class TestAuthenticationIntegration:
         mock_request = Mock()
         dev_result = asyncio.run(get_current_user_dev(mock_request))
         assert dev_result["uid"] == "dev-user"
+
+
+@pytest.fixture
+def signing_key() -> Any:
+    """Locally generated RSA key standing in for Google's signing key."""
+    token_cache.clear()
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def make_token(private_key: Any, kid: str = "kid-1", **overrides: Any) -> str:
+    """Mint a Firebase-shaped ID token signed with ``private_key``."""
+    now = int(time.time())
+    claims = {
+        "iss": "https://securetoken.google.com/test-project",
+        "aud": "test-project",
+        "sub": "local-uid",
+        "iat": now,
+        "exp": now + 3600,
+        "email": "local@example.com",
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+class TestLocalTokenVerification:
+    """Test offline verification against cached signing keys."""
+
+    def _auth(self, fetch: Mock) -> FirebaseAuth:
+        with patch.dict(os.environ, {"GOOGLE_APPLICATION_CREDENTIALS": "path"}):
+            return FirebaseAuth(
+                key_store=FirebaseKeyStore(fetch=fetch), project_id="test-project"
+            )
+
+    def _login(self, auth_instance: FirebaseAuth, token: str) -> Dict[str, Any]:
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        return asyncio.run(auth_instance.get_current_user(credentials))
+
+    def test_valid_token_is_verified_once(self, signing_key: Any) -> None:
+        """A good token verifies locally and repeat uses hit the token cache."""
+        fetch = Mock(return_value=({"kid-1": signing_key.public_key()}, 3600))
+        auth_instance = self._auth(fetch)
+        token = make_token(signing_key)
+
+        with patch(
+            "auth.verify_id_token_locally", wraps=verify_id_token_locally
+        ) as spy:
+            first = self._login(auth_instance, token)
+            second = self._login(auth_instance, token)
+
+        assert first["uid"] == second["uid"] == "local-uid"
+        assert first["email"] == "local@example.com"
+        assert spy.call_count == 1
+        assert fetch.call_count == 1
+        assert token_cache.stats()["hits"] == 1
+
+    @pytest.mark.parametrize(
+        "overrides, detail",
+        [
+            ({"exp": int(time.time()) - 10}, "Token has expired"),
+            ({"aud": "someone-else"}, "Invalid token"),
+            ({"iss": "https://evil.example.com"}, "Invalid token"),
+            ({"sub": ""}, "Invalid token"),
+        ],
+    )
+    def test_bad_claims_are_rejected(
+        self, signing_key: Any, overrides: Dict[str, Any], detail: str
+    ) -> None:
+        """Expiry, audience, issuer and subject are all enforced."""
+        fetch = Mock(return_value=({"kid-1": signing_key.public_key()}, 3600))
+        with pytest.raises(HTTPException) as exc_info:
+            self._login(self._auth(fetch), make_token(signing_key, **overrides))
+
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.detail == detail
+
+    def test_foreign_signature_is_rejected(self, signing_key: Any) -> None:
+        """A token signed by another key fails even with a known kid."""
+        forger = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        fetch = Mock(return_value=({"kid-1": signing_key.public_key()}, 3600))
+
+        with pytest.raises(HTTPException) as exc_info:
+            self._login(self._auth(fetch), make_token(forger))
+
+        assert exc_info.value.status_code == 401
+        assert token_cache.stats()["size"] == 0
+
+    def test_rotated_key_triggers_refresh(self, signing_key: Any) -> None:
+        """An unseen kid refreshes the key set once before failing."""
+        rotated = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        fetch = Mock(
+            side_effect=[
+                ({"kid-1": signing_key.public_key()}, 3600),
+                ({"kid-2": rotated.public_key()}, 3600),
+            ]
+        )
+        auth_instance = self._auth(fetch)
+        self._login(auth_instance, make_token(signing_key))
+        auth_instance.key_store.RETRY_INTERVAL = 0  # allow immediate refresh
+
+        result = self._login(auth_instance, make_token(rotated, kid="kid-2"))
+
+        assert result["uid"] == "local-uid"
+        assert fetch.call_count == 2
+
+    def test_concurrent_unknown_kids_share_one_refresh(self, signing_key: Any) -> None:
+        """Many requests with a forged kid cause a single certificate fetch."""
+        fetch = Mock(return_value=({"kid-1": signing_key.public_key()}, 3600))
+        key_store = FirebaseKeyStore(fetch=fetch)
+
+        async def forged_requests() -> list[Any]:
+            await key_store.refresh()
+            fetch.reset_mock()
+            key_store.RETRY_INTERVAL = 0  # the kid is unknown to every caller
+            return await asyncio.gather(
+                *(key_store.get_key("forged") for _ in range(20))
+            )
+
+        assert asyncio.run(forged_requests()) == [None] * 20
+        assert fetch.call_count == 1
+
+    def test_cold_start_shares_one_refresh(self, signing_key: Any) -> None:
+        """Requests arriving before any keys are loaded wait on one fetch."""
+        public_key = signing_key.public_key()
+        fetch = Mock(return_value=({"kid-1": public_key}, 3600))
+        key_store = FirebaseKeyStore(fetch=fetch)
+
+        async def first_requests() -> list[Any]:
+            return await asyncio.gather(
+                *(key_store.get_key("kid-1") for _ in range(20))
+            )
+
+        assert asyncio.run(first_requests()) == [public_key] * 20
+        assert fetch.call_count == 1
+
+    def test_concurrent_callers_share_a_failed_refresh(self) -> None:
+        """A failing fetch is tried once and its error reaches every caller."""
+        fetch = Mock(side_effect=OSError("unreachable"))
+        key_store = FirebaseKeyStore(fetch=fetch)
+
+        async def first_requests() -> list[Any]:
+            return await asyncio.gather(
+                *(key_store.get_key("kid-1") for _ in range(5)),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(first_requests())
+
+        assert all(isinstance(result, OSError) for result in results)
+        assert fetch.call_count == 1
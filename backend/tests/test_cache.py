@@ -0,0 +1,53 @@
+"""Tests for the in-process TTL/LRU cache."""
+
+from typing import Any
+
+from cache import CACHES, TTLCache
+
+# flake8: noqa: E501
+
+
+class TestTTLCache:
+    """Test expiry, eviction and counters."""
+
+    def test_hit_and_miss_counters(self) -> None:
+        """Lookups are counted as hits or misses."""
+        cache: TTLCache[int] = TTLCache("test-counters", maxsize=4, ttl=60)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+        assert CACHES["test-counters"] is cache
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        """Reading a key protects it from eviction."""
+        cache: TTLCache[int] = TTLCache("test-lru", maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire(self, monkeypatch: Any) -> None:
+        """Entries vanish once their TTL has passed."""
+        now = [1000.0]
+        monkeypatch.setattr("cache.time.monotonic", lambda: now[0])
+        cache: TTLCache[int] = TTLCache("test-ttl", maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=100)
+
+        now[0] += 11
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+    def test_invalidate(self) -> None:
+        """Invalidated keys are gone immediately."""
+        cache: TTLCache[int] = TTLCache("test-invalidate", maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.invalidate("a")
+        assert cache.get("a") is None
@@ -0,0 +1,90 @@
+"""Tests for calendar summary encoding."""
+
+from base64 import b64decode
+from datetime import date
+
+import pytest
+
+from calendars import (
+    EMOTION_CODES,
+    EMOTION_NAMES,
+    day_code,
+    encode_month,
+    encode_year,
+    format_month,
+    month_bounds,
+    parse_month,
+)
+
+# flake8: noqa: E501
+
+
+class TestMonths:
+    """Test month parsing and bounds."""
+
+    def test_parse_month(self) -> None:
+        """YYYY-MM parses to the first of the month."""
+        assert parse_month("2024-02") == date(2024, 2, 1)
+
+    @pytest.mark.parametrize(
+        "value", ["2024-2-1", "2024-13", "24-02", "February", "9999-01", "9999-12"]
+    )
+    def test_parse_month_rejects_other_formats(self, value: str) -> None:
+        """Anything else raises ValueError."""
+        with pytest.raises(ValueError):
+            parse_month(value)
+
+    def test_format_month_pads_the_year(self) -> None:
+        """Years below 1000 keep four digits."""
+        assert format_month(date(999, 5, 17)) == "0999-05"
+        assert format_month(date(2024, 12, 1)) == "2024-12"
+
+    def test_bounds_roll_over_the_year(self) -> None:
+        """December ends at the next January."""
+        assert month_bounds(date(2024, 12, 1)) == (date(2024, 12, 1), date(2025, 1, 1))
+
+
+class TestEncoding:
+    """Test per-day codes."""
+
+    def test_codes_follow_emotion_names(self) -> None:
+        """A code indexes EMOTION_NAMES plus one."""
+        for name, code in EMOTION_CODES.items():
+            assert EMOTION_NAMES[code - 1] == name
+
+    def test_day_code(self) -> None:
+        """Bit 0 is presence; the rest is the emotion code."""
+        assert day_code(None) == 1
+        assert day_code("joy") >> 1 == EMOTION_CODES["joy"]
+        assert day_code("joy") & 1 == 1
+
+    def test_encode_month(self) -> None:
+        """Days without rows stay 0 and the length matches the month."""
+        days = encode_month(
+            date(2023, 2, 1), [(date(2023, 2, 28), "joy"), (date(2023, 2, 3), None)]
+        )
+        assert len(days) == 28
+        assert days[2] == 1
+        assert days[27] == day_code("joy")
+        assert days.count(0) == 26
+
+
+class TestYearEncoding:
+    """Test packed heatmap years."""
+
+    def test_sizes_follow_the_year(self) -> None:
+        """Leap years have one more day of bits and codes."""
+        days, codes = encode_year(2023, [])
+        assert (len(b64decode(days)), len(b64decode(codes))) == (46, 183)
+        days, codes = encode_year(2024, [])
+        assert (len(b64decode(days)), len(b64decode(codes))) == (46, 183)
+        assert not any(b64decode(days))
+
+    def test_bits_and_nibbles(self) -> None:
+        """Day i sets bit i % 8 of byte i // 8 and a nibble of byte i // 2."""
+        days, codes = encode_year(
+            2023, [(date(2023, 1, 2), "joy"), (date(2023, 1, 10), None)]
+        )
+        assert b64decode(days)[:2] == bytes([0b10, 0b10])
+        assert b64decode(codes)[0] == EMOTION_CODES["joy"] << 4
+        assert b64decode(codes)[4] == 0
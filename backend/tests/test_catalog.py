@@ -0,0 +1,145 @@
+"""Tests for the in-memory prompt catalog."""
+
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from catalog import daily_gratitude_questions, get_catalog, load_catalog
+from models import EmotionQuestion, GratitudeQuestion, Quote
+
+# flake8: noqa: E501
+
+
+@pytest.fixture
+def seeded_session(db_session: Session) -> Session:
+    """A database holding a handful of prompts."""
+    db_session.add_all(
+        [GratitudeQuestion(question=f"Gratitude {n}?") for n in range(6)]
+        + [
+            EmotionQuestion(emotion="joy", question="What sparked it?"),
+            EmotionQuestion(emotion="joy", question="Who shared it?"),
+            EmotionQuestion(emotion="anger", question="What crossed a line?"),
+            Quote(emotion="joy", quote="Joy is contagious.", author="Someone"),
+        ]
+    )
+    db_session.commit()
+    return db_session
+
+
+class TestPromptCatalog:
+    """Test catalog loading and lookups."""
+
+    def test_groups_rows_by_emotion(self, seeded_session: Session) -> None:
+        """Questions and quotes are grouped into per-emotion tuples."""
+        catalog = load_catalog(seeded_session)
+
+        assert len(catalog.gratitude_questions) == 6
+        assert [q for _, q in catalog.emotion_questions["joy"]] == [
+            "What sparked it?",
+            "Who shared it?",
+        ]
+        assert catalog.quotes["joy"] == (("Joy is contagious.", "Someone"),)
+        assert get_catalog() is catalog
+
+    def test_catalog_is_read_only(self, seeded_session: Session) -> None:
+        """Requests cannot mutate the shared snapshot."""
+        catalog = load_catalog(seeded_session)
+        with pytest.raises(TypeError):
+            catalog.quotes["joy"] = ()  # type: ignore[index]
+
+    def test_reload_picks_up_new_rows(self, seeded_session: Session) -> None:
+        """Calling load_catalog again swaps in the current table contents."""
+        load_catalog(seeded_session)
+        seeded_session.add(Quote(emotion="anger", quote="Breathe.", author="Anon"))
+        seeded_session.commit()
+
+        assert "anger" in load_catalog(seeded_session).quotes
+
+    def test_endpoints_serve_from_catalog(
+        self, client: TestClient, seeded_session: Session
+    ) -> None:
+        """Prompt endpoints answer from the loaded snapshot."""
+        load_catalog(seeded_session)
+
+        assert client.get("/quote/joy").json() == {
+            "quote": "Joy is contagious.",
+            "author": "Someone",
+        }
+        assert len(client.get("/gratitude-questions").json()) == 5
+        assert len(client.get("/emotion-questions/anger").json()) == 1
+
+
+class TestDailyGratitudeQuestions:
+    """Test the per-user daily question pick."""
+
+    def test_same_user_and_day_is_stable(self, seeded_session: Session) -> None:
+        """Repeated calls return the same questions, even after a cache clear."""
+        load_catalog(seeded_session)
+        first = daily_gratitude_questions("user-a", date(2024, 5, 1))
+        load_catalog(seeded_session)  # clears the pick cache
+
+        assert len(first) == 5
+        assert daily_gratitude_questions("user-a", date(2024, 5, 1)) == first
+
+    def test_pick_varies_by_user_and_day(self, seeded_session: Session) -> None:
+        """Different users and days do not all get the same pick."""
+        load_catalog(seeded_session)
+        picks = {
+            daily_gratitude_questions(user, date(2024, 5, day))
+            for user in ("user-a", "user-b", "user-c")
+            for day in range(1, 8)
+        }
+        assert len(picks) > 1
+
+    def test_small_catalog_returns_everything(self, db_session: Session) -> None:
+        """With fewer than five questions all of them are returned."""
+        db_session.add_all([GratitudeQuestion(question=f"Q{n}?") for n in range(3)])
+        db_session.commit()
+        load_catalog(db_session)
+
+        assert len(daily_gratitude_questions("user-a", date(2024, 5, 1))) == 3
+
+
+class TestGratitudeQuestionsEndpoint:
+    """Test HTTP caching of the daily gratitude questions."""
+
+    def test_cache_headers(self, client: TestClient, seeded_session: Session) -> None:
+        """The response is private and expires within a day."""
+        load_catalog(seeded_session)
+        response = client.get("/gratitude-questions", params={"tz": "Europe/Brussels"})
+
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        cache_control = response.headers["cache-control"]
+        assert cache_control.startswith("private, max-age=")
+        assert 0 < int(cache_control.split("=")[1]) <= 25 * 60 * 60
+
+    def test_stable_within_the_day(
+        self, client: TestClient, seeded_session: Session
+    ) -> None:
+        """Reloads return the same questions and ETag."""
+        load_catalog(seeded_session)
+        first = client.get("/gratitude-questions")
+        second = client.get("/gratitude-questions")
+
+        assert first.json() == second.json()
+        assert first.headers["etag"] == second.headers["etag"]
+
+    def test_if_none_match_returns_304(
+        self, client: TestClient, seeded_session: Session
+    ) -> None:
+        """A matching If-None-Match gets an empty 304."""
+        load_catalog(seeded_session)
+        etag = client.get("/gratitude-questions").headers["etag"]
+        response = client.get("/gratitude-questions", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_unknown_time_zone(self, client: TestClient) -> None:
+        """An unknown tz is rejected."""
+        response = client.get("/gratitude-questions", params={"tz": "Mars/Olympus"})
+        assert response.status_code == 400
@@ -0,0 +1,186 @@
+"""Tests for the response compression middleware."""
+
+import gzip
+from datetime import date
+from typing import AsyncIterator, Dict, Tuple
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from compression import CompressionMiddleware, CompressionStats, choose_encoding
+from models import JournalEntry, User
+
+# flake8: noqa: E501
+
+BODY = b'{"custom_text": "' + b"a long day " * 500 + b'"}'
+
+
+@pytest.fixture
+def stats() -> CompressionStats:
+    """Counters private to one test."""
+    return CompressionStats()
+
+
+@pytest.fixture
+def compressed_client(stats: CompressionStats) -> TestClient:
+    """A small app behind the middleware."""
+    app = FastAPI()
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=100,
+        exclude_paths=("/catalog",),
+        stats=stats,
+    )
+
+    @app.get("/big")
+    async def big() -> Response:
+        return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    async def small() -> Response:
+        return Response(b"{}", media_type="application/json")
+
+    @app.get("/catalog/big")
+    async def catalog() -> Response:
+        return Response(BODY, media_type="application/json")
+
+    @app.get("/binary")
+    async def binary() -> Response:
+        return Response(BODY, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks() -> AsyncIterator[bytes]:
+            for _ in range(3):
+                yield BODY
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    @app.get("/text")
+    async def text() -> PlainTextResponse:
+        return PlainTextResponse(BODY.decode())
+
+    return TestClient(app)
+
+
+def get(
+    client: TestClient, path: str, encoding: str = "gzip"
+) -> Tuple[httpx.Headers, bytes]:
+    """GET without httpx decoding the body, so raw bytes can be checked."""
+    with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+        return response.headers, b"".join(response.iter_raw())
+
+
+class TestChooseEncoding:
+    """Test Accept-Encoding negotiation."""
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("gzip, deflate", "gzip"),
+            ("deflate", None),
+            ("", None),
+            ("gzip;q=0", None),
+            ("*", "gzip"),
+            ("identity, gzip;q=0.5", "gzip"),
+        ],
+    )
+    def test_negotiation(self, header: str, expected: str) -> None:
+        """Only codings the client accepts with q > 0 are chosen."""
+        assert choose_encoding(header) == expected
+
+
+class TestCompressionMiddleware:
+    """Test which responses are compressed and how."""
+
+    def test_large_json_is_gzipped(
+        self, compressed_client: TestClient, stats: CompressionStats
+    ) -> None:
+        """Bodies above the minimum are compressed and counted."""
+        headers, raw = get(compressed_client, "/big")
+        assert headers["content-encoding"] == "gzip"
+        assert headers["vary"] == "Accept-Encoding"
+        assert int(headers["content-length"]) == len(raw)
+        assert gzip.decompress(raw) == BODY
+
+        counters = stats.stats()["encodings"]["gzip"]
+        assert counters["responses"] == 1
+        assert counters["bytes_in"] == len(BODY)
+        assert counters["bytes_saved"] > 0
+        assert counters["cpu_seconds"] >= 0
+
+    def test_strong_etag_is_weakened(self, compressed_client: TestClient) -> None:
+        """The compressed bytes are a different representation."""
+        headers, raw = get(compressed_client, "/big")
+        assert headers["etag"] == 'W/"v1"'
+
+    @pytest.mark.parametrize("path", ["/small", "/catalog/big", "/binary"])
+    def test_passthrough(self, compressed_client: TestClient, path: str) -> None:
+        """Small, excluded and non-text responses are left alone."""
+        headers, raw = get(compressed_client, path)
+        assert "content-encoding" not in headers
+
+    def test_small_responses_are_counted(
+        self, compressed_client: TestClient, stats: CompressionStats
+    ) -> None:
+        """Skips below the minimum size show up in the metrics."""
+        get(compressed_client, "/small")
+        assert stats.stats()["skipped_below_min_size"] == 1
+
+    def test_no_accept_encoding(self, compressed_client: TestClient) -> None:
+        """Clients that do not ask for compression get identity."""
+        headers, raw = get(compressed_client, "/big", encoding="identity")
+        assert "content-encoding" not in headers
+        assert raw == BODY
+
+    def test_streaming_response(self, compressed_client: TestClient) -> None:
+        """Streamed bodies are compressed chunk by chunk."""
+        headers, raw = get(compressed_client, "/stream")
+        assert headers["content-encoding"] == "gzip"
+        assert "content-length" not in headers
+        assert gzip.decompress(raw) == BODY * 3
+
+    def test_text_types(self, compressed_client: TestClient) -> None:
+        """text/* responses are compressible."""
+        headers, raw = get(compressed_client, "/text")
+        assert headers["content-encoding"] == "gzip"
+
+
+class TestAppCompression:
+    """Test the middleware as installed on the application."""
+
+    def test_journal_list_is_compressed(
+        self,
+        client: TestClient,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        db_session: Session,
+    ) -> None:
+        """A page of long entries goes out gzipped and decodes transparently."""
+        for day in range(1, 11):
+            db_session.add(
+                JournalEntry(
+                    user_id=dev_user.id,
+                    date=date(2024, 1, day),
+                    gratitude_answers=[],
+                    emotion_answers=[],
+                    custom_text="today I wrote a lot " * 50,
+                )
+            )
+        db_session.commit()
+
+        response = client.get(
+            "/journal-entries", headers={**auth_headers, "Accept-Encoding": "gzip"}
+        )
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()["entries"]) == 10
+
+    def test_metrics_endpoint(self, client: TestClient) -> None:
+        """Counters are exported next to the cache metrics."""
+        body = client.get("/metrics/compression").json()
+        assert "gzip" in body["available"]
+        assert "encodings" in body
@@ -0,0 +1,123 @@
+"""Tests for database engine configuration."""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from database import (
+    DB_READ_POOL_SIZE,
+    SQLITE_PRAGMAS,
+    create_async_engines,
+    describe_database,
+    install_sqlite_pragmas,
+    to_async_url,
+)
+
+# flake8: noqa: E501
+
+
+class TestAsyncUrl:
+    """Test mapping of configured URLs onto asyncio drivers."""
+
+    def test_sqlite_uses_aiosqlite(self) -> None:
+        """SQLite URLs are routed through aiosqlite."""
+        assert (
+            to_async_url("sqlite:///./carolinas_diary.db")
+            == "sqlite+aiosqlite:///./carolinas_diary.db"
+        )
+
+    def test_postgres_uses_asyncpg(self) -> None:
+        """Both PostgreSQL URL spellings are routed through asyncpg."""
+        assert (
+            to_async_url("postgresql://u:p@db/diary")
+            == "postgresql+asyncpg://u:p@db/diary"
+        )
+        assert (
+            to_async_url("postgres://u:p@db/diary")
+            == "postgresql+asyncpg://u:p@db/diary"
+        )
+
+    def test_explicit_driver_is_kept(self) -> None:
+        """URLs that already name a driver are left alone."""
+        url = "postgresql+psycopg://u:p@db/diary"
+        assert to_async_url(url) == url
+
+
+class TestSqlitePragmas:
+    """Test the per-connection SQLite tuning layer."""
+
+    def test_pragmas_applied_on_connect(self, tmp_path: Path) -> None:
+        """Every new connection runs with WAL and the configured pragmas."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+        install_sqlite_pragmas(engine, SQLITE_PRAGMAS)
+
+        report = describe_database(engine)
+        engine.dispose()
+
+        assert report["pragmas"]["journal_mode"] == "wal"
+        assert report["pragmas"]["synchronous"] == 1  # NORMAL
+        assert report["pragmas"]["busy_timeout"] == 5000
+        assert report["pragmas"]["temp_store"] == 2  # MEMORY
+
+    def test_rejects_unsafe_pragma_value(self) -> None:
+        """Environment-supplied pragma values cannot inject SQL."""
+        engine = create_engine("sqlite:///:memory:")
+        with pytest.raises(ValueError):
+            install_sqlite_pragmas(engine, {"cache_size": "1; DROP TABLE users"})
+
+
+class TestReadWriteRouting:
+    """Test the writer/reader async engine pair."""
+
+    def test_reader_is_query_only(self, tmp_path: Path) -> None:
+        """The reader pool can select but refuses writes."""
+        url = f"sqlite:///{tmp_path / 'routed.db'}"
+        writer, reader = create_async_engines(url, pooled=False)
+
+        async def exercise() -> Any:
+            async with writer.begin() as conn:
+                await conn.execute(text("CREATE TABLE notes (body TEXT)"))
+                await conn.execute(text("INSERT INTO notes VALUES ('hi')"))
+            async with reader.connect() as conn:
+                rows = (await conn.execute(text("SELECT body FROM notes"))).all()
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("INSERT INTO notes VALUES ('no')"))
+            return rows
+
+        assert asyncio.run(exercise()) == [("hi",)]
+
+    def test_writer_transactions_lock_other_writers_out(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A write transaction holds SQLite's lock from its first read."""
+        monkeypatch.setitem(SQLITE_PRAGMAS, "busy_timeout", "0")
+        url = f"sqlite:///{tmp_path / 'workers.db'}"
+        # Two workers, each with its own engines
+        first, _ = create_async_engines(url, pooled=False)
+        second, _ = create_async_engines(url, pooled=False)
+
+        async def exercise() -> None:
+            async with first.begin() as conn:
+                await conn.execute(text("CREATE TABLE notes (body TEXT)"))
+            async with first.begin() as conn:
+                await conn.execute(text("SELECT body FROM notes"))
+                async with second.connect() as other:
+                    with pytest.raises(OperationalError, match="locked"):
+                        await other.execute(text("SELECT body FROM notes"))
+
+        asyncio.run(exercise())
+
+    def test_sqlite_writer_is_single_connection(self, tmp_path: Path) -> None:
+        """SQLite writes are serialized through a one-connection pool."""
+        writer, reader = create_async_engines(f"sqlite:///{tmp_path / 'w.db'}")
+        assert writer.pool.size() == 1
+        assert reader.pool.size() == DB_READ_POOL_SIZE
+
+    def test_memory_database_shares_engine(self) -> None:
+        """An in-memory database cannot be split across two engines."""
+        writer, reader = create_async_engines("sqlite:///:memory:")
+        assert writer is reader
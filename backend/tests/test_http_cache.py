@@ -0,0 +1,47 @@
+"""Tests for the HTTP caching helpers."""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from http_cache import etag_matches, make_etag, seconds_until_midnight
+
+# flake8: noqa: E501
+
+
+class TestEtags:
+    """Test ETag construction and If-None-Match matching."""
+
+    def test_etag_is_quoted_and_deterministic(self) -> None:
+        """The same parts give the same strong ETag."""
+        etag = make_etag("user", 1, "question")
+        assert etag == make_etag("user", 1, "question")
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag != make_etag("user", 2, "question")
+
+    def test_if_none_match_forms(self) -> None:
+        """Lists, weak validators and * all match."""
+        etag = make_etag("x")
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestSecondsUntilMidnight:
+    """Test expiry computation."""
+
+    def test_local_midnight(self) -> None:
+        """Counts down to midnight in the given zone."""
+        now = datetime(2024, 6, 1, 23, 0, tzinfo=ZoneInfo("Europe/Brussels"))
+        assert seconds_until_midnight(now) == 3600
+
+    def test_dst_change(self) -> None:
+        """The day clocks go forward is an hour shorter."""
+        now = datetime(2024, 3, 31, 0, 0, tzinfo=ZoneInfo("Europe/Brussels"))
+        assert seconds_until_midnight(now) == 23 * 3600
+
+    def test_never_zero(self) -> None:
+        """A response just before midnight is still cacheable briefly."""
+        now = datetime(2024, 6, 1, 23, 59, 59, 999999, tzinfo=ZoneInfo("UTC"))
+        assert seconds_until_midnight(now) == 1
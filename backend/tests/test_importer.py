@@ -0,0 +1,165 @@
+"""Tests for bulk journal import."""
+
+import io
+import json
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session
+
+import importer
+from importer import ImportBatcher, ImportReport, JSONObjectStream, import_file
+from models import JournalEntry, User
+
+# flake8: noqa: E501
+
+RECORDS = [
+    {"date": "2024-01-01", "gratitude_answers": ["tea"], "emotion": "joy"},
+    {"date": "2024-01-02", "custom_text": "Ünïcode ✨", "id": 9, "userId": "old"},
+    {"date": "2024-01-03", "emotion_answers": ["why"]},
+]
+
+
+def parse_in_chunks(data: bytes, size: int) -> list:
+    """Feed ``data`` to a fresh parser ``size`` bytes at a time."""
+    parser = JSONObjectStream()
+    records = []
+    for start in range(0, len(data), size):
+        records.extend(parser.feed(data[start : start + size]))
+    return records + parser.close()
+
+
+class TestJSONObjectStream:
+    """Test incremental parsing of NDJSON and JSON arrays."""
+
+    @pytest.mark.parametrize("size", [1, 7, 4096])
+    def test_ndjson_any_chunking(self, size: int) -> None:
+        """Records split across chunks, even mid-character, parse intact."""
+        data = "\n".join(json.dumps(r, ensure_ascii=False) for r in RECORDS).encode()
+        assert parse_in_chunks(data, size) == RECORDS
+
+    @pytest.mark.parametrize("size", [3, 4096])
+    def test_json_array(self, size: int) -> None:
+        """A pretty-printed JSON array yields its elements."""
+        data = json.dumps(RECORDS, indent=2).encode()
+        assert parse_in_chunks(data, size) == RECORDS
+
+    def test_truncated_input(self) -> None:
+        """A record cut off at the end of input is an error."""
+        with pytest.raises(ValueError):
+            parse_in_chunks(b'{"date": "2024-01-01"}\n{"date": "2024', 4096)
+
+    def test_malformed_record(self) -> None:
+        """Broken JSON is an error."""
+        with pytest.raises(ValueError):
+            parse_in_chunks(b'{"date": 2024-01-01}', 4096)
+
+    def test_arrays_inside_records_stay_whole(self) -> None:
+        """Only one outer array is unpacked; a nested one is a single record."""
+        assert parse_in_chunks(b"[]", 4096) == []
+        assert parse_in_chunks(b"[[1, 2], {}]", 4096) == [[1, 2], {}]
+        assert parse_in_chunks(b"{}\n[1, 2]\n", 1) == [{}, [1, 2]]
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"[{}]]]{}",
+            b"[{}] {}",
+            b"[{} {}]",
+            b"[{},]",
+            b"[,{}]",
+            b"[{}, {}",
+            b"{},{}",
+            b"{}]",
+        ],
+    )
+    def test_stray_brackets_and_commas(self, data: bytes) -> None:
+        """Separators outside a single well-formed array are errors."""
+        for size in (1, 4096):
+            with pytest.raises(ValueError):
+                parse_in_chunks(data, size)
+
+
+class TestImportBatcher:
+    """Test validation and batching."""
+
+    def test_rejects_invalid_records(self) -> None:
+        """Bad records are counted and described, good ones kept."""
+        report = ImportReport()
+        batcher = ImportBatcher(user_id=1, report=report, batch_size=10)
+        for record in (
+            {"date": "not-a-date"},
+            {"date": "2024-01-01", "emotion": "ennui"},
+            "just a string",
+            {"date": "2999-01-01"},
+            {"date": "2024-01-02"},
+        ):
+            assert batcher.add(record) is None
+
+        assert report.received == 5
+        assert report.rejected == 4
+        assert [e["record"] for e in report.errors] == [1, 2, 3, 4]
+        assert report.errors[0]["error"].startswith("date:")
+        assert len(batcher.flush()) == 1
+
+    def test_later_records_for_a_date_supersede_earlier_ones(self) -> None:
+        """A batch holds one row per date and counts what it replaced."""
+        report = ImportReport()
+        batcher = ImportBatcher(user_id=1, report=report, batch_size=10)
+        for text in ("first", "second"):
+            batcher.add({"date": "2024-01-01", "custom_text": text})
+        batcher.add({"date": "2024-01-02"})
+
+        rows = batcher.flush()
+
+        assert [row["custom_text"] for row in rows] == ["second", None]
+        assert report.superseded == 1
+
+    def test_full_batches_are_returned(self) -> None:
+        """add() hands back a batch every batch_size accepted records."""
+        batcher = ImportBatcher(user_id=1, report=ImportReport(), batch_size=2)
+        results = [batcher.add(r) for r in RECORDS]
+        assert results[0] is None
+        assert results[1] is not None and len(results[1]) == 2
+        assert results[2] is None
+
+
+class TestImportFile:
+    """Test importing into the database."""
+
+    def test_imports_and_updates_statistics(
+        self,
+        db_session: Session,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Entries are upserted in batches and the user's counters follow."""
+        monkeypatch.setattr(importer, "IMPORT_BATCH_SIZE", 2)
+        user = User(firebase_uid="importer", email="importer@example.com")
+        db_session.add(user)
+        db_session.add(
+            JournalEntry(
+                user_id=1,
+                date=date(2024, 1, 1),
+                custom_text="paper",
+                gratitude_answers=[],
+                emotion_answers=[],
+            )
+        )
+        db_session.commit()
+
+        data = "\n".join(json.dumps(r) for r in RECORDS).encode()
+        with db_session.get_bind().connect() as conn:
+            report = import_file(conn, user.id, io.BytesIO(data))
+
+        assert report.imported == 3
+        assert "2 imported" in capsys.readouterr().out
+        db_session.expire_all()
+        assert user.entry_count == 3
+        assert user.first_entry_date == date(2024, 1, 1)
+        assert user.last_entry_date == date(2024, 1, 3)
+        overwritten = (
+            db_session.query(JournalEntry).filter_by(date=date(2024, 1, 1)).one()
+        )
+        assert overwritten.custom_text is None
+        assert overwritten.gratitude_answers == ["tea"]
@@ -1,16 +1,52 @@
 """Tests for main FastAPI application endpoints."""
 
-from typing import Any, Dict
+import base64
+import gzip
+import json
+import random
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncGenerator, Callable, Dict, Iterable
 from unittest.mock import patch
 
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import Engine, event, select
 from sqlalchemy.orm import Session
 
-from models import User
+import main
+from importer import write_batch
+from main import (
+    BY_DATES_MAX,
+    app,
+    emotion_stats_query,
+    get_db,
+    heatmap_query,
+    journal_entries_by_dates_query,
+    journal_entries_count_query,
+    journal_entries_list_query,
+    journal_entry_changes_query,
+    month_calendar_query,
+)
+from maintenance import recompute_emotion_counts
+from models import EmotionMonthCount, JournalEntry, User
+from serializers import (
+    JOURNAL_ENTRY_FIELDS,
+    PREVIEW_LENGTH,
+    SUMMARY_FIELDS,
+    projection_columns,
+)
+from streaks import streak_lengths
 
 # flake8: noqa: E501
 
 
+def consecutive_days(
+    entries: Iterable[Dict[str, Any]], start: date = date(2024, 1, 1)
+) -> Dict[date, Dict[str, Any]]:
+    """Key ``entries`` by consecutive dates from ``start``, for seed_entries."""
+    return {start + timedelta(days=n): fields for n, fields in enumerate(entries)}
+
+
 class TestHealthEndpoint:
     """Test the root health endpoint."""
 
@@ -307,3 +343,1752 @@ class TestErrorHandling:
         # Should return fallback quote
         assert "quote" in data
         assert "author" in data
+
+
+class TestAsyncJournalFlow:
+    """Test journal endpoints end to end through the async session dependency."""
+
+    def test_create_then_read_entry(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """An entry saved through POST is returned by the read endpoints."""
+        payload = {"gratitude_answers": ["coffee"], "emotion": "joy"}
+        created = client.post("/journal-entry", json=payload, headers=auth_headers)
+        assert created.status_code == 200
+        entry_date = created.json()["date"]
+
+        single = client.get(f"/journal-entry/{entry_date}", headers=auth_headers)
+        assert single.status_code == 200
+        assert single.json()["gratitude_answers"] == ["coffee"]
+
+        listing = client.get("/journal-entries", headers=auth_headers)
+        assert listing.status_code == 200
+        assert listing.json()["pagination"]["total_items"] == 1
+
+    def test_second_save_updates_same_day(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Saving twice on one day updates the existing entry."""
+        first = client.post(
+            "/journal-entry", json={"custom_text": "draft"}, headers=auth_headers
+        )
+        second = client.post(
+            "/journal-entry", json={"custom_text": "final"}, headers=auth_headers
+        )
+        assert first.json()["id"] == second.json()["id"]
+        assert second.json()["custom_text"] == "final"
+
+    def test_save_keeps_single_row_per_day(
+        self,
+        client: TestClient,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        db_session: Session,
+    ) -> None:
+        """Repeated saves upsert the same (user_id, date) row in place."""
+        first = client.post(
+            "/journal-entry",
+            json={"emotion": "joy", "custom_text": "one"},
+            headers=auth_headers,
+        ).json()
+        second = client.post(
+            "/journal-entry",
+            json={"emotion": "anger", "custom_text": "two"},
+            headers=auth_headers,
+        ).json()
+
+        assert db_session.query(JournalEntry).count() == 1
+        assert second["emotion"] == "anger"
+        assert second["created_at"] == first["created_at"]
+        assert second["updated_at"] != first["updated_at"]
+
+    def test_entry_counter_tracks_new_days_only(
+        self,
+        client: TestClient,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        db_session: Session,
+    ) -> None:
+        """Only the first save of a day bumps the maintained counters."""
+        client.post("/journal-entry", json={}, headers=auth_headers)
+        client.post("/journal-entry", json={"custom_text": "x"}, headers=auth_headers)
+
+        db_session.refresh(dev_user)
+        assert dev_user.entry_count == 1
+        assert dev_user.first_entry_date == dev_user.last_entry_date == date.today()
+
+    def test_user_endpoints(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """The user endpoints read and update through the async session."""
+        response = client.put(
+            "/users/me", json={"name": "Carolina"}, headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert client.get("/users/me").json()["name"] == "Carolina"
+
+
+class TestListSerialization:
+    """Test the row-tuple fast path behind /journal-entries."""
+
+    def test_list_entry_matches_single_entry(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """An entry is encoded identically by the list and detail endpoints."""
+        payload = {
+            "gratitude_answers": ["coffee"],
+            "emotion": "joy",
+            "custom_text": "A long day",
+            "visual_settings": {"theme": "sunny"},
+        }
+        created = client.post("/journal-entry", json=payload, headers=auth_headers)
+
+        single = client.get(
+            f"/journal-entry/{created.json()['date']}", headers=auth_headers
+        )
+        listing = client.get("/journal-entries", headers=auth_headers)
+
+        assert listing.headers["content-type"] == "application/json"
+        assert listing.json()["entries"] == [single.json()]
+
+
+class TestListFilters:
+    """Test from=, to= and emotion= on /journal-entries."""
+
+    # 2023-02-25 to 2023-04-05, alternating fatigue and joy
+    ENTRIES = consecutive_days(
+        ({"emotion": "joy" if n % 2 else "fatigue"} for n in range(40)),
+        start=date(2023, 2, 25),
+    )
+
+    def test_date_range(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Both bounds are inclusive and the count follows the filter."""
+        seed_entries(self.ENTRIES)
+
+        body = client.get(
+            "/journal-entries?from=2023-03-01&to=2023-03-31&page_size=100",
+            headers=auth_headers,
+        ).json()
+
+        dates = [entry["date"] for entry in body["entries"]]
+        assert dates[0] == "2023-03-31"
+        assert dates[-1] == "2023-03-01"
+        assert len(dates) == 31
+        assert body["pagination"]["total_items"] == 31
+
+    def test_emotion_with_cursor_pages(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Cursor pages stay inside the filters."""
+        seed_entries(self.ENTRIES)
+        url = "/journal-entries?from=2023-03-01&emotion=joy&page_size=5&fields=emotion"
+
+        seen: list[str] = []
+        body = client.get(url, headers=auth_headers).json()
+        while True:
+            seen += [entry["date"] for entry in body["entries"]]
+            assert {entry["emotion"] for entry in body["entries"]} == {"joy"}
+            cursor = body["pagination"]["next_cursor"]
+            if cursor is None:
+                break
+            body = client.get(f"{url}&cursor={cursor}", headers=auth_headers).json()
+
+        assert body["pagination"]["total_items"] == len(seen) == 18
+        assert seen == sorted(seen, reverse=True)
+        assert min(seen) >= "2023-03-01"
+
+    @pytest.mark.parametrize(
+        "query", ["from=2023-03-32", "to=March", "from=2023-04-01&to=2023-03-01"]
+    )
+    def test_invalid_dates(
+        self,
+        client: TestClient,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        query: str,
+    ) -> None:
+        """Malformed or reversed bounds are client errors."""
+        response = client.get(f"/journal-entries?{query}", headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_unknown_emotion(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Only catalog emotions are accepted."""
+        response = client.get("/journal-entries?emotion=bored", headers=auth_headers)
+        assert response.status_code == 422
+
+    def test_filters_change_the_etag(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """A cached unfiltered page does not answer a filtered request."""
+        first = client.get("/journal-entries", headers=auth_headers)
+
+        second = client.get(
+            "/journal-entries?emotion=joy",
+            headers={**auth_headers, "If-None-Match": first.headers["etag"]},
+        )
+
+        assert second.status_code == 200
+
+    def _plan(self, db_session: Session, query: Any, params: tuple[Any, ...]) -> str:
+        sql = str(query.compile(db_session.get_bind()))
+        return " ".join(
+            row[-1]
+            for row in db_session.connection().exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {sql}", params
+            )
+        )
+
+    def test_date_range_is_an_index_seek(self, db_session: Session) -> None:
+        """Bounds seek (user_id, date) and rows come back in index order."""
+        plan = self._plan(
+            db_session,
+            journal_entries_list_query(
+                1,
+                projection_columns(JOURNAL_ENTRY_FIELDS),
+                date(2023, 3, 1),
+                date(2023, 3, 31),
+                "joy",
+                (date(2023, 3, 20), 5),
+            ),
+            (1, "2023-03-01", "2023-03-31", "joy", "2023-03-20", "2023-03-20", 5),
+        )
+        assert (
+            "USING INDEX ix_journal_entries_user_id_date (user_id=? AND date>? AND date<?)"
+            in plan
+        )
+        assert "SCAN" not in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_filtered_count_reads_only_the_index(self, db_session: Session) -> None:
+        """Counting a filtered list never touches the table."""
+        plan = self._plan(
+            db_session,
+            journal_entries_count_query(1, date(2023, 3, 1), None, "joy"),
+            (1, "2023-03-01", "joy"),
+        )
+        assert (
+            "USING COVERING INDEX ix_journal_entries_user_id_date_emotion (user_id=? AND date>?)"
+            in plan
+        )
+        assert "SCAN" not in plan
+
+
+class TestListProjection:
+    """Test fields= and summary on /journal-entries."""
+
+    ENTRY = {
+        "gratitude_answers": ["coffee"],
+        "emotion": "joy",
+        "custom_text": "x" * 500,
+        "visual_settings": {"theme": "sunny"},
+    }
+
+    def test_fields_limits_entry_keys(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Only the requested fields come back, plus id and date."""
+        seed_entries(consecutive_days([self.ENTRY] * 2))
+
+        response = client.get("/journal-entries?fields=emotion", headers=auth_headers)
+
+        assert response.status_code == 200
+        for entry in response.json()["entries"]:
+            assert set(entry) == {"id", "date", "emotion"}
+
+    def test_unknown_field_is_rejected(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """An unknown field name is a 400 that names it."""
+        response = client.get(
+            "/journal-entries?fields=emotion,password", headers=auth_headers
+        )
+
+        assert response.status_code == 400
+        assert "password" in response.json()["detail"]
+
+    def test_fields_and_summary_are_exclusive(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """fields and summary cannot be combined."""
+        response = client.get(
+            "/journal-entries?fields=emotion&summary=true", headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
+    def test_summary_returns_truncated_preview(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Summary mode sends a preview instead of the full text."""
+        seed_entries(consecutive_days([self.ENTRY] * 1))
+
+        response = client.get("/journal-entries?summary=true", headers=auth_headers)
+
+        (entry,) = response.json()["entries"]
+        assert set(entry) == {"id", "date", "emotion", "preview"}
+        assert entry["preview"] == "x" * PREVIEW_LENGTH
+
+    def test_summary_cursor_walk(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Keyset paging works on projected rows."""
+        seed_entries(consecutive_days([self.ENTRY] * 5))
+
+        dates = []
+        url = "/journal-entries?summary=true&page_size=2"
+        while url:
+            body = client.get(url, headers=auth_headers).json()
+            dates += [entry["date"] for entry in body["entries"]]
+            cursor = body["pagination"]["next_cursor"]
+            url = (
+                f"/journal-entries?summary=true&page_size=2&cursor={cursor}"
+                if cursor
+                else ""
+            )
+
+        assert len(dates) == 5
+        assert dates == sorted(dates, reverse=True)
+
+    def test_projection_changes_etag(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """A cached full page does not satisfy a summary request."""
+        seed_entries(consecutive_days([self.ENTRY] * 1))
+        full = client.get("/journal-entries", headers=auth_headers)
+
+        summary = client.get(
+            "/journal-entries?summary=true",
+            headers={**auth_headers, "If-None-Match": full.headers["etag"]},
+        )
+
+        assert summary.status_code == 200
+        assert summary.headers["etag"] != full.headers["etag"]
+
+    def test_summary_query_does_not_select_full_text(self) -> None:
+        """The preview is cut in SQL; custom_text itself is not selected."""
+        sql = str(select(*projection_columns(SUMMARY_FIELDS)))
+
+        assert "substr(journal_entries.custom_text" in sql
+        assert "journal_entries.visual_settings" not in sql
+        assert sql.count("custom_text") == 1
+
+
+class TestCursorPagination:
+    """Test keyset pagination of /journal-entries."""
+
+    def test_cursor_walk_returns_every_entry_once(
+        self,
+        client: TestClient,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        seed_entries: Callable[..., None],
+    ) -> None:
+        """Following next_cursor visits all entries newest first."""
+        seed_entries(consecutive_days([{}] * 5))
+
+        seen = []
+        response = client.get("/journal-entries?page_size=2", headers=auth_headers)
+        while True:
+            body = response.json()
+            seen.extend(entry["date"] for entry in body["entries"])
+            cursor = body["pagination"]["next_cursor"]
+            if cursor is None:
+                assert body["pagination"]["has_next"] is False
+                break
+            response = client.get(
+                f"/journal-entries?page_size=2&cursor={cursor}", headers=auth_headers
+            )
+            assert response.json()["pagination"]["current_page"] is None
+
+        assert seen == sorted(seen, reverse=True)
+        assert len(seen) == len(set(seen)) == 5
+
+    def test_page_mode_still_supported(
+        self,
+        client: TestClient,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        seed_entries: Callable[..., None],
+    ) -> None:
+        """Page-number requests keep returning page metadata."""
+        seed_entries(consecutive_days([{}] * 3))
+
+        body = client.get(
+            "/journal-entries?page=2&page_size=2", headers=auth_headers
+        ).json()
+
+        assert body["pagination"]["current_page"] == 2
+        assert body["pagination"]["has_next"] is False
+        assert [entry["date"] for entry in body["entries"]] == ["2024-01-01"]
+
+    def test_invalid_cursor(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """A tampered cursor is rejected."""
+        response = client.get(
+            "/journal-entries?cursor=not-a-cursor", headers=auth_headers
+        )
+        assert response.status_code == 400
+
+
+class TestBatchSave:
+    """Test POST /journal-entries/batch."""
+
+    def test_creates_and_updates(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Each item reports whether it inserted or overwrote a day."""
+        client.post(
+            "/journal-entries/batch",
+            json={"entries": [{"date": "2024-01-02", "custom_text": "old"}]},
+            headers=auth_headers,
+        )
+        response = client.post(
+            "/journal-entries/batch",
+            json={
+                "entries": [
+                    {"date": "2024-01-03", "emotion": "joy"},
+                    {"date": "2024-01-02", "custom_text": "new"},
+                    {"date": "2024-01-01"},
+                ]
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["status"] for r in results] == ["created", "updated", "created"]
+        assert results[1]["entry"]["custom_text"] == "new"
+
+        user = client.get("/users/me").json()
+        assert user["entry_count"] == 3
+        assert user["first_entry_date"] == "2024-01-01"
+        assert user["last_entry_date"] == "2024-01-03"
+
+    def test_last_item_for_a_date_wins(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Earlier duplicates are skipped rather than saved twice."""
+        response = client.post(
+            "/journal-entries/batch",
+            json={
+                "entries": [
+                    {"date": "2024-01-01", "custom_text": "draft"},
+                    {"date": "2024-01-01", "custom_text": "final"},
+                ]
+            },
+            headers=auth_headers,
+        )
+        first, second = response.json()["results"]
+        assert first["status"] == "skipped"
+        assert second["status"] == "created"
+        assert (
+            client.get("/journal-entry/2024-01-01", headers=auth_headers).json()[
+                "custom_text"
+            ]
+            == "final"
+        )
+
+    def test_future_dates_are_rejected(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Items dated after tomorrow are not saved; the rest are."""
+        future = (date.today() + timedelta(days=30)).isoformat()
+        response = client.post(
+            "/journal-entries/batch",
+            json={"entries": [{"date": future}, {"date": "2024-01-01"}]},
+            headers=auth_headers,
+        )
+        statuses = [r["status"] for r in response.json()["results"]]
+        assert statuses == ["rejected", "created"]
+        assert client.get("/users/me").json()["entry_count"] == 1
+
+    def test_batch_size_is_capped(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Oversized batches are refused outright."""
+        entries = [
+            {"date": (date(2020, 1, 1) + timedelta(days=n)).isoformat()}
+            for n in range(101)
+        ]
+        response = client.post(
+            "/journal-entries/batch", json={"entries": entries}, headers=auth_headers
+        )
+        assert response.status_code == 400
+
+
+class TestChangesFeed:
+    """Test the GET /journal-entries/changes delta sync feed."""
+
+    def _save(
+        self, client: TestClient, headers: Dict[str, str], day: str, text: str
+    ) -> None:
+        client.post(
+            "/journal-entries/batch",
+            json={"entries": [{"date": day, "custom_text": text}]},
+            headers=headers,
+        )
+
+    def test_full_then_incremental_sync(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """After a full sync only entries saved since are returned."""
+        for day in ("2024-01-01", "2024-01-02", "2024-01-03"):
+            self._save(client, auth_headers, day, "v1")
+
+        full = client.get("/journal-entries/changes", headers=auth_headers).json()
+        assert [e["date"] for e in full["entries"]] == [
+            "2024-01-01",
+            "2024-01-02",
+            "2024-01-03",
+        ]
+        assert full["has_more"] is False
+
+        idle = client.get(
+            f"/journal-entries/changes?since={full['next_since']}", headers=auth_headers
+        ).json()
+        assert idle["entries"] == []
+        assert idle["next_since"] == full["next_since"]
+
+        self._save(client, auth_headers, "2024-01-01", "v2")
+        delta = client.get(
+            f"/journal-entries/changes?since={full['next_since']}", headers=auth_headers
+        ).json()
+        assert [(e["date"], e["custom_text"]) for e in delta["entries"]] == [
+            ("2024-01-01", "v2")
+        ]
+
+    def test_limit_pages_through_changes(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """has_more and next_since walk a long backlog in order."""
+        client.post(
+            "/journal-entries/batch",
+            json={"entries": [{"date": f"2024-02-0{day}"} for day in range(1, 6)]},
+            headers=auth_headers,
+        )
+        seen = []
+        since = ""
+        while True:
+            page = client.get(
+                f"/journal-entries/changes?limit=2{since}", headers=auth_headers
+            ).json()
+            seen.extend(e["date"] for e in page["entries"])
+            since = f"&since={page['next_since']}"
+            if not page["has_more"]:
+                break
+        assert sorted(seen) == [f"2024-02-0{day}" for day in range(1, 6)]
+        assert len(seen) == 5
+
+    def test_invalid_token(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """A malformed since token is a client error."""
+        response = client.get(
+            "/journal-entries/changes?since=!!!", headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    def test_edit_with_an_earlier_clock_is_not_skipped(
+        self,
+        client: TestClient,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Feed order follows commits, not the writer's wall clock."""
+        self._save(client, auth_headers, "2024-01-01", "v1")
+        since = client.get("/journal-entries/changes", headers=auth_headers).json()[
+            "next_since"
+        ]
+
+        class SteppedBack(datetime):
+            @classmethod
+            def utcnow(cls) -> datetime:  # type: ignore[override]
+                return datetime(2000, 1, 1)
+
+        monkeypatch.setattr(main, "datetime", SteppedBack)
+        self._save(client, auth_headers, "2024-01-02", "late clock")
+        monkeypatch.undo()
+
+        delta = client.get(
+            f"/journal-entries/changes?since={since}", headers=auth_headers
+        ).json()
+        assert [e["custom_text"] for e in delta["entries"]] == ["late clock"]
+
+    def test_query_uses_change_seq_index(self, db_session: Session) -> None:
+        """The feed seeks the (user_id, change_seq) index without sorting."""
+        query = journal_entry_changes_query(1, (7, 5), 100)
+        sql = str(
+            query.compile(db_session.get_bind(), compile_kwargs={"literal_binds": True})
+        )
+        plan = " ".join(
+            row[-1]
+            for row in db_session.connection().exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {sql}"
+            )
+        )
+        assert "ix_journal_entries_user_id_change_seq" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestMonthCalendar:
+    """Test the per-month calendar summary."""
+
+    def test_days_encode_presence_and_emotion(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Each day carries a presence bit and its emotion code."""
+        seed_entries(
+            {
+                date(2024, 2, 1): {"emotion": "joy"},
+                date(2024, 2, 29): {},
+                date(2024, 3, 1): {"emotion": "joy"},
+            }
+        )
+
+        body = client.get("/journal-entries/month/2024-02", headers=auth_headers).json()
+
+        assert body["month"] == "2024-02"
+        assert len(body["days"]) == 29
+        joy = body["emotions"].index("joy") + 1
+        assert body["days"][0] == 1 | (joy << 1)
+        assert body["days"][28] == 1
+        assert sum(1 for code in body["days"] if code) == 2
+
+    def test_invalid_month(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Anything but YYYY-MM is a client error."""
+        response = client.get("/journal-entries/month/2024-13", headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_early_years_are_zero_padded(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """The month comes back in the YYYY-MM form it was asked for."""
+        body = client.get("/journal-entries/month/0001-01", headers=auth_headers).json()
+        assert body["month"] == "0001-01"
+
+    def test_last_representable_month_is_a_client_error(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """9999-12 has no following month to bound it, so it is rejected."""
+        response = client.get("/journal-entries/month/9999-12", headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_matching_etag_is_not_modified(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Repeating a request with its ETag gets a 304."""
+        first = client.get("/journal-entries/month/2024-02", headers=auth_headers)
+
+        second = client.get(
+            "/journal-entries/month/2024-02",
+            headers={**auth_headers, "If-None-Match": first.headers["etag"]},
+        )
+
+        assert second.status_code == 304
+
+    def test_save_invalidates_cached_month(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """A save shows up in its month straight away."""
+        today = date.today()
+        url = f"/journal-entries/month/{today:%Y-%m}"
+        before = client.get(url, headers=auth_headers)
+        assert before.json()["days"][today.day - 1] == 0
+
+        client.post(
+            "/journal-entry",
+            json={"gratitude_answers": [], "emotion_answers": []},
+            headers=auth_headers,
+        )
+        after = client.get(
+            url, headers={**auth_headers, "If-None-Match": before.headers["etag"]}
+        )
+
+        assert after.status_code == 200
+        assert after.json()["days"][today.day - 1] == 1
+
+    def test_batch_save_invalidates_each_month(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Batch saves drop every month they touch."""
+        for month in ("2024-01", "2024-02"):
+            client.get(f"/journal-entries/month/{month}", headers=auth_headers)
+
+        client.post(
+            "/journal-entries/batch",
+            json={
+                "entries": [
+                    {"date": "2024-01-31", "gratitude_answers": []},
+                    {"date": "2024-02-01", "gratitude_answers": []},
+                ]
+            },
+            headers=auth_headers,
+        )
+
+        january = client.get("/journal-entries/month/2024-01", headers=auth_headers)
+        february = client.get("/journal-entries/month/2024-02", headers=auth_headers)
+        assert january.json()["days"][30] == 1
+        assert february.json()["days"][0] == 1
+
+    def test_save_during_a_miss_is_not_cached_over(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Days read before a concurrent save are not served after it."""
+        encode_month = main.encode_month
+
+        def encode_then_save(first: date, rows: Any) -> Any:
+            days = encode_month(first, rows)
+            monkeypatch.setattr(main, "encode_month", encode_month)
+            seed_entries({date(2024, 2, 10): {}})
+            return days
+
+        monkeypatch.setattr(main, "encode_month", encode_then_save)
+        url = "/journal-entries/month/2024-02"
+        before = client.get(url, headers=auth_headers)
+        assert before.json()["days"][9] == 0
+
+        after = client.get(
+            url, headers={**auth_headers, "If-None-Match": before.headers["etag"]}
+        )
+
+        assert after.status_code == 200
+        assert after.json()["days"][9] == 1
+
+    def test_import_from_another_process_shows_up(
+        self,
+        client: TestClient,
+        temp_db: Engine,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Writes that never pass through this process's caches are seen."""
+        url = "/journal-entries/month/2024-02"
+        before = client.get(url, headers=auth_headers)
+
+        with temp_db.begin() as conn:
+            write_batch(
+                conn,
+                dev_user.id,
+                [
+                    {
+                        "user_id": dev_user.id,
+                        "date": date(2024, 2, 10),
+                        "gratitude_answers": [],
+                        "emotion": None,
+                        "emotion_answers": [],
+                        "custom_text": None,
+                        "visual_settings": None,
+                    }
+                ],
+            )
+        after = client.get(
+            url, headers={**auth_headers, "If-None-Match": before.headers["etag"]}
+        )
+
+        assert after.status_code == 200
+        assert after.json()["days"][9] == 1
+
+    def test_query_is_an_index_range_scan(self, db_session: Session) -> None:
+        """The month is read with one seek on the covering calendar index."""
+        sql = str(
+            month_calendar_query(1, date(2024, 2, 1)).compile(db_session.get_bind())
+        )
+        plan = " ".join(
+            row[-1]
+            for row in db_session.connection().exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {sql}", (1, "2024-02-01", "2024-03-01")
+            )
+        )
+        assert (
+            "USING COVERING INDEX ix_journal_entries_user_id_date_emotion (user_id=? AND date>? AND date<?)"
+            in plan
+        )
+
+
+class TestHeatmap:
+    """Test the packed yearly heatmap."""
+
+    def test_days_and_codes_decode(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """The bitset and nibbles describe exactly the seeded days."""
+        seed_entries(
+            {
+                date(2024, 1, 1): {"emotion": "joy"},
+                date(2024, 1, 2): {},
+                date(2024, 12, 31): {"emotion": "fatigue"},
+                date(2023, 12, 31): {"emotion": "joy"},
+            }
+        )
+
+        response = client.get("/journal-entries/heatmap/2024", headers=auth_headers)
+        body = response.json()
+        days = base64.b64decode(body["days"])
+        codes = base64.b64decode(body["codes"])
+
+        assert len(response.content) < 1024
+        assert (len(days), len(codes)) == (46, 183)
+        present = [day for day in range(366) if days[day // 8] >> (day % 8) & 1]
+        assert present == [0, 1, 365]
+        names = [(codes[day // 2] >> (4 * (day % 2))) & 0xF for day in present]
+        assert [body["emotions"][code - 1] if code else None for code in names] == [
+            "joy",
+            None,
+            "fatigue",
+        ]
+
+    @pytest.mark.parametrize("year", ["twenty", "0", "10000"])
+    def test_invalid_year(
+        self,
+        client: TestClient,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        year: str,
+    ) -> None:
+        """Years outside the calendar are rejected."""
+        response = client.get(f"/journal-entries/heatmap/{year}", headers=auth_headers)
+        assert response.status_code == 422
+
+    def test_matching_etag_is_not_modified(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Repeating a request with its ETag gets a 304."""
+        first = client.get("/journal-entries/heatmap/2024", headers=auth_headers)
+
+        second = client.get(
+            "/journal-entries/heatmap/2024",
+            headers={**auth_headers, "If-None-Match": first.headers["etag"]},
+        )
+
+        assert second.status_code == 304
+
+    def test_save_invalidates_cached_year(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """A save shows up in its year straight away."""
+        url = "/journal-entries/heatmap/2024"
+        before = client.get(url, headers=auth_headers)
+        assert not any(base64.b64decode(before.json()["days"]))
+
+        client.post(
+            "/journal-entries/batch",
+            json={"entries": [{"date": "2024-02-01", "gratitude_answers": []}]},
+            headers=auth_headers,
+        )
+        after = client.get(
+            url, headers={**auth_headers, "If-None-Match": before.headers["etag"]}
+        )
+
+        assert after.status_code == 200
+        assert base64.b64decode(after.json()["days"])[31 // 8] == 1 << (31 % 8)
+
+    def test_save_during_a_miss_is_not_cached_over(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """A year read before a concurrent save is not served after it."""
+        encode_year = main.encode_year
+
+        def encode_then_save(year: int, rows: Any) -> Any:
+            encoded = encode_year(year, rows)
+            monkeypatch.setattr(main, "encode_year", encode_year)
+            seed_entries({date(2024, 1, 1): {}})
+            return encoded
+
+        monkeypatch.setattr(main, "encode_year", encode_then_save)
+        url = "/journal-entries/heatmap/2024"
+        before = client.get(url, headers=auth_headers)
+
+        after = client.get(
+            url, headers={**auth_headers, "If-None-Match": before.headers["etag"]}
+        )
+
+        assert after.status_code == 200
+        assert base64.b64decode(after.json()["days"])[0] == 1
+
+    def test_import_from_another_process_shows_up(
+        self,
+        client: TestClient,
+        temp_db: Engine,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Writes that never pass through this process's caches are seen."""
+        url = "/journal-entries/heatmap/2024"
+        before = client.get(url, headers=auth_headers)
+
+        with temp_db.begin() as conn:
+            write_batch(
+                conn,
+                dev_user.id,
+                [
+                    {
+                        "user_id": dev_user.id,
+                        "date": date(2024, 1, 1),
+                        "gratitude_answers": [],
+                        "emotion": None,
+                        "emotion_answers": [],
+                        "custom_text": None,
+                        "visual_settings": None,
+                    }
+                ],
+            )
+        after = client.get(
+            url, headers={**auth_headers, "If-None-Match": before.headers["etag"]}
+        )
+
+        assert after.status_code == 200
+        assert base64.b64decode(after.json()["days"])[0] == 1
+
+    def test_query_is_a_covering_index_scan(self, db_session: Session) -> None:
+        """The year is read from the index alone."""
+        sql = str(heatmap_query(1, 2024).compile(db_session.get_bind()))
+        plan = " ".join(
+            row[-1]
+            for row in db_session.connection().exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {sql}", (1, "2024-01-01", "2025-01-01")
+            )
+        )
+        assert (
+            "USING COVERING INDEX ix_journal_entries_user_id_date_emotion (user_id=? AND date>? AND date<?)"
+            in plan
+        )
+
+
+class TestByDates:
+    """Test fetching several dates at once."""
+
+    def test_returns_existing_entries_oldest_first(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Only dates with entries come back, in date order."""
+        seed_entries({date(2023, 3, 1): {}, date(2024, 3, 1): {}})
+
+        response = client.get(
+            "/journal-entries/by-dates?dates=2024-03-01,2023-03-01,2024-02-29",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert [e["date"] for e in response.json()] == ["2023-03-01", "2024-03-01"]
+
+    def test_matches_single_entry_endpoint(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Entries are encoded as /journal-entry/{date} encodes them."""
+        seed_entries({date(2024, 3, 1): {}})
+
+        single = client.get("/journal-entry/2024-03-01", headers=auth_headers)
+        many = client.get(
+            "/journal-entries/by-dates?dates=2024-03-01", headers=auth_headers
+        )
+
+        assert many.json() == [single.json()]
+
+    @pytest.mark.parametrize("dates", ["", "2024-03-01,yesterday"])
+    def test_invalid_dates(
+        self,
+        client: TestClient,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        dates: str,
+    ) -> None:
+        """Missing or malformed dates are a client error."""
+        response = client.get(
+            f"/journal-entries/by-dates?dates={dates}", headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    def test_too_many_dates(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """More than BY_DATES_MAX distinct dates is rejected."""
+        dates = ",".join(
+            str(date(2024, 1, 1) + timedelta(days=i)) for i in range(BY_DATES_MAX + 1)
+        )
+        response = client.get(
+            f"/journal-entries/by-dates?dates={dates}", headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    def test_query_seeks_each_date(self, db_session: Session) -> None:
+        """The IN list is looked up on the (user_id, date) index."""
+        query = journal_entries_by_dates_query(1, [date(2024, 3, 1), date(2023, 3, 1)])
+        sql = str(
+            query.compile(
+                db_session.get_bind(), compile_kwargs={"render_postcompile": True}
+            )
+        )
+        plan = " ".join(
+            row[-1]
+            for row in db_session.connection().exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {sql}", (1, "2024-03-01", "2023-03-01")
+            )
+        )
+        assert (
+            "USING INDEX ix_journal_entries_user_id_date (user_id=? AND date=?)" in plan
+        )
+        assert "SCAN" not in plan
+
+
+class TestSearch:
+    """Test /journal-entries/search."""
+
+    @staticmethod
+    def _entries(texts: list[str]) -> Dict[date, Dict[str, Any]]:
+        return consecutive_days(
+            {"gratitude_answers": ["my morning coffee"], "custom_text": text}
+            for text in texts
+        )
+
+    def test_finds_text_and_answers_with_snippets(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Words match in custom text and answers and come back highlighted."""
+        seed_entries(self._entries(["A long walk by the river", "Rainy day"]))
+
+        river = client.get("/journal-entries/search?q=river", headers=auth_headers)
+        coffee = client.get("/journal-entries/search?q=coff", headers=auth_headers)
+
+        assert river.status_code == 200
+        (hit,) = river.json()["results"]
+        assert hit["date"] == "2024-01-01"
+        assert "<mark>river</mark>" in hit["snippet"]
+        assert len(coffee.json()["results"]) == 2
+        assert "<mark>coffee</mark>" in coffee.json()["results"][0]["snippet"]
+
+    def test_newest_matches_first(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Results follow entry dates, not how often the word appears."""
+        seed_entries(self._entries(["river river river", "river", "no match"]))
+
+        body = client.get(
+            "/journal-entries/search?q=river", headers=auth_headers
+        ).json()
+
+        assert [hit["date"] for hit in body["results"]] == ["2024-01-02", "2024-01-01"]
+        assert "score" not in body["results"][0]
+
+    def test_other_users_writes_change_nothing(
+        self,
+        client: TestClient,
+        db_session: Session,
+        dev_user: User,
+        seed_entries: Callable[..., None],
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Pages and cursors reveal nothing about other journals."""
+        seed_entries(self._entries(["river walk", "river bank", "river"]))
+        url = "/journal-entries/search?q=river&limit=2"
+        before = client.get(url, headers=auth_headers).json()
+
+        other = User(firebase_uid="other-uid", email="other@example.com")
+        db_session.add(other)
+        db_session.commit()
+        db_session.add(
+            JournalEntry(
+                user_id=other.id,
+                date=date(2024, 1, 5),
+                gratitude_answers=[],
+                emotion_answers=[],
+                custom_text="river " * 50,
+            )
+        )
+        db_session.commit()
+        after = client.get(url, headers=auth_headers).json()
+        rest = client.get(
+            f"{url}&cursor={before['next_cursor']}", headers=auth_headers
+        ).json()
+
+        assert after == before
+        assert [hit["date"] for hit in rest["results"]] == ["2024-01-01"]
+
+    def test_cursor_walk_returns_every_match_once(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Keyset pages cover all matches without repeats."""
+        seed_entries(self._entries([f"river {'x ' * day}" for day in range(7)]))
+
+        seen: list[int] = []
+        url = "/journal-entries/search?q=river&limit=3"
+        while url:
+            body = client.get(url, headers=auth_headers).json()
+            seen += [hit["id"] for hit in body["results"]]
+            url = (
+                f"/journal-entries/search?q=river&limit=3&cursor={body['next_cursor']}"
+                if body["has_more"]
+                else ""
+            )
+
+        assert len(seen) == 7
+        assert len(set(seen)) == 7
+
+    @pytest.mark.parametrize("query", ["", "%21%3F", "x" * 201])
+    def test_invalid_queries(
+        self,
+        client: TestClient,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        query: str,
+    ) -> None:
+        """Empty, wordless or overlong queries are client errors."""
+        response = client.get(
+            f"/journal-entries/search?q={query}", headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    def test_fts_syntax_in_query_is_literal(
+        self,
+        client: TestClient,
+        seed_entries: Callable[..., None],
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Quotes and operators do not break the query."""
+        seed_entries(self._entries(["river"]))
+
+        response = client.get(
+            '/journal-entries/search?q=river" OR NEAR(', headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["results"] == []
+
+
+class TestEmotionStats:
+    """Test the per-month emotion rollup and /stats/emotions."""
+
+    def _batch(
+        self, client: TestClient, headers: Dict[str, str], entries: Dict[str, Any]
+    ) -> None:
+        response = client.post(
+            "/journal-entries/batch",
+            json={
+                "entries": [
+                    {"date": day, "gratitude_answers": [], "emotion": emotion}
+                    for day, emotion in entries.items()
+                ]
+            },
+            headers=headers,
+        )
+        assert response.status_code == 200
+
+    def test_saves_adjust_counts(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """New entries add a count and a changed emotion moves it."""
+        self._batch(
+            client,
+            auth_headers,
+            {"2024-01-01": "joy", "2024-01-02": "joy", "2024-02-01": "stress"},
+        )
+        self._batch(client, auth_headers, {"2024-01-02": "anger", "2024-02-02": None})
+
+        body = client.get("/stats/emotions", headers=auth_headers).json()
+
+        assert body["months"] == [
+            {"month": "2024-01", "counts": {"anger": 1, "joy": 1}},
+            {"month": "2024-02", "counts": {"stress": 1}},
+        ]
+        assert body["totals"] == {"anger": 1, "joy": 1, "stress": 1}
+
+    def test_counts_that_reach_zero_are_removed(
+        self,
+        client: TestClient,
+        db_session: Session,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Clearing the only entry with an emotion drops its rollup row."""
+        self._batch(client, auth_headers, {"2024-01-01": "joy"})
+        self._batch(client, auth_headers, {"2024-01-01": None})
+
+        body = client.get("/stats/emotions", headers=auth_headers).json()
+
+        assert body == {"months": [], "totals": {}}
+        assert db_session.query(EmotionMonthCount).count() == 0
+
+    def test_early_years_match_the_recomputed_rollup(
+        self,
+        client: TestClient,
+        db_session: Session,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Years below 1000 are zero-padded, as SQLite's strftime pads them."""
+        self._batch(client, auth_headers, {"0999-05-01": "joy", "2024-01-01": "joy"})
+        rows = select(EmotionMonthCount.year_month, EmotionMonthCount.count)
+        saved = sorted(db_session.execute(rows).tuples())
+
+        recompute_emotion_counts(db_session.connection(), dev_user.id)
+        db_session.commit()
+        body = client.get(
+            "/stats/emotions?from=0999-01&to=0999-12", headers=auth_headers
+        ).json()
+
+        assert saved == sorted(db_session.execute(rows).tuples())
+        assert saved == [("0999-05", 1), ("2024-01", 1)]
+        assert body["months"] == [{"month": "0999-05", "counts": {"joy": 1}}]
+
+    def test_single_save_counts_today(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """/journal-entry keeps the rollup current too."""
+        for emotion in ("joy", "stress"):
+            client.post(
+                "/journal-entry",
+                json={"gratitude_answers": [], "emotion": emotion},
+                headers=auth_headers,
+            )
+
+        body = client.get("/stats/emotions", headers=auth_headers).json()
+
+        assert body["totals"] == {"stress": 1}
+
+    def test_range_is_inclusive(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """from and to bound the months returned."""
+        self._batch(
+            client,
+            auth_headers,
+            {"2024-01-01": "joy", "2024-02-01": "joy", "2024-03-01": "joy"},
+        )
+
+        body = client.get(
+            "/stats/emotions?from=2024-02&to=2024-03", headers=auth_headers
+        ).json()
+
+        assert [month["month"] for month in body["months"]] == ["2024-02", "2024-03"]
+        assert body["totals"] == {"joy": 2}
+
+    @pytest.mark.parametrize(
+        "query", ["from=2024-13", "to=24-01", "from=2024-03&to=2024-02"]
+    )
+    def test_invalid_range(
+        self,
+        client: TestClient,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        query: str,
+    ) -> None:
+        """Malformed or reversed bounds are client errors."""
+        response = client.get(f"/stats/emotions?{query}", headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_query_reads_only_the_rollup_key_range(self, db_session: Session) -> None:
+        """The range is one seek on the rollup's primary key."""
+        sql = str(
+            emotion_stats_query(1, "2024-01", "2024-06").compile(db_session.get_bind())
+        )
+        plan = " ".join(
+            row[-1]
+            for row in db_session.connection().exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {sql}", (1, "2024-01", "2024-06")
+            )
+        )
+        assert (
+            "emotion_month_counts USING PRIMARY KEY (user_id=? AND year_month>? AND year_month<?)"
+            in plan
+        )
+        assert "journal_entries" not in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestStreaks:
+    """Test streak upkeep on save and /users/me/streak."""
+
+    def _save(self, client: TestClient, headers: Dict[str, str], *dates: date) -> None:
+        response = client.post(
+            "/journal-entries/batch",
+            json={
+                "entries": [
+                    {"date": day.isoformat(), "gratitude_answers": []} for day in dates
+                ]
+            },
+            headers=headers,
+        )
+        assert response.status_code == 200
+
+    def _stored(self, db_session: Session, user: User) -> tuple[int, int]:
+        db_session.expire_all()
+        return user.current_streak, user.longest_streak
+
+    def test_consecutive_saves_and_gaps(
+        self,
+        client: TestClient,
+        db_session: Session,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Each next day extends the streak and a gap restarts it."""
+        start = date(2024, 1, 1)
+        for offset in range(3):
+            self._save(client, auth_headers, start + timedelta(days=offset))
+        assert self._stored(db_session, dev_user) == (3, 3)
+
+        self._save(client, auth_headers, start + timedelta(days=5))
+        assert self._stored(db_session, dev_user) == (1, 3)
+
+    def test_backfill_joins_runs(
+        self,
+        client: TestClient,
+        db_session: Session,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Filling a gap merges the runs on either side."""
+        self._save(
+            client, auth_headers, *[date(2024, 1, day) for day in (1, 2, 4, 5, 6)]
+        )
+        assert self._stored(db_session, dev_user) == (3, 3)
+
+        self._save(client, auth_headers, date(2024, 1, 3))
+        assert self._stored(db_session, dev_user) == (6, 6)
+
+    def test_backfill_into_older_history(
+        self,
+        client: TestClient,
+        db_session: Session,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """A gap filled far from the current run can raise only the longest."""
+        self._save(
+            client,
+            auth_headers,
+            *[date(2023, 1, day) for day in (1, 2, 4, 5)],
+            date(2024, 1, 1),
+        )
+        self._save(client, auth_headers, date(2023, 1, 3))
+        assert self._stored(db_session, dev_user) == (1, 5)
+
+    def test_random_saves_match_full_recompute(
+        self,
+        client: TestClient,
+        db_session: Session,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """Incremental upkeep agrees with recomputing from every date."""
+        generator = random.Random(7)
+        saved: set[date] = set()
+        for _ in range(25):
+            batch = {
+                date(2024, 1, 1) + timedelta(days=generator.randrange(60))
+                for _ in range(generator.randint(1, 4))
+            }
+            self._save(client, auth_headers, *batch)
+            saved |= batch
+            assert self._stored(db_session, dev_user) == streak_lengths(sorted(saved))
+
+    def test_streak_endpoint_reads_no_entries(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """The streak comes from the user record and lapses after a skipped day."""
+        today = date.today()
+        self._save(
+            client, auth_headers, today - timedelta(days=2), today - timedelta(days=1)
+        )
+        client.get("/users/me/streak", headers=auth_headers)
+
+        statements: list[str] = []
+
+        def record(_conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            body = client.get("/users/me/streak", headers=auth_headers).json()
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+
+        assert body == {
+            "current_streak": 2,
+            "longest_streak": 2,
+            "last_entry_date": str(today - timedelta(days=1)),
+        }
+        assert not any("journal_entries" in statement for statement in statements)
+
+    def test_lapsed_streak(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """A skipped day shows as no current streak."""
+        self._save(client, auth_headers, date(2024, 1, 1), date(2024, 1, 2))
+
+        body = client.get("/users/me/streak", headers=auth_headers).json()
+
+        assert (body["current_streak"], body["longest_streak"]) == (0, 2)
+
+    def test_unknown_time_zone(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """An unknown tz is a client error."""
+        response = client.get("/users/me/streak?tz=Mars/Base", headers=auth_headers)
+        assert response.status_code == 400
+
+
+class TestExport:
+    """Test the streaming NDJSON export."""
+
+    def _seed(self, client: TestClient, headers: Dict[str, str], days: int) -> None:
+        client.post(
+            "/journal-entries/batch",
+            json={
+                "entries": [
+                    {
+                        "date": (date(2024, 1, 1) + timedelta(days=n)).isoformat(),
+                        "custom_text": f"day {n}",
+                    }
+                    for n in range(days)
+                ]
+            },
+            headers=headers,
+        )
+
+    def test_ndjson_lines(
+        self,
+        client: TestClient,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Every entry is one JSON line, oldest first, across fetch batches."""
+        monkeypatch.setattr("main.EXPORT_BATCH_SIZE", 2)
+        self._seed(client, auth_headers, 5)
+
+        response = client.get("/journal-entries/export", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "attachment" in response.headers["content-disposition"]
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["custom_text"] for line in lines] == [f"day {n}" for n in range(5)]
+        single = client.get("/journal-entry/2024-01-01", headers=auth_headers)
+        assert lines[0] == single.json()
+
+    def test_gzip_download(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """gzip=true returns a .ndjson.gz file of the same lines."""
+        self._seed(client, auth_headers, 3)
+
+        plain = client.get("/journal-entries/export", headers=auth_headers)
+        packed = client.get("/journal-entries/export?gzip=true", headers=auth_headers)
+        assert packed.headers["content-type"] == "application/gzip"
+        assert packed.headers["content-disposition"].endswith('.ndjson.gz"')
+        assert gzip.decompress(packed.content) == plain.content
+
+    def test_empty_journal(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """A user without entries gets an empty body."""
+        response = client.get("/journal-entries/export", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.content == b""
+
+
+class TestImport:
+    """Test POST /journal-entries/import."""
+
+    def test_ndjson_upload(
+        self,
+        client: TestClient,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Records are imported across batches and reflected in the user."""
+        monkeypatch.setattr("importer.IMPORT_BATCH_SIZE", 2)
+        body = "\n".join(
+            json.dumps({"date": f"2023-05-0{day}", "custom_text": f"day {day}"})
+            for day in range(1, 6)
+        )
+        response = client.post(
+            "/journal-entries/import",
+            content=body,
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 200
+        report = response.json()
+        assert (report["received"], report["imported"], report["rejected"]) == (5, 5, 0)
+        assert client.get("/users/me").json()["entry_count"] == 5
+
+    def test_writer_is_untouched_until_a_batch_is_ready(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """The user is resolved on a reader, so uploads do not hold the writer."""
+
+        class Untouchable:
+            def __getattr__(self, name: str) -> Any:
+                raise AssertionError(f"write session used: {name}")
+
+        async def no_writer() -> AsyncGenerator[Any, None]:
+            yield Untouchable()
+
+        app.dependency_overrides[get_db] = no_writer
+        response = client.post(
+            "/journal-entries/import",
+            content=b'{"date": "not a date"}\n',
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["rejected"] == 1
+
+    def test_duplicate_dates_count_once(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """A record replaced later in the same batch is not counted as imported."""
+        body = b'{"date": "2024-01-01"}\n{"date": "2024-01-01", "custom_text": "b"}'
+
+        report = client.post(
+            "/journal-entries/import", content=body, headers=auth_headers
+        ).json()
+
+        assert (report["imported"], report["superseded"]) == (1, 1)
+
+    def test_export_round_trip(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """An export re-imports cleanly as a JSON array or NDJSON."""
+        client.post(
+            "/journal-entries/batch",
+            json={"entries": [{"date": "2024-01-01", "emotion": "joy"}]},
+            headers=auth_headers,
+        )
+        exported = client.get("/journal-entries/export", headers=auth_headers).text
+        as_array = json.dumps([json.loads(line) for line in exported.splitlines()])
+
+        for body in (exported, as_array):
+            report = client.post(
+                "/journal-entries/import", content=body, headers=auth_headers
+            ).json()
+            assert report["imported"] == 1
+        assert client.get("/users/me").json()["entry_count"] == 1
+        stats = client.get("/stats/emotions", headers=auth_headers).json()
+        assert stats["totals"] == {"joy": 1}
+
+    def test_rejections_are_reported(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Invalid records are listed and the rest still imported."""
+        body = '{"date": "2024-01-01"}\n{"date": "nope"}\n'
+        report = client.post(
+            "/journal-entries/import", content=body, headers=auth_headers
+        ).json()
+        assert report["imported"] == 1
+        assert report["errors"] == [
+            {"record": 2, "error": report["errors"][0]["error"]}
+        ]
+
+    def test_malformed_json(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Unparseable input is a client error."""
+        response = client.post(
+            "/journal-entries/import", content=b'{"date": ', headers=auth_headers
+        )
+        assert response.status_code == 400
+
+
+class TestConditionalRequests:
+    """Test ETag / If-None-Match handling of journal reads."""
+
+    def test_single_entry_not_modified(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """An unchanged entry revalidates with an empty 304."""
+        entry_date = client.post(
+            "/journal-entry", json={"custom_text": "v1"}, headers=auth_headers
+        ).json()["date"]
+        first = client.get(f"/journal-entry/{entry_date}", headers=auth_headers)
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        again = client.get(
+            f"/journal-entry/{entry_date}",
+            headers={**auth_headers, "If-None-Match": etag},
+        )
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["etag"] == etag
+
+    def test_single_entry_changes_after_save(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Saving the entry again invalidates its ETag."""
+        entry_date = client.post(
+            "/journal-entry", json={"custom_text": "v1"}, headers=auth_headers
+        ).json()["date"]
+        etag = client.get(f"/journal-entry/{entry_date}", headers=auth_headers).headers[
+            "etag"
+        ]
+        client.post("/journal-entry", json={"custom_text": "v2"}, headers=auth_headers)
+
+        response = client.get(
+            f"/journal-entry/{entry_date}",
+            headers={**auth_headers, "If-None-Match": etag},
+        )
+        assert response.status_code == 200
+        assert response.json()["custom_text"] == "v2"
+        assert response.headers["etag"] != etag
+
+    def test_list_follows_watermark(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """The list ETag holds until an entry is saved, including updates."""
+        client.post("/journal-entry", json={"custom_text": "v1"}, headers=auth_headers)
+        etag = client.get("/journal-entries", headers=auth_headers).headers["etag"]
+
+        unchanged = client.get(
+            "/journal-entries", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert unchanged.status_code == 304
+
+        client.post("/journal-entry", json={"custom_text": "v2"}, headers=auth_headers)
+        changed = client.get(
+            "/journal-entries", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert changed.status_code == 200
+        assert changed.json()["entries"][0]["custom_text"] == "v2"
+
+    def test_list_etag_differs_per_page(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Different pages of the same list carry different ETags."""
+        client.post("/journal-entry", json={}, headers=auth_headers)
+        first = client.get("/journal-entries?page=1", headers=auth_headers)
+        second = client.get("/journal-entries?page=2", headers=auth_headers)
+        assert first.headers["etag"] != second.headers["etag"]
+
+
+class TestUserCache:
+    """Test the firebase_uid -> user snapshot cache."""
+
+    def test_repeat_reads_hit_cache(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Only the first /users/me lookup reaches the database."""
+        client.get("/users/me")
+        client.get("/users/me")
+
+        stats = client.get("/metrics/caches").json()["users"]
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    def test_profile_update_refreshes_snapshot(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """A cached profile never outlives an update."""
+        client.get("/users/me")
+        client.put("/users/me", json={"name": "Renamed"})
+        assert client.get("/users/me").json()["name"] == "Renamed"
+
+    def test_new_entry_refreshes_counters(
+        self, client: TestClient, dev_user: User, auth_headers: Dict[str, str]
+    ) -> None:
+        """Entry statistics follow the first save of a day."""
+        assert client.get("/users/me").json()["entry_count"] == 0
+        client.post("/journal-entry", json={}, headers=auth_headers)
+        assert client.get("/users/me").json()["entry_count"] == 1
+
+    def test_saves_elsewhere_change_the_list_etag(
+        self,
+        client: TestClient,
+        db_session: Session,
+        dev_user: User,
+        auth_headers: Dict[str, str],
+    ) -> None:
+        """A save this process never saw still invalidates a cached list."""
+        before = client.get("/journal-entries", headers=auth_headers)
+
+        # As another worker would: commit without touching this process' caches
+        db_session.add(
+            JournalEntry(
+                user_id=dev_user.id,
+                date=date(2024, 1, 1),
+                gratitude_answers=[],
+                emotion_answers=[],
+            )
+        )
+        dev_user.entry_count = 1
+        dev_user.entries_updated_at = datetime(2024, 1, 1, 12)
+        db_session.commit()
+
+        after = client.get(
+            "/journal-entries",
+            headers={**auth_headers, "If-None-Match": before.headers["etag"]},
+        )
+
+        assert after.status_code == 200
+        assert after.json()["pagination"]["total_items"] == 1
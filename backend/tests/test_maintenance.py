@@ -0,0 +1,117 @@
+"""Tests for maintenance commands."""
+
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from maintenance import (
+    recompute_emotion_counts,
+    recompute_entry_stats,
+    recompute_streaks,
+)
+from models import EmotionMonthCount, JournalEntry, User
+
+# flake8: noqa: E501
+
+
+class TestRecomputeEntryStats:
+    """Test the entry statistics repair command."""
+
+    def test_recomputes_from_entries(self, db_session: Session) -> None:
+        """Drifted counters are rebuilt from journal_entries."""
+        user = User(firebase_uid="test-uid-123", email="test@example.com")
+        empty = User(firebase_uid="other-uid", email="other@example.com")
+        db_session.add_all([user, empty])
+        db_session.commit()
+        for day in (date(2024, 1, 3), date(2024, 1, 1), date(2024, 2, 9)):
+            db_session.add(
+                JournalEntry(
+                    user_id=user.id, date=day, gratitude_answers=[], emotion_answers=[]
+                )
+            )
+        user.entry_count = 99
+        db_session.commit()
+
+        with db_session.get_bind().begin() as conn:
+            assert recompute_entry_stats(conn) == 2
+        db_session.expire_all()
+
+        assert user.entry_count == 3
+        assert user.first_entry_date == date(2024, 1, 1)
+        assert user.last_entry_date == date(2024, 2, 9)
+        assert user.entries_updated_at is not None
+        assert empty.entry_count == 0
+        assert empty.first_entry_date is None
+
+
+class TestRecomputeEmotionCounts:
+    """Test the emotion rollup repair command."""
+
+    def test_rebuilds_from_entries(self, db_session: Session) -> None:
+        """Drifted or stray rollup rows are replaced by counts from entries."""
+        user = User(firebase_uid="test-uid-123", email="test@example.com")
+        db_session.add(user)
+        db_session.commit()
+        for day, emotion in (
+            (date(2024, 1, 3), "joy"),
+            (date(2024, 1, 9), "joy"),
+            (date(2024, 2, 1), "stress"),
+            (date(2024, 2, 2), None),
+        ):
+            db_session.add(
+                JournalEntry(
+                    user_id=user.id,
+                    date=day,
+                    gratitude_answers=[],
+                    emotion=emotion,
+                    emotion_answers=[],
+                )
+            )
+        db_session.add(
+            EmotionMonthCount(
+                user_id=user.id, year_month="2023-12", emotion="anger", count=4
+            )
+        )
+        db_session.commit()
+
+        with db_session.get_bind().begin() as conn:
+            assert recompute_emotion_counts(conn, user.id) == 2
+
+        rows = (
+            db_session.query(EmotionMonthCount)
+            .order_by(EmotionMonthCount.year_month)
+            .all()
+        )
+        assert [(row.year_month, row.emotion, row.count) for row in rows] == [
+            ("2024-01", "joy", 2),
+            ("2024-02", "stress", 1),
+        ]
+
+
+class TestRecomputeStreaks:
+    """Test the streak repair command."""
+
+    def test_recomputes_from_entry_dates(self, db_session: Session) -> None:
+        """Streaks are rebuilt per user; users without entries get zero."""
+        user = User(firebase_uid="test-uid-123", email="test@example.com")
+        empty = User(firebase_uid="other-uid", email="other@example.com")
+        db_session.add_all([user, empty])
+        db_session.commit()
+        for day in (1, 2, 3, 7, 8):
+            db_session.add(
+                JournalEntry(
+                    user_id=user.id,
+                    date=date(2024, 1, day),
+                    gratitude_answers=[],
+                    emotion_answers=[],
+                )
+            )
+        empty.longest_streak = 9
+        db_session.commit()
+
+        with db_session.get_bind().begin() as conn:
+            assert recompute_streaks(conn) == 1
+        db_session.expire_all()
+
+        assert (user.current_streak, user.longest_streak) == (2, 3)
+        assert (empty.current_streak, empty.longest_streak) == (0, 0)
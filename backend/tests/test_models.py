@@ -179,6 +179,24 @@ class TestJournalEntryModel:
         assert entry.custom_text is None
         assert entry.visual_settings is None
 
+    def test_one_entry_per_user_per_day(self, db_session: Session) -> None:
+        """Test that (user_id, date) is unique."""
+        user = User(firebase_uid="test-uid-123", email="test@example.com")
+        db_session.add(user)
+        db_session.commit()
+
+        for _ in range(2):
+            db_session.add(
+                JournalEntry(
+                    user_id=user.id,
+                    date=date(2024, 1, 15),
+                    gratitude_answers=[],
+                    emotion_answers=[],
+                )
+            )
+        with pytest.raises(IntegrityError):
+            db_session.commit()
+
 
 class TestGratitudeQuestionModel:
     """Test the GratitudeQuestion model functionality."""
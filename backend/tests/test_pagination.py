@@ -0,0 +1,63 @@
+"""Tests for keyset pagination cursors."""
+
+import base64
+from datetime import date
+
+import pytest
+
+from pagination import (
+    decode_change_token,
+    decode_cursor,
+    encode_change_token,
+    encode_cursor,
+)
+
+# flake8: noqa: E501
+
+
+class TestCursorEncoding:
+    """Test cursor round-tripping and validation."""
+
+    def test_round_trip(self) -> None:
+        """A cursor decodes to the (date, id) it was built from."""
+        cursor = encode_cursor(date(2024, 3, 9), 42)
+        assert decode_cursor(cursor) == (date(2024, 3, 9), 42)
+
+    def test_cursor_is_url_safe(self) -> None:
+        """Cursors can be placed in a query string unescaped."""
+        cursor = encode_cursor(date(2024, 3, 9), 123456789)
+        assert cursor.isascii()
+        assert not set(cursor) & set("+/=&?")
+
+    @pytest.mark.parametrize(
+        "cursor", ["", "!!!", "bm90LWEtY3Vyc29y", "MjAyNC0wMS0wMTp4"]
+    )
+    def test_malformed_cursor(self, cursor: str) -> None:
+        """Garbage raises ValueError."""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestChangeTokens:
+    """Test delta sync token round-tripping and validation."""
+
+    def test_round_trip(self) -> None:
+        """A token decodes to the (change_seq, id) it was built from."""
+        token = encode_change_token(1234, 42)
+        assert decode_change_token(token) == (1234, 42)
+        assert not set(token) & set("+/=&?")
+
+    @pytest.mark.parametrize(
+        "token",
+        [
+            "",
+            "!!!",
+            encode_cursor(date(2024, 1, 1), 1),
+            # Timestamp tokens from before change_seq
+            base64.urlsafe_b64encode(b"2024-03-09T14:05:01|42").decode(),
+        ],
+    )
+    def test_malformed_token(self, token: str) -> None:
+        """Garbage, including a page cursor, raises ValueError."""
+        with pytest.raises(ValueError):
+            decode_change_token(token)
@@ -0,0 +1,114 @@
+"""Tests for the full-text search index and query building."""
+
+from datetime import date
+from typing import List
+
+import pytest
+from sqlalchemy.orm import Session
+
+from models import JOURNAL_ENTRY_SEARCH_DROP, JournalEntry, User
+from search import (
+    SEARCH_QUERY,
+    build_match_query,
+    rebuild_search_index,
+    search_parameters,
+)
+
+# flake8: noqa: E501
+
+
+class TestBuildMatchQuery:
+    """Test turning user input into FTS5 MATCH expressions."""
+
+    def test_scopes_to_user_and_prefixes_last_word(self) -> None:
+        """Every word must match; the last one as a prefix."""
+        match = build_match_query(7, "sunny walk")
+        assert match.startswith('owner:"u7" AND ')
+        assert match.endswith('("sunny" AND "walk"*)')
+
+    def test_fts_syntax_is_quoted_away(self) -> None:
+        """Operators and quotes in input are plain words."""
+        match = build_match_query(1, 'coffee" OR owner:u2 NEAR(')
+        assert '"OR"' in match
+        assert '"u2"' in match
+        assert 'owner:"u1"' in match
+
+    @pytest.mark.parametrize("query", ["", "   ", "!?*"])
+    def test_no_words(self, query: str) -> None:
+        """Input without words is rejected."""
+        with pytest.raises(ValueError):
+            build_match_query(1, query)
+
+
+class TestSearchIndex:
+    """Test the triggers and rebuild command behind search."""
+
+    def _search(self, db_session: Session, user_id: int, query: str) -> List[int]:
+        rows = db_session.execute(
+            SEARCH_QUERY, search_parameters(user_id, query, None, 50)
+        ).all()
+        return [row.id for row in rows]
+
+    def _entry(self, user: User, day: int, text: str) -> JournalEntry:
+        return JournalEntry(
+            user_id=user.id,
+            date=date(2024, 1, day),
+            gratitude_answers=["Café au lait"],
+            emotion_answers=[],
+            custom_text=text,
+        )
+
+    def test_triggers_follow_inserts_updates_and_deletes(
+        self, db_session: Session
+    ) -> None:
+        """Saved text is searchable at once and old text stops matching."""
+        user = User(firebase_uid="test-uid-123", email="test@example.com")
+        db_session.add(user)
+        db_session.commit()
+        entry = self._entry(user, 1, "Walked along the river")
+        db_session.add(entry)
+        db_session.commit()
+
+        assert self._search(db_session, user.id, "river") == [entry.id]
+        assert self._search(db_session, user.id, "cafe") == [entry.id]
+
+        entry.custom_text = "Stayed in and read"
+        db_session.commit()
+        assert self._search(db_session, user.id, "river") == []
+        assert self._search(db_session, user.id, "read") == [entry.id]
+
+        db_session.delete(entry)
+        db_session.commit()
+        assert self._search(db_session, user.id, "read") == []
+        db_session.connection().exec_driver_sql(
+            "INSERT INTO journal_entries_fts (journal_entries_fts) VALUES ('integrity-check')"
+        )
+
+    def test_other_users_entries_do_not_match(self, db_session: Session) -> None:
+        """The owner token keeps each search inside one journal."""
+        alice = User(firebase_uid="alice", email="alice@example.com")
+        bob = User(firebase_uid="bob", email="bob@example.com")
+        db_session.add_all([alice, bob])
+        db_session.commit()
+        db_session.add_all(
+            [self._entry(alice, 1, "river"), self._entry(bob, 1, "river")]
+        )
+        db_session.commit()
+
+        assert len(self._search(db_session, alice.id, "river")) == 1
+        assert len(self._search(db_session, bob.id, "river")) == 1
+
+    def test_rebuild_indexes_existing_entries(self, db_session: Session) -> None:
+        """Entries written before the index existed become searchable."""
+        user = User(firebase_uid="test-uid-123", email="test@example.com")
+        db_session.add(user)
+        db_session.commit()
+        for statement in JOURNAL_ENTRY_SEARCH_DROP:
+            db_session.connection().exec_driver_sql(statement)
+        db_session.add(self._entry(user, 1, "Walked along the river"))
+        db_session.commit()
+
+        with db_session.get_bind().begin() as conn:
+            assert rebuild_search_index(conn) == 1
+
+        assert len(self._search(db_session, user.id, "river")) == 1
@@ -0,0 +1,73 @@
+"""Tests for the row-tuple journal entry serializer."""
+
+import json
+from datetime import date, datetime
+
+from schemas import JournalEntryResponse, PaginationMetadata
+from serializers import (
+    JOURNAL_ENTRY_FIELDS,
+    journal_entry_rows_to_dicts,
+    render_journal_entries_page,
+)
+
+# flake8: noqa: E501
+
+
+def make_row(**overrides: object) -> tuple:
+    """A row as selected with JOURNAL_ENTRY_COLUMNS."""
+    values = {
+        "id": 7,
+        "user_id": 1,
+        "date": date(2024, 2, 29),
+        "gratitude_answers": ["tea", "sun"],
+        "emotion": "joy",
+        "emotion_answers": ["a walk"],
+        "custom_text": 'Ünïcode and "quotes"',
+        "visual_settings": {"theme": "sunny"},
+        "created_at": datetime(2024, 2, 29, 8, 0, 0, 123456),
+        "updated_at": datetime(2024, 2, 29, 9, 0),
+        **overrides,
+    }
+    return tuple(values[field] for field in JOURNAL_ENTRY_FIELDS)
+
+
+class TestJournalEntrySerializer:
+    """The fast path must produce what the Pydantic path produced."""
+
+    def test_matches_pydantic_json(self) -> None:
+        """Each entry encodes exactly like JournalEntryResponse."""
+        for row in (
+            make_row(),
+            make_row(emotion=None, custom_text=None, visual_settings=None),
+        ):
+            fast = json.loads(
+                render_journal_entries_page(
+                    [row],
+                    PaginationMetadata(
+                        current_page=1,
+                        page_size=10,
+                        total_pages=1,
+                        total_items=1,
+                        has_next=False,
+                        has_previous=False,
+                    ),
+                ).body
+            )["entries"][0]
+            expected = JournalEntryResponse.model_validate(
+                journal_entry_rows_to_dicts([row])[0]
+            ).model_dump(mode="json")
+            assert fast == expected
+
+    def test_pagination_is_included(self) -> None:
+        """The pagination block is rendered alongside the entries."""
+        pagination = PaginationMetadata(
+            current_page=None,
+            page_size=1,
+            total_pages=3,
+            total_items=3,
+            has_next=True,
+            has_previous=True,
+            next_cursor="abc",
+        )
+        body = json.loads(render_journal_entries_page([make_row()], pagination).body)
+        assert body["pagination"] == pagination.model_dump()
@@ -0,0 +1,79 @@
+"""Tests for journaling streak arithmetic."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from streaks import current_streak_on, extend_streaks, runs, streak_lengths
+
+# flake8: noqa: E501
+
+
+def days(*numbers: int) -> list[date]:
+    """Dates in January 2024 by day number."""
+    return [date(2024, 1, number) for number in numbers]
+
+
+class TestRuns:
+    """Test splitting dates into runs."""
+
+    def test_runs(self) -> None:
+        """Consecutive dates group into (first, last) runs."""
+        assert runs(days(1, 2, 3, 5, 7, 8)) == [
+            (date(2024, 1, 1), date(2024, 1, 3)),
+            (date(2024, 1, 5), date(2024, 1, 5)),
+            (date(2024, 1, 7), date(2024, 1, 8)),
+        ]
+
+    def test_streak_lengths(self) -> None:
+        """Current is the last run, longest the longest."""
+        assert streak_lengths(days(1, 2, 3, 5, 7, 8)) == (2, 3)
+        assert streak_lengths([]) == (0, 0)
+
+    def test_runs_cross_month_ends(self) -> None:
+        """Runs follow the calendar, not day numbers."""
+        assert streak_lengths(
+            [date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 1)]
+        ) == (3, 3)
+
+
+class TestExtendStreaks:
+    """Test the no-read update for entries after the last one."""
+
+    def test_first_entries(self) -> None:
+        """A new journal starts from the new dates alone."""
+        assert extend_streaks(None, 0, 0, days(4, 5, 9)) == (1, 2)
+
+    def test_next_day_extends_current(self) -> None:
+        """The day after the last entry continues the streak."""
+        assert extend_streaks(date(2024, 1, 3), 3, 5, days(4)) == (4, 5)
+        assert extend_streaks(date(2024, 1, 3), 5, 5, days(4)) == (6, 6)
+
+    def test_gap_restarts_current(self) -> None:
+        """Skipping a day starts a new streak."""
+        assert extend_streaks(date(2024, 1, 3), 3, 5, days(5)) == (1, 5)
+
+    def test_batch_extends_then_restarts(self) -> None:
+        """Several new dates are taken in order."""
+        assert extend_streaks(date(2024, 1, 3), 3, 3, days(4, 5, 8)) == (1, 5)
+
+    @pytest.mark.parametrize("new", [days(3), days(1, 9)])
+    def test_backfill_needs_rescan(self, new: list[date]) -> None:
+        """A date on or before the last entry cannot be settled here."""
+        assert extend_streaks(date(2024, 1, 3), 3, 3, new) is None
+
+
+class TestCurrentStreakOn:
+    """Test the read-time view of the current streak."""
+
+    @pytest.mark.parametrize("offset,expected", [(0, 4), (1, 4), (2, 0)])
+    def test_streak_lapses_after_a_skipped_day(
+        self, offset: int, expected: int
+    ) -> None:
+        """Today or yesterday keeps the streak; earlier breaks it."""
+        today = date(2024, 1, 10)
+        assert current_streak_on(today, today - timedelta(days=offset), 4) == expected
+
+    def test_no_entries(self) -> None:
+        """A user without entries has no streak."""
+        assert current_streak_on(date(2024, 1, 10), None, 0) == 0
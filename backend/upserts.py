@@ -0,0 +1,105 @@
+"""Upsert statements shared by the API, bulk import and maintenance."""
+
+from datetime import date, datetime
+from typing import Any, Dict, Union
+
+from sqlalchemy import Update, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import EmotionMonthCount, JournalEntry, User
+from schemas import JournalEntryCreate
+
+# flake8: noqa: E501
+
+# Columns overwritten when a save hits an existing (user_id, date) row
+JOURNAL_ENTRY_UPSERT_COLUMNS = (
+    "gratitude_answers",
+    "emotion",
+    "emotion_answers",
+    "custom_text",
+    "visual_settings",
+)
+
+
+def journal_entry_upsert(
+    dialect_name: str,
+) -> Union[sqlite.Insert, postgresql.Insert]:
+    """INSERT ... ON CONFLICT (user_id, date) DO UPDATE for ``dialect_name``.
+
+    Execute with ``journal_entry_values`` dicts, either one statement with
+    ``.values([...])`` or as an executemany. An update keeps created_at and
+    takes updated_at and change_seq from the incoming row.
+    """
+    stmt: Union[sqlite.Insert, postgresql.Insert] = (
+        postgresql.insert(JournalEntry)
+        if dialect_name == "postgresql"
+        else sqlite.insert(JournalEntry)
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[JournalEntry.user_id, JournalEntry.date],
+        set_={
+            name: stmt.excluded[name]
+            for name in (*JOURNAL_ENTRY_UPSERT_COLUMNS, "updated_at", "change_seq")
+        },
+    )
+
+
+def next_change_seq(user_id: int) -> Update:
+    """UPDATE bumping the user's change_seq, RETURNING the new value.
+
+    Run it before writing entries and stamp them with the result. The UPDATE
+    holds the user's row until commit (on SQLite, BEGIN IMMEDIATE already
+    holds the database), so a later value can only commit after an earlier
+    one, whatever the clocks of the processes involved say.
+    """
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(change_seq=User.change_seq + 1, updated_at=User.updated_at)
+        .returning(User.change_seq)
+    )
+
+
+def journal_entry_values(
+    user_id: int,
+    entry_date: date,
+    entry: JournalEntryCreate,
+    now: datetime,
+    change_seq: int,
+) -> Dict[str, Any]:
+    """Column values for saving ``entry`` as the user's entry on ``entry_date``."""
+    return {
+        "user_id": user_id,
+        "date": entry_date,
+        "gratitude_answers": entry.gratitude_answers,
+        "emotion": entry.emotion.value if entry.emotion else None,
+        "emotion_answers": entry.emotion_answers,
+        "custom_text": entry.custom_text,
+        "visual_settings": entry.visual_settings,
+        "created_at": now,
+        "updated_at": now,
+        "change_seq": change_seq,
+    }
+
+
+def emotion_count_upsert(
+    dialect_name: str,
+) -> Union[sqlite.Insert, postgresql.Insert]:
+    """INSERT ... ON CONFLICT DO UPDATE adding ``count`` to an emotion rollup row.
+
+    Execute with (user_id, year_month, emotion, count) dicts; ``count`` is
+    a delta and may be negative.
+    """
+    stmt: Union[sqlite.Insert, postgresql.Insert] = (
+        postgresql.insert(EmotionMonthCount)
+        if dialect_name == "postgresql"
+        else sqlite.insert(EmotionMonthCount)
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[
+            EmotionMonthCount.user_id,
+            EmotionMonthCount.year_month,
+            EmotionMonthCount.emotion,
+        ],
+        set_={"count": EmotionMonthCount.count + stmt.excluded.count},
+    )